@@ -8,26 +8,75 @@ https://github.com/zinuzoid/aprs_weather_station_hacs
 from __future__ import annotations
 
 from datetime import timedelta
+from importlib import import_module
 from typing import TYPE_CHECKING
 
+import voluptuous as vol
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.loader import async_get_loaded_integration
 
+from .alerts import APRSWSAlertEngine
 from .api import APRSWSApiClient
 from .const import (
+    CONF_ALERT_RULES,
+    CONF_APRS_IS,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_URL,
+    CONF_KISS_HOST,
+    CONF_KISS_PORT,
+    CONF_MISSED_BEACONS,
+    CONF_PACKET_EVENTS,
+    CONF_RELAY_ALL_INTERFACES,
+    CONF_RELAY_PORT,
+    CONF_RELAY_SERVER,
+    CONF_TIMESERIES_RETENTION_DAYS,
+    CONF_TIMESERIES_STORE,
     CONF_YOUR_CALLSIGN,
+    DEFAULT_KISS_PORT,
+    DEFAULT_MISSED_BEACONS,
+    DEFAULT_RELAY_HOST,
+    DEFAULT_RELAY_PORT,
+    DEFAULT_TIMESERIES_RETENTION_DAYS,
     DOMAIN,
     LOGGER,
 )
 from .coordinator import APRSWSDataUpdateCoordinator
 from .data import APRSWSRuntimeData
+from .exporter import APRSWSExporter
+from .metrics import APRSWSMetrics
+from .packet_events import APRSWSPacketEvents
+from .packet_log import APRSWSPacketLog
+from .relay import APRSWSRelayServer
+from .services import async_setup_services
+from .staleness import APRSWSStalenessScheduler
+from .timeseries import PRUNE_INTERVAL, APRSWSTimeSeriesStore
+from .tracing import APRSWSLatencyTracer
 
 if TYPE_CHECKING:
-    from homeassistant.core import HomeAssistant
+    from datetime import datetime
+
+    from homeassistant.core import Event, HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import APRSWSConfigEntry
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.DEVICE_TRACKER]
+PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+    Platform.DEVICE_TRACKER,
+    Platform.WEATHER,
+    Platform.BINARY_SENSOR,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up integration services."""
+    async_setup_services(hass)
+    return True
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
@@ -39,23 +88,128 @@ async def async_setup_entry(
     coordinator = APRSWSDataUpdateCoordinator(
         hass=hass, logger=LOGGER, name=DOMAIN, update_interval=timedelta(minutes=1)
     )
+    metrics = APRSWSMetrics()
+    tracer = APRSWSLatencyTracer()
+    packet_log = APRSWSPacketLog()
+    relay = None
+    if entry.options.get(CONF_RELAY_SERVER, False):
+        relay = APRSWSRelayServer(
+            int(entry.options.get(CONF_RELAY_PORT, DEFAULT_RELAY_PORT)),
+            ""
+            if entry.options.get(CONF_RELAY_ALL_INTERFACES, False)
+            else DEFAULT_RELAY_HOST,
+        )
+        try:
+            await hass.async_add_executor_job(relay.start)
+        except OSError:
+            LOGGER.exception("Cannot start relay server, continuing without it")
+            relay = None
     entry.runtime_data = APRSWSRuntimeData(
         client=APRSWSApiClient(
             callsign=entry.data[CONF_YOUR_CALLSIGN],
             budlist=None,
+            metrics=metrics,
+            tracer=tracer,
+            packet_log=packet_log,
+            relay=relay,
+            aprs_is=entry.options.get(CONF_APRS_IS, True),
+            kiss_host=entry.options.get(CONF_KISS_HOST) or None,
+            kiss_port=int(entry.options.get(CONF_KISS_PORT, DEFAULT_KISS_PORT)),
         ),
         integration=async_get_loaded_integration(hass, entry.domain),
         coordinator=coordinator,
+        metrics=metrics,
+        tracer=tracer,
+        packet_log=packet_log,
+        relay=relay,
+        staleness=APRSWSStalenessScheduler(
+            hass,
+            entry.entry_id,
+            int(entry.options.get(CONF_MISSED_BEACONS, DEFAULT_MISSED_BEACONS)),
+        ),
+        setup_snapshot=(dict(entry.data), dict(entry.options)),
     )
-
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
-
+    if entry.options.get(CONF_TIMESERIES_STORE, False):
+        timeseries = entry.runtime_data.timeseries = APRSWSTimeSeriesStore(
+            hass.config.path(f"{DOMAIN}_timeseries"),
+            entry.options.get(
+                CONF_TIMESERIES_RETENTION_DAYS, DEFAULT_TIMESERIES_RETENTION_DAYS
+            ),
+        )
+
+        async def _async_prune_timeseries(_: datetime | None = None) -> None:
+            await hass.async_add_executor_job(timeseries.prune)
+
+        # Also covers series of stations that went silent
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                _async_prune_timeseries,
+                PRUNE_INTERVAL,
+                name=f"{DOMAIN} time-series prune",
+            )
+        )
+        entry.async_create_background_task(
+            hass, _async_prune_timeseries(), f"{DOMAIN} time-series prune"
+        )
+
+    if export_url := entry.options.get(CONF_EXPORT_URL):
+        entry.runtime_data.exporter = APRSWSExporter(
+            hass,
+            export_url,
+            entry.options.get(CONF_EXPORT_TOKEN),
+            hass.config.path(f"{DOMAIN}_export"),
+        )
+        await entry.runtime_data.exporter.async_start()
+
+    if packet_events := entry.options.get(CONF_PACKET_EVENTS):
+        try:
+            entry.runtime_data.packet_events = APRSWSPacketEvents(
+                hass, entry.entry_id, packet_events
+            )
+        except vol.Invalid as exception:
+            LOGGER.error(
+                "Invalid packet event subscriptions, continuing without packet "
+                "events: %s",
+                exception,
+            )
+
+    if alert_rules := entry.options.get(CONF_ALERT_RULES):
+        try:
+            entry.runtime_data.alerts = APRSWSAlertEngine(
+                hass, entry.entry_id, alert_rules
+            )
+        except vol.Invalid as exception:
+            # Saved before the sensor type was checked
+            LOGGER.error(
+                "Invalid alert rules, continuing without alerts: %s", exception
+            )
+
+    # aprslib is slow to import, load the listener module off the event loop
+    await hass.async_add_import_executor_job(import_module, f"{__name__}.aprs_listener")
+
+    # Platforms only register coordinator listeners, entities are created as
+    # data arrives, so there is no need to wait for the first refresh. They
+    # are set up first so they see its data.
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-    hass.bus.async_listen_once(
-        EVENT_HOMEASSISTANT_STOP, lambda _: entry.runtime_data.client.stop_and_join()
+    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except (ConfigEntryError, ConfigEntryNotReady):
+        # A failed setup does not unload them, and a retry forwards them again
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        raise
+
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
+
+    async def _async_stop(_: Event) -> None:
+        await hass.async_add_executor_job(entry.runtime_data.client.stop_and_join)
+        if entry.runtime_data.relay is not None:
+            await hass.async_add_executor_job(entry.runtime_data.relay.stop_and_join)
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
     )
 
     return True
@@ -69,6 +223,17 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_update_entry(
+    hass: HomeAssistant,
+    entry: APRSWSConfigEntry,
+) -> None:
+    """Apply subentry changes in place, reload on any other change."""
+    if entry.runtime_data.setup_snapshot != (dict(entry.data), dict(entry.options)):
+        await async_reload_entry(hass, entry)
+        return
+    await entry.runtime_data.coordinator.async_apply_budlist()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: APRSWSConfigEntry,
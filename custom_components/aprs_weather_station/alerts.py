@@ -0,0 +1,328 @@
+"""Threshold alerts on station readings for aprs_weather_station."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import deque
+from fnmatch import translate
+from typing import TYPE_CHECKING, Any, Final
+
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import dispatcher_send
+from homeassistant.util.location import distance
+
+from .const import (
+    DOMAIN,
+    LOGGER,
+    METRIC_SENSOR_TYPES,
+    SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT,
+)
+from .data import APRSWSLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import APRSWSSensorData
+
+EVENT_ALERT: Final = f"{DOMAIN}_alert"
+ALERT_ON: Final = "on"
+ALERT_OFF: Final = "off"
+# Readings a rule can watch, raw and derived, not the integration's own
+ALERT_SENSOR_TYPES: Final = tuple(
+    sensor_type
+    for sensor_type in SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT
+    if sensor_type not in METRIC_SENSOR_TYPES
+    and sensor_type not in ("timestamp", "packet_received", "is_connected")
+)
+
+RULE_SCHEMA: Final = vol.All(
+    vol.Schema(
+        {
+            vol.Required("name"): cv.string,
+            vol.Required("sensor"): vol.In(ALERT_SENSOR_TYPES),
+            vol.Optional("callsign", default=["*"]): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+            vol.Exclusive("above", "threshold"): vol.Coerce(float),
+            vol.Exclusive("below", "threshold"): vol.Coerce(float),
+            # Compare the change over this period instead of the value
+            vol.Optional("change_over"): cv.positive_time_period,
+            vol.Optional("hysteresis", default=0): vol.All(
+                vol.Coerce(float), vol.Range(min=0)
+            ),
+            # Time after an alert cleared before it can trigger again
+            vol.Optional("cooldown", default=0): cv.positive_time_period,
+            # Only stations that reported a position this close to home
+            vol.Optional("within"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            vol.Optional("binary_sensor", default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key("above", "below"),
+)
+
+
+def _unique_names(rules: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    names = [rule["name"] for rule in rules]
+    if len(set(names)) != len(names):
+        msg = "rule names must be unique"
+        raise vol.Invalid(msg)
+    return rules
+
+
+RULES_SCHEMA: Final = vol.All(cv.ensure_list, [RULE_SCHEMA], _unique_names)
+
+
+def alert_signal(entry_id: str, rule: str) -> str:
+    """Return dispatcher signal sent when stations of a rule change."""
+    return f"{DOMAIN}_{entry_id}_alert_{rule}"
+
+
+class APRSWSAlertRule:
+    """One compiled rule."""
+
+    __slots__ = (
+        "above",
+        "below",
+        "binary_sensor",
+        "callsigns",
+        "change_over",
+        "cooldown",
+        "hysteresis",
+        "name",
+        "pattern",
+        "sensor",
+        "within",
+    )
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Compile a validated rule."""
+        self.name: str = config["name"]
+        self.sensor: str = config["sensor"]
+        self.above: float | None = config.get("above")
+        self.below: float | None = config.get("below")
+        self.hysteresis: float = config["hysteresis"]
+        change_over = config.get("change_over")
+        self.change_over = change_over.total_seconds() if change_over else None
+        self.cooldown: float = config["cooldown"].total_seconds()
+        self.within: float | None = config.get("within")
+        self.binary_sensor: bool = config["binary_sensor"]
+        # Plain callsigns are looked up directly, globs are matched once per
+        # station and cached
+        globs = [c for c in config["callsign"] if any(ch in c for ch in "*?[")]
+        self.callsigns = frozenset(
+            c.upper() for c in config["callsign"] if c not in globs
+        )
+        self.pattern = (
+            re.compile("|".join(translate(g) for g in globs), re.IGNORECASE)
+            if globs
+            else None
+        )
+
+    def is_triggered(self, quantity: float, *, active: bool) -> bool:
+        """Return the alert state for `quantity`, with hysteresis."""
+        if self.above is not None:
+            if active:
+                return quantity >= self.above - self.hysteresis
+            return quantity > self.above
+        if self.below is not None:
+            if active:
+                return quantity <= self.below + self.hysteresis
+            return quantity < self.below
+        return False
+
+
+class APRSWSAlertState:
+    """State of one rule for one station."""
+
+    __slots__ = ("active", "cleared_at", "history")
+
+    def __init__(self) -> None:
+        """Initialize inactive."""
+        self.active = False
+        self.cleared_at: float | None = None
+        # (timestamp, value), for rules on the change over a period
+        self.history: deque[tuple[int, float]] = deque()
+
+
+class APRSWSAlertEngine:
+    """
+    Evaluate alert rules against the readings of each packet.
+
+    Rules are indexed by sensor type, and per station the rules that apply to
+    it are resolved once, so a reading only costs a dict lookup plus the
+    rules that actually watch it. Runs on the listener thread. Transitions
+    fire `aprs_weather_station_alert` and notify the rule's binary sensor.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, config: Any) -> None:
+        """Compile rules, raise vol.Invalid if they are malformed."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self.rules = [APRSWSAlertRule(rule) for rule in RULES_SCHEMA(config)]
+        self._by_sensor: dict[str, list[APRSWSAlertRule]] = {}
+        for rule in self.rules:
+            self._by_sensor.setdefault(rule.sensor, []).append(rule)
+        # callsign -> sensor type -> rules applying to the station
+        self._resolved: dict[str, dict[str, tuple[APRSWSAlertRule, ...]]] = {}
+        self._states: dict[tuple[str, str], APRSWSAlertState] = {}
+        # Distance of stations from home in km, once they reported a position
+        self._distances: dict[str, float] = {}
+        self._lock = threading.Lock()
+        # Rule name -> stations in alert, replaced on change for lock free reads
+        self.active: dict[str, frozenset[str]] = {
+            rule.name: frozenset() for rule in self.rules
+        }
+        self.events_fired = 0
+
+    def _rules_for(self, callsign: str) -> dict[str, tuple[APRSWSAlertRule, ...]]:
+        resolved = self._resolved.get(callsign)
+        if resolved is None:
+            upper = callsign.upper()
+            resolved = self._resolved[callsign] = {
+                sensor: applying
+                for sensor, rules in self._by_sensor.items()
+                if (
+                    applying := tuple(
+                        rule
+                        for rule in rules
+                        if upper in rule.callsigns
+                        or (rule.pattern is not None and rule.pattern.fullmatch(upper))
+                    )
+                )
+            }
+        return resolved
+
+    def evaluate(self, sensor_data: Iterable[APRSWSSensorData]) -> None:
+        """Evaluate the rules watching the readings of a packet."""
+        for data in sensor_data:
+            if data.type == "location" and isinstance(data.value, APRSWSLocation):
+                self._set_location(data.callsign, data.value)
+                continue
+            rules = self._rules_for(data.callsign).get(data.type)
+            if not rules:
+                continue
+            value = data.value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            for rule in rules:
+                self._evaluate_rule(rule, data, float(value))
+
+    def _set_location(self, callsign: str, location: APRSWSLocation) -> None:
+        meters = distance(
+            self._hass.config.latitude,
+            self._hass.config.longitude,
+            location.latitude,
+            location.longitude,
+        )
+        if meters is not None:
+            self._distances[callsign] = meters / 1000
+
+    def _evaluate_rule(
+        self, rule: APRSWSAlertRule, data: APRSWSSensorData, value: float
+    ) -> None:
+        callsign = data.callsign
+        if rule.within is not None:
+            station_distance = self._distances.get(callsign)
+            if station_distance is None or station_distance > rule.within:
+                return
+        state = self._states.get((rule.name, callsign))
+        if state is None:
+            state = self._states[rule.name, callsign] = APRSWSAlertState()
+
+        quantity = value
+        if rule.change_over is not None:
+            history = state.history
+            history.append((data.timestamp, value))
+            start = data.timestamp - rule.change_over
+            # Keep the newest reading from before the period as reference
+            while len(history) > 1 and history[1][0] <= start:
+                history.popleft()
+            if history[0][0] > start:
+                return
+            quantity = value - history[0][1]
+
+        triggered = rule.is_triggered(quantity, active=state.active)
+        if triggered == state.active:
+            return
+        now = time.monotonic()
+        if (
+            triggered
+            and state.cleared_at is not None
+            and now - state.cleared_at < rule.cooldown
+        ):
+            return
+        state.active = triggered
+        if not triggered:
+            state.cleared_at = now
+        self._fire(rule, data, quantity, active=triggered)
+
+    def _fire(
+        self,
+        rule: APRSWSAlertRule,
+        data: APRSWSSensorData,
+        quantity: float,
+        *,
+        active: bool,
+    ) -> None:
+        with self._lock:
+            stations = self.active[rule.name]
+            self.active[rule.name] = (
+                stations | {data.callsign} if active else stations - {data.callsign}
+            )
+            self.events_fired += 1
+        LOGGER.debug(
+            "Alert %s %s for %s: %s",
+            rule.name,
+            ALERT_ON if active else ALERT_OFF,
+            data.callsign,
+            quantity,
+        )
+        # Both are thread safe, handled on the loop
+        self._hass.bus.fire(
+            EVENT_ALERT,
+            {
+                "entry_id": self._entry_id,
+                "rule": rule.name,
+                "state": ALERT_ON if active else ALERT_OFF,
+                "callsign": data.callsign,
+                "sensor": rule.sensor,
+                "value": quantity,
+            },
+        )
+        if rule.binary_sensor:
+            dispatcher_send(self._hass, alert_signal(self._entry_id, rule.name))
+
+    def forget(self, callsign: str) -> None:
+        """Drop the state of a removed station."""
+        self._resolved.pop(callsign, None)
+        self._distances.pop(callsign, None)
+        for rule in self.rules:
+            self._states.pop((rule.name, callsign), None)
+        changed = []
+        with self._lock:
+            for rule in self.rules:
+                stations = self.active[rule.name]
+                if callsign in stations:
+                    self.active[rule.name] = stations - {callsign}
+                    changed.append(rule)
+        for rule in changed:
+            if rule.binary_sensor:
+                dispatcher_send(self._hass, alert_signal(self._entry_id, rule.name))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return alert state for diagnostics."""
+        with self._lock:
+            return {
+                "rules": len(self.rules),
+                "events_fired": self.events_fired,
+                "active": {
+                    name: sorted(stations)
+                    for name, stations in self.active.items()
+                    if stations
+                },
+            }
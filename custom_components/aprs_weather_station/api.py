@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-import aprslib
-
-from .aprs_listener import APRSListener
-from .const import APRSIS_FULL_FEED_PORT, APRSIS_USER_DEFINED_PORT, LOGGER
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from .const import (
+    APRSIS_FULL_FEED_PORT,
+    APRSIS_USER_DEFINED_PORT,
+    DEFAULT_KISS_PORT,
+    LISTENER_SHUTDOWN_TIMEOUT,
+    LOGGER,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable
 
+    from .metrics import APRSWSMetrics
+    from .packet_log import APRSWSPacketLog
+    from .packet_source import APRSWSPacketSource
+    from .relay import APRSWSRelayServer
+    from .tracing import APRSWSLatencyTracer
+
 
 class APRSWSApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -32,15 +43,30 @@ class APRSWSApiClientAuthenticationError(
 class APRSWSApiClient:
     """APRSWS API Client."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         callsign: str,
         budlist: list[str] | None,
+        metrics: APRSWSMetrics | None = None,
+        tracer: APRSWSLatencyTracer | None = None,
+        packet_log: APRSWSPacketLog | None = None,
+        relay: APRSWSRelayServer | None = None,
+        *,
+        aprs_is: bool = True,
+        kiss_host: str | None = None,
+        kiss_port: int = DEFAULT_KISS_PORT,
     ) -> None:
         """APRSWS API Client."""
         self._callsign = callsign
         self.budlist = budlist
-        self._aprs_listener: APRSListener | None = None
+        self._metrics = metrics
+        self._tracer = tracer
+        self._packet_log = packet_log
+        self._relay = relay
+        self._aprs_is = aprs_is
+        self._kiss_host = kiss_host
+        self._kiss_port = kiss_port
+        self._sources: list[APRSWSPacketSource] = []
 
     def _gen_filter_from_budlist(self) -> str | None:
         if not self.budlist:
@@ -49,7 +75,9 @@ class APRSWSApiClient:
         return f"b/{replace}"
 
     def test_connection(self) -> None:
-        """Test connection to APRS-IS server."""
+        """Test connection to APRS-IS server. Blocking, run in executor."""
+        import aprslib  # noqa: PLC0415 deferred, only needed off the event loop
+
         ais_filter = self._gen_filter_from_budlist()
         port = APRSIS_USER_DEFINED_PORT if self.budlist else APRSIS_FULL_FEED_PORT
         LOGGER.info(
@@ -69,28 +97,94 @@ class APRSWSApiClient:
             raise APRSWSApiClientCommunicationError(msg) from ex
 
     def start_listening(self, callback: Callable[[dict[str, str]]]) -> None:
-        """Start listening to APRS packet."""
+        """Start listening to APRS packet. Blocking, run in executor."""
+        # aprslib is pulled in by the sources, preloaded off-loop in setup
+        from .aprs_listener import APRSListener  # noqa: PLC0415
+        from .kiss_listener import APRSWSKissListener  # noqa: PLC0415
+        from .packet_source import APRSWSDuplicateFilter  # noqa: PLC0415
+
         LOGGER.debug(
             "start_listening with budlist: %s", self._gen_filter_from_budlist()
         )
 
         self.stop_and_join()
 
-        self._aprs_listener = APRSListener(
-            callsign=self._callsign,
-            budlist_filter=self._gen_filter_from_budlist(),
-            callback=callback,
-        )
-        self._aprs_listener.start()
+        shared: dict[str, Any] = {
+            "budlist_filter": self._gen_filter_from_budlist(),
+            "callback": callback,
+            "metrics": self._metrics,
+            "tracer": self._tracer,
+            "packet_log": self._packet_log,
+            "relay": self._relay,
+        }
+        if self._kiss_host:
+            # RF brings digipeated copies, and stations in RF range also
+            # reach APRS-IS through igates
+            shared["duplicates"] = APRSWSDuplicateFilter()
+        if self._aprs_is and self._kiss_host:
+            shared["dispatch_lock"] = threading.Lock()
+        sources: list[APRSWSPacketSource] = []
+        if self._aprs_is:
+            sources.append(APRSListener(callsign=self._callsign, **shared))
+        if self._kiss_host:
+            sources.append(
+                APRSWSKissListener(host=self._kiss_host, port=self._kiss_port, **shared)
+            )
+        if not sources:
+            LOGGER.warning("No packet source enabled, enable APRS-IS or a KISS TNC")
+        for source in sources:
+            source.start()
+        self._sources = sources
+
+    def update_budlist(self, budlist: list[str]) -> bool:
+        """
+        Change the budlist of the running sources in place.
+
+        Returns False if nothing is listening or the change needs the other
+        APRS-IS port, `start_listening` has to be called then.
+        """
+        sources = self._sources
+        if not sources or not all(source.is_alive() for source in sources):
+            return False
+        if not self.budlist or not budlist:
+            return False
+        self.budlist = budlist
+        for source in sources:
+            source.set_filter(self._gen_filter_from_budlist())
+        return True
 
     def is_connected(self) -> bool | None:
-        """Return if aprs client is connected."""
-        return self._aprs_listener.is_connected() if self._aprs_listener else None
-
-    def stop_and_join(self) -> None:
-        """Stop and join thread."""
-        LOGGER.debug("stop_and_join()")
-        if self._aprs_listener:
-            self._aprs_listener.stop()
-            self._aprs_listener.join()
-        LOGGER.debug("stop_and_join() done")
+        """Return if any packet source is connected."""
+        if not self._sources:
+            return None
+        return any(source.is_connected() for source in self._sources)
+
+    @property
+    def listener_thread_ids(self) -> dict[str, int | None]:
+        """Return ident of each packet source thread by source name."""
+        return {source.source_name: source.ident for source in self._sources}
+
+    def stop_and_join(self, timeout: float = LISTENER_SHUTDOWN_TIMEOUT) -> bool:
+        """
+        Stop and join the sources, waiting at most `timeout` seconds.
+
+        Blocking, run in executor. Returns False if a thread was still
+        running at the deadline, they are daemons and are left to finish alone.
+        """
+        sources = self._sources
+        if not sources:
+            return True
+        started = monotonic()
+        for source in sources:
+            source.stop()
+        for source in sources:
+            source.join(max(0.0, timeout - (monotonic() - started)))
+        elapsed = monotonic() - started
+        if any(source.is_alive() for source in sources):
+            LOGGER.warning(
+                "Listener did not stop within %.1f seconds, abandoning it", timeout
+            )
+            return False
+        self._sources = []
+        LOGGER.debug("Listener stopped in %.3f seconds", elapsed)
+        return True
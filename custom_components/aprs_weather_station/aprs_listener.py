@@ -1,14 +1,19 @@
 """APRSListener thread."""
 
+import select
 import threading
-import time
 from collections.abc import Callable
 from typing import Any
 
 import aprslib
 import aprslib.exceptions
 
-from .const import LOGGER
+from .const import LOGGER, METRIC_RECONNECTS
+from .metrics import APRSWSMetrics
+from .packet_log import APRSWSPacketLog
+from .packet_source import APRSWSDuplicateFilter, APRSWSPacketSource
+from .relay import APRSWSRelayServer
+from .tracing import APRSWSLatencyTracer
 
 FAKE_DATA1 = {
     "raw": "G4ZMG>APRS,TCPIP*,qAC,T2SYDNEY:@100100z5205.65N/00219.62W_202/008g013t054r001p021P001h98b10038L000.WFL",  # noqa: E501
@@ -69,7 +74,7 @@ FAKE_DATA2 = {
 }
 
 
-class APRSListener(threading.Thread):
+class APRSListener(APRSWSPacketSource):
     """APRS-IS listener thread that receives packets and routes them to callbacks."""
 
     RETRY_DELAY = 5  # seconds
@@ -78,33 +83,40 @@ class APRSListener(threading.Thread):
 
     SEND_FAKE_DATA = False
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         callsign: str,
         budlist_filter: str | None,
         callback: Callable[[dict[str, Any]], None] | None,
+        metrics: APRSWSMetrics | None = None,
+        tracer: APRSWSLatencyTracer | None = None,
+        packet_log: APRSWSPacketLog | None = None,
+        relay: APRSWSRelayServer | None = None,
+        duplicates: APRSWSDuplicateFilter | None = None,
+        dispatch_lock: threading.Lock | None = None,
     ) -> None:
         """Initialize the APRS listener."""
-        super().__init__()
+        super().__init__(
+            "listener",
+            budlist_filter,
+            callback,
+            metrics=metrics,
+            tracer=tracer,
+            packet_log=packet_log,
+            relay=relay,
+            duplicates=duplicates,
+            dispatch_lock=dispatch_lock,
+        )
         self._callsign = callsign
-        self._budlist_filter = budlist_filter
-        self._callback = callback
         self._ais = aprslib.IS(
             self._callsign, port=10152 if budlist_filter is None else 14580
         )
 
-    def __del__(self) -> None:
-        """Destructor to ensure connection is closed."""
-        self.stop()
-
-    def _consumer_callback(self, packet: dict[str, Any]) -> None:
-        """Handle incoming APRS-IS packets."""
-        if self._callback:
-            self._callback(packet)
-
     def _connect_with_retry(self) -> None:
         """Connect to APRS-IS with retry logic."""
         for attempt in range(self.MAX_RETRIES):
+            if self._stop_event.is_set():
+                return
             try:
                 self._ais.connect()
                 break  # Connection successful, exit retry loop
@@ -117,41 +129,85 @@ class APRSListener(threading.Thread):
                         e,
                         self.RETRY_DELAY,
                     )
-                    time.sleep(self.RETRY_DELAY)
+                    if self._stop_event.wait(self.RETRY_DELAY):
+                        return
                 else:
                     LOGGER.error(
                         "Connection failed after %d attempts: %s", self.MAX_RETRIES, e
                     )
                     raise
 
+    def _consume(self) -> None:
+        """
+        Read lines until stopped.
+
+        Replaces `aprslib.IS.consumer`, whose blocking select can only be
+        interrupted by closing the socket from another thread. Waiting in
+        short polls lets the thread notice `stop()` and close its own socket.
+        """
+        sock = self._ais.sock
+        sock.setblocking(False)  # noqa: FBT003
+        buffer = b""
+        while not self._stop_event.is_set():
+            if self._filter_changed.is_set():
+                self._filter_changed.clear()
+                if self._budlist_filter:
+                    self._ais.set_filter(self._budlist_filter)
+            readable, _, _ = select.select([sock], [], [], self.POLL_INTERVAL)
+            if not readable:
+                continue
+            try:
+                chunk = sock.recv(4096)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                msg = f"socket error on recv(): {e}"
+                raise aprslib.exceptions.ConnectionDrop(msg) from e
+            if not chunk:
+                msg = "connection dropped"
+                raise aprslib.exceptions.ConnectionDrop(msg)
+            *lines, buffer = (buffer + chunk).split(b"\r\n")
+            for line in lines:
+                if line[:1] == b"#":
+                    LOGGER.debug("Server: %s", line.decode("utf-8", errors="replace"))
+                elif line:
+                    self._consumer_callback(line)
+
     def run(self) -> None:
         """Thread entry point - connects to APRS-IS and starts consuming packets."""
         if self.SEND_FAKE_DATA:
             # Send fake data after 3 seconds for testing
-            time.sleep(3)
-            self._consumer_callback(FAKE_DATA1)
-            time.sleep(3)
-            self._consumer_callback(FAKE_DATA1)
+            self._stop_event.wait(3)
+            self._dispatch_packet(FAKE_DATA1)
+            self._stop_event.wait(3)
+            self._dispatch_packet(FAKE_DATA1)
 
         try:
             # Main consumer loop with automatic reconnection
             reconnect_attempts = 0
-            while reconnect_attempts < self.MAX_RECONNECTS:
+            while (
+                reconnect_attempts < self.MAX_RECONNECTS
+                and not self._stop_event.is_set()
+            ):
                 # Connect with retry logic (handles both initial and reconnection)
                 self._connect_with_retry()
+                if self._stop_event.is_set():
+                    break
                 # Reset reconnect counter after successful connection
                 reconnect_attempts = 0
 
                 # Set filter if needed
+                self._filter_changed.clear()
                 if self._budlist_filter:
                     self._ais.set_filter(self._budlist_filter)
 
                 try:
-                    self._ais.consumer(self._consumer_callback)
-                    # If consumer returns normally (shouldn't happen), break
+                    self._consume()
+                    # Returns only once stopped
                     break
                 except aprslib.exceptions.ConnectionDrop as e:
                     reconnect_attempts += 1
+                    self._metrics.increment(METRIC_RECONNECTS)
                     LOGGER.warning(
                         "Connection dropped (attempt %d/%d): %s. Reconnecting...",
                         reconnect_attempts,
@@ -184,14 +240,9 @@ class APRSListener(threading.Thread):
                 "Unexpected error in APRS listener thread: %s", e, exc_info=True
             )
         finally:
-            self.stop()
-
-    def stop(self) -> None:
-        """Signal the listener to stop and close the connection."""
-        LOGGER.debug("stop()")
-        if self.is_connected():
-            self._ais.close()
-        LOGGER.debug("stop() done")
+            if self.is_connected():
+                self._ais.close()
+            LOGGER.debug("Listener stopped")
 
     def is_connected(self) -> bool:
         """Check if the APRS-IS connection is active."""
@@ -1,23 +1,42 @@
 """APRS packet parser for extracting sensor data."""
 
+import sys
 from datetime import UTC, datetime
 from typing import Any
 
 from .const import LOGGER
 from .data import APRSWSSensorData
+from .decoders import APRSWSDecoderRegistry
 
 
 class APRSPacketParser:
-    """Parser for APRS packets to extract sensor data."""
-
-    def parse(self, packet: dict[str, Any]) -> list[APRSWSSensorData]:
-        """Parse an APRS packet and extract sensor data."""
-        timestamp = packet.get("timestamp")
+    """
+    Parser for APRS packets to extract sensor data.
+
+    Keep one parser per packet stream, decoders hold per-station state such
+    as telemetry definitions.
+    """
+
+    def __init__(self) -> None:
+        """Initialize parser."""
+        self._decoders = APRSWSDecoderRegistry()
+
+    def parse(
+        self, packet: dict[str, Any], received_at: int | None = None
+    ) -> list[APRSWSSensorData]:
+        """
+        Parse an APRS packet and extract sensor data.
+
+        Packets without a timestamp of their own are stamped `received_at`.
+        """
+        timestamp = packet.get("timestamp") or received_at
         callsign = packet.get("from")
 
         if not timestamp or not callsign:
             LOGGER.error("Packet doesn't include timestamp nor from! Skipping...")
             return []
+        # One shared string per station instead of one per packet
+        callsign = sys.intern(callsign)
 
         sensor_data: list[APRSWSSensorData] = []
 
@@ -41,99 +60,7 @@ class APRSPacketParser:
             )
         )
 
-        # Add location sensor if latitude and longitude are available
-        if "latitude" in packet and "longitude" in packet:
-            sensor_data.append(
-                APRSWSSensorData(
-                    timestamp=timestamp,
-                    callsign=callsign,
-                    type="location",
-                    value=f"{packet['latitude']},{packet['longitude']}",
-                )
-            )
-
-        # Parse weather data if available
-        weather = packet.get("weather")
-        if weather:
-            if "wind_speed" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="wind_speed",
-                        value=weather["wind_speed"],
-                    )
-                )
-
-            if "course" in packet:
-                # Add wind direction sensor
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="wind_direction",
-                        value=packet["course"],
-                    )
-                )
-
-            if "wind_gust" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="wind_gust",
-                        value=weather["wind_gust"],
-                    )
-                )
-
-            if "temperature" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="temperature",
-                        value=weather["temperature"],
-                    )
-                )
-
-            if "rain_1h" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="precipitation",
-                        value=weather["rain_1h"],
-                    )
-                )
-
-            if "humidity" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="humidity",
-                        value=weather["humidity"],
-                    )
-                )
-
-            if "pressure" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="atmospheric_pressure",
-                        value=weather["pressure"],
-                    )
-                )
-
-            if "luminosity" in weather:
-                sensor_data.append(
-                    APRSWSSensorData(
-                        timestamp=timestamp,
-                        callsign=callsign,
-                        type="illuminance",
-                        value=weather["luminosity"],
-                    )
-                )
+        for decoder in self._decoders.get(packet.get("format")):
+            sensor_data.extend(decoder.decode(packet, callsign, timestamp))
 
         return sensor_data
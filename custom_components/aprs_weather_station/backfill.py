@@ -0,0 +1,257 @@
+"""Backfill long-term statistics from raw APRS-IS packet logs."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import IO, TYPE_CHECKING, Any, Final
+
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import async_import_statistics
+from homeassistant.helpers.recorder import get_instance
+
+from .aprs_parser import APRSPacketParser
+from .const import LOGGER, SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import APRSWSSensorData
+
+IMPORT_BATCH_SIZE: Final = 1000
+HOUR: Final = 3600
+# Hours a bucket stays open to absorb out of order lines before it is flushed.
+REORDER_WINDOW_HOURS: Final = 2
+
+SENSOR_TYPE_TO_MEAN_TYPE: Final[dict[str, StatisticMeanType]] = {
+    "wind_speed": StatisticMeanType.ARITHMETIC,
+    "wind_direction": StatisticMeanType.CIRCULAR,
+    "wind_gust": StatisticMeanType.ARITHMETIC,
+    "temperature": StatisticMeanType.ARITHMETIC,
+    "precipitation": StatisticMeanType.ARITHMETIC,
+    "rain_24h": StatisticMeanType.ARITHMETIC,
+    "rain_since_midnight": StatisticMeanType.ARITHMETIC,
+    "snow": StatisticMeanType.ARITHMETIC,
+    "humidity": StatisticMeanType.ARITHMETIC,
+    "atmospheric_pressure": StatisticMeanType.ARITHMETIC,
+    "illuminance": StatisticMeanType.ARITHMETIC,
+}
+
+
+@dataclass(slots=True)
+class _HourlyBucket:
+    """Running aggregate of one statistic over one hour."""
+
+    sensor_type: str
+    count: int = 0
+    total: float = 0.0
+    sin_total: float = 0.0
+    cos_total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    @property
+    def circular(self) -> bool:
+        return SENSOR_TYPE_TO_MEAN_TYPE[self.sensor_type] is StatisticMeanType.CIRCULAR
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if self.circular:
+            self.sin_total += math.sin(math.radians(value))
+            self.cos_total += math.cos(math.radians(value))
+        else:
+            self.total += value
+
+    def to_statistic(self, hour: int) -> StatisticData:
+        statistic = StatisticData(
+            start=datetime.fromtimestamp(hour * HOUR, tz=UTC),
+            min=self.minimum,
+            max=self.maximum,
+        )
+        if self.circular:
+            statistic["mean"] = (
+                math.degrees(math.atan2(self.sin_total, self.cos_total)) % 360
+            )
+            statistic["mean_weight"] = math.hypot(self.sin_total, self.cos_total)
+        else:
+            statistic["mean"] = self.total / self.count
+        return statistic
+
+
+@dataclass
+class BackfillResult:
+    """Summary of a backfill run."""
+
+    lines: int = 0
+    packets: int = 0
+    parse_failures: int = 0
+    untimed: int = 0
+    rows: int = 0
+    statistic_ids: set[str] = field(default_factory=set)
+    elapsed: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return result suitable for a service response."""
+        return {
+            "lines": self.lines,
+            "packets": self.packets,
+            "parse_failures": self.parse_failures,
+            "untimed": self.untimed,
+            "rows": self.rows,
+            "statistic_ids": sorted(self.statistic_ids),
+            "elapsed_seconds": round(self.elapsed, 3),
+            "lines_per_second": round(self.lines / self.elapsed, 1)
+            if self.elapsed
+            else None,
+            "rows_per_second": round(self.rows / self.elapsed, 1)
+            if self.elapsed
+            else None,
+        }
+
+
+def _open_log(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")  # noqa: PTH123
+
+
+def _split_received_at(line: bytes) -> tuple[int | None, bytes]:
+    """Split an optional leading unix timestamp from a logged line."""
+    head, sep, rest = line.partition(b" ")
+    if sep and head.isdigit():
+        return int(head), rest
+    return None, line
+
+
+class APRSWSBackfill:
+    """
+    Stream a packet log through the parser into hourly statistics.
+
+    Each stage is a generator so only the open hourly buckets and one pending
+    batch per statistic are held in memory regardless of the log size.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_ids: dict[str, str],
+    ) -> None:
+        """Initialize backfill for `entity_ids` (sensor unique id -> entity id)."""
+        self._hass = hass
+        self._entity_ids = entity_ids
+        self._parser = APRSPacketParser()
+        self._batches: dict[str, tuple[str, list[StatisticData]]] = {}
+        self.result = BackfillResult()
+
+    def _packets(self, log: IO[bytes]) -> Iterator[dict[str, Any]]:
+        import aprslib  # noqa: PLC0415 deferred, only needed off the event loop
+        import aprslib.exceptions  # noqa: PLC0415
+
+        for raw_line in log:
+            self.result.lines += 1
+            received_at, line = _split_received_at(raw_line.rstrip(b"\r\n"))
+            if not line or line.startswith(b"#"):
+                continue
+            try:
+                packet = aprslib.parse(line)
+            except (aprslib.exceptions.ParseError, aprslib.exceptions.UnknownFormat):
+                self.result.parse_failures += 1
+                continue
+            if received_at is not None:
+                # aprslib dates DHM timestamps into the current month, the
+                # time the line was logged is the reliable one
+                packet["timestamp"] = received_at
+            elif not packet.get("timestamp"):
+                # Most packets carry no time of their own, without the log
+                # time there is no hour to put them in
+                self.result.untimed += 1
+                continue
+            self.result.packets += 1
+            yield packet
+
+    def _sensor_data(
+        self, packets: Iterator[dict[str, Any]]
+    ) -> Iterator[APRSWSSensorData]:
+        for packet in packets:
+            for data in self._parser.parse(packet):
+                if data.type in SENSOR_TYPE_TO_MEAN_TYPE and data.key in (
+                    self._entity_ids
+                ):
+                    yield data
+
+    def _hourly(
+        self, sensor_data: Iterator[APRSWSSensorData]
+    ) -> Iterator[tuple[str, _HourlyBucket, int]]:
+        buckets: dict[tuple[str, int], _HourlyBucket] = {}
+        newest_hour = 0
+        for data in sensor_data:
+            if not isinstance(data.value, (int, float)):
+                continue
+            hour = data.timestamp // HOUR
+            bucket = buckets.get((data.key, hour))
+            if bucket is None:
+                bucket = buckets[data.key, hour] = _HourlyBucket(data.type)
+            bucket.add(float(data.value))
+
+            if hour > newest_hour:
+                newest_hour = hour
+                for key, bucket_hour in [
+                    k for k in buckets if k[1] < newest_hour - REORDER_WINDOW_HOURS
+                ]:
+                    yield key, buckets.pop((key, bucket_hour)), bucket_hour
+        for key, bucket_hour in sorted(buckets, key=lambda k: k[1]):
+            yield key, buckets.pop((key, bucket_hour)), bucket_hour
+
+    def _flush(self, key: str) -> None:
+        sensor_type, batch = self._batches.pop(key)
+        statistic_id = self._entity_ids[key]
+        metadata = StatisticMetaData(
+            mean_type=SENSOR_TYPE_TO_MEAN_TYPE[sensor_type],
+            has_sum=False,
+            name=None,
+            source="recorder",
+            statistic_id=statistic_id,
+            unit_of_measurement=SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT[sensor_type],
+        )
+        self.result.rows += len(batch)
+        self.result.statistic_ids.add(statistic_id)
+        LOGGER.debug("Importing %d hourly statistics into %s", len(batch), statistic_id)
+        # Wait until the recorder has committed the batch, so a large log is
+        # not read faster than it is imported
+        asyncio.run_coroutine_threadsafe(
+            self._async_import(metadata, batch), self._hass.loop
+        ).result()
+
+    async def _async_import(
+        self, metadata: StatisticMetaData, batch: list[StatisticData]
+    ) -> None:
+        async_import_statistics(self._hass, metadata, batch)
+        await get_instance(self._hass).async_block_till_done()
+
+    def run(self, path: str) -> BackfillResult:
+        """Import `path` into long-term statistics. Blocking, run in executor."""
+        started = time.monotonic()
+        with _open_log(path) as log:
+            for key, bucket, hour in self._hourly(
+                self._sensor_data(self._packets(log))
+            ):
+                _, batch = self._batches.setdefault(key, (bucket.sensor_type, []))
+                batch.append(bucket.to_statistic(hour))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self._flush(key)
+        for key in list(self._batches):
+            self._flush(key)
+        self.result.elapsed = time.monotonic() - started
+        return self.result
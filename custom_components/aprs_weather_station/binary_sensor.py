@@ -0,0 +1,93 @@
+"""Binary sensor platform for aprs_weather_station."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from slugify import slugify
+
+from .alerts import alert_signal
+from .const import APRSIS_DEVICE_CALLSIGN
+from .entity import APRSWSEntity
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+    from .alerts import APRSWSAlertRule
+    from .coordinator import APRSWSDataUpdateCoordinator
+    from .data import APRSWSConfigEntry
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: APRSWSConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the binary sensor platform."""
+    alerts = entry.runtime_data.alerts
+    if alerts is None:
+        return
+    async_add_entities(
+        APRSWSAlertBinarySensor(rule=rule, coordinator=entry.runtime_data.coordinator)
+        for rule in alerts.rules
+        if rule.binary_sensor
+    )
+
+
+class APRSWSAlertBinarySensor(APRSWSEntity, BinarySensorEntity):
+    """On while any station is in alert for a rule."""
+
+    def __init__(
+        self,
+        rule: APRSWSAlertRule,
+        coordinator: APRSWSDataUpdateCoordinator,
+        entity_description: BinarySensorEntityDescription | None = None,
+    ) -> None:
+        """Initialize the binary sensor class."""
+        if entity_description is None:
+            entity_description = BinarySensorEntityDescription(
+                key=f"{APRSIS_DEVICE_CALLSIGN}_alert_{slugify(rule.name)}",
+                has_entity_name=True,
+                name=rule.name,
+            )
+        super().__init__(coordinator, entity_description, APRSIS_DEVICE_CALLSIGN)
+        self.entity_description = entity_description
+        self._rule = rule.name
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the stations in alert."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                alert_signal(self.coordinator.config_entry.entry_id, self._rule),
+                self.async_write_ha_state,
+            )
+        )
+
+    def _stations(self) -> frozenset[str]:
+        alerts = self.coordinator.config_entry.runtime_data.alerts
+        return alerts.active.get(self._rule, frozenset()) if alerts else frozenset()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if any station is in alert."""
+        return bool(self._stations())
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the stations in alert."""
+        return {"stations": sorted(self._stations())}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore packets, the state is written when an alert changes."""
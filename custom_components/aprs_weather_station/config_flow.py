@@ -6,10 +6,11 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import selector
 from slugify import slugify
 
+from .alerts import RULES_SCHEMA
 from .api import (
     APRSWSApiClient,
     APRSWSApiClientAuthenticationError,
@@ -17,11 +18,33 @@ from .api import (
     APRSWSApiClientError,
 )
 from .const import (
+    CONF_ALERT_RULES,
+    CONF_APRS_IS,
     CONF_CALLSIGN,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_URL,
+    CONF_FIELD_SENSORS_DISABLED,
+    CONF_KISS_HOST,
+    CONF_KISS_PORT,
+    CONF_MIN_MOVEMENT_DISTANCE,
+    CONF_MISSED_BEACONS,
+    CONF_PACKET_EVENTS,
+    CONF_RELAY_ALL_INTERFACES,
+    CONF_RELAY_PORT,
+    CONF_RELAY_SERVER,
+    CONF_TIMESERIES_RETENTION_DAYS,
+    CONF_TIMESERIES_STORE,
+    CONF_WEATHER_ENTITY,
     CONF_YOUR_CALLSIGN,
+    DEFAULT_KISS_PORT,
+    DEFAULT_MIN_MOVEMENT_DISTANCE,
+    DEFAULT_MISSED_BEACONS,
+    DEFAULT_RELAY_PORT,
+    DEFAULT_TIMESERIES_RETENTION_DAYS,
     DOMAIN,
     LOGGER,
 )
+from .packet_events import SUBSCRIPTIONS_SCHEMA
 
 
 class APRSWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -38,6 +61,14 @@ class APRSWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Return subentries supported by this integration."""
         return {"budlist": BudlistSubentryFlowHandler}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> APRSWSOptionsFlowHandler:
+        """Return options flow."""
+        return APRSWSOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -46,7 +77,7 @@ class APRSWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         _errors = {}
         if user_input is not None:
             try:
-                await _test_connect(callsign=user_input[CONF_YOUR_CALLSIGN])
+                await _test_connect(self.hass, callsign=user_input[CONF_YOUR_CALLSIGN])
             except APRSWSApiClientAuthenticationError as exception:
                 LOGGER.warning(exception)
                 _errors["base"] = "auth"
@@ -84,6 +115,172 @@ class APRSWSFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class APRSWSOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        _errors = {}
+        if user_input is not None:
+            try:
+                SUBSCRIPTIONS_SCHEMA(user_input.get(CONF_PACKET_EVENTS) or [])
+            except vol.Invalid as exception:
+                LOGGER.warning("Invalid packet event subscriptions: %s", exception)
+                _errors[CONF_PACKET_EVENTS] = "invalid_packet_events"
+            try:
+                RULES_SCHEMA(user_input.get(CONF_ALERT_RULES) or [])
+            except vol.Invalid as exception:
+                LOGGER.warning("Invalid alert rules: %s", exception)
+                _errors[CONF_ALERT_RULES] = "invalid_alert_rules"
+            if not _errors:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_TIMESERIES_STORE,
+                        default=options.get(CONF_TIMESERIES_STORE, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_TIMESERIES_RETENTION_DAYS,
+                        default=options.get(
+                            CONF_TIMESERIES_RETENTION_DAYS,
+                            DEFAULT_TIMESERIES_RETENTION_DAYS,
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=3650,
+                                mode=selector.NumberSelectorMode.BOX,
+                                unit_of_measurement="days",
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_MIN_MOVEMENT_DISTANCE,
+                        default=options.get(
+                            CONF_MIN_MOVEMENT_DISTANCE, DEFAULT_MIN_MOVEMENT_DISTANCE
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=100000,
+                            mode=selector.NumberSelectorMode.BOX,
+                            unit_of_measurement="m",
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_MISSED_BEACONS,
+                        default=options.get(
+                            CONF_MISSED_BEACONS, DEFAULT_MISSED_BEACONS
+                        ),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=0,
+                                max=100,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_WEATHER_ENTITY,
+                        default=options.get(CONF_WEATHER_ENTITY, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_FIELD_SENSORS_DISABLED,
+                        default=options.get(CONF_FIELD_SENSORS_DISABLED, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_APRS_IS,
+                        default=options.get(CONF_APRS_IS, True),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_KISS_HOST,
+                        description={
+                            "suggested_value": options.get(CONF_KISS_HOST, "")
+                        },
+                    ): selector.TextSelector(),
+                    vol.Required(
+                        CONF_KISS_PORT,
+                        default=options.get(CONF_KISS_PORT, DEFAULT_KISS_PORT),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=65535,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Optional(
+                        CONF_EXPORT_URL,
+                        description={
+                            "suggested_value": options.get(CONF_EXPORT_URL, "")
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.URL,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_EXPORT_TOKEN,
+                        description={
+                            "suggested_value": options.get(CONF_EXPORT_TOKEN, "")
+                        },
+                    ): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                        ),
+                    ),
+                    vol.Optional(
+                        CONF_PACKET_EVENTS,
+                        description={
+                            "suggested_value": options.get(CONF_PACKET_EVENTS, [])
+                        },
+                    ): selector.ObjectSelector(),
+                    vol.Optional(
+                        CONF_ALERT_RULES,
+                        description={
+                            "suggested_value": options.get(CONF_ALERT_RULES, [])
+                        },
+                    ): selector.ObjectSelector(),
+                    vol.Required(
+                        CONF_RELAY_SERVER,
+                        default=options.get(CONF_RELAY_SERVER, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_RELAY_PORT,
+                        default=options.get(CONF_RELAY_PORT, DEFAULT_RELAY_PORT),
+                    ): vol.All(
+                        selector.NumberSelector(
+                            selector.NumberSelectorConfig(
+                                min=1,
+                                max=65535,
+                                mode=selector.NumberSelectorMode.BOX,
+                            ),
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Required(
+                        CONF_RELAY_ALL_INTERFACES,
+                        default=options.get(CONF_RELAY_ALL_INTERFACES, False),
+                    ): selector.BooleanSelector(),
+                },
+            ),
+            errors=_errors,
+        )
+
+
 class BudlistSubentryFlowHandler(config_entries.ConfigSubentryFlow):
     """Budlist Subentry."""
 
@@ -99,6 +296,7 @@ class BudlistSubentryFlowHandler(config_entries.ConfigSubentryFlow):
         if user_input is not None:
             try:
                 await _test_connect(
+                    self.hass,
                     callsign=config_entry.data[CONF_YOUR_CALLSIGN],
                     budlist=[user_input[CONF_CALLSIGN]],
                 )
@@ -135,10 +333,12 @@ class BudlistSubentryFlowHandler(config_entries.ConfigSubentryFlow):
         )
 
 
-async def _test_connect(callsign: str, budlist: list[str] | None = None) -> None:
+async def _test_connect(
+    hass: HomeAssistant, callsign: str, budlist: list[str] | None = None
+) -> None:
     """Test connection."""
     client = APRSWSApiClient(
         callsign=callsign,
         budlist=budlist,
     )
-    client.test_connection()
+    await hass.async_add_executor_job(client.test_connection)
@@ -3,8 +3,8 @@
 from logging import Logger, getLogger
 from typing import Final
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import (
+    CONCENTRATION_GRAMS_PER_CUBIC_METER,
     DEGREE,
     LIGHT_LUX,
     PERCENTAGE,
@@ -22,8 +22,67 @@ ATTRIBUTION = "Data provided by https://www.aprs-is.net/"
 CONF_YOUR_CALLSIGN: Final = "your_callsign"
 CONF_CALLSIGN: Final = "callsign"
 
+CONF_TIMESERIES_STORE: Final = "timeseries_store"
+CONF_TIMESERIES_RETENTION_DAYS: Final = "timeseries_retention_days"
+DEFAULT_TIMESERIES_RETENTION_DAYS: Final = 30
+CONF_MIN_MOVEMENT_DISTANCE: Final = "min_movement_distance"
+DEFAULT_MIN_MOVEMENT_DISTANCE: Final = 50  # meters
+CONF_MISSED_BEACONS: Final = "missed_beacons"
+DEFAULT_MISSED_BEACONS: Final = 3
+CONF_RELAY_SERVER: Final = "relay_server"
+CONF_RELAY_PORT: Final = "relay_port"
+CONF_RELAY_ALL_INTERFACES: Final = "relay_all_interfaces"
+DEFAULT_RELAY_PORT: Final = 14580
+DEFAULT_RELAY_HOST: Final = "127.0.0.1"
+CONF_APRS_IS: Final = "aprs_is"
+CONF_KISS_HOST: Final = "kiss_host"
+CONF_KISS_PORT: Final = "kiss_port"
+DEFAULT_KISS_PORT: Final = 8001  # Direwolf default
+CONF_WEATHER_ENTITY: Final = "weather_entity"
+CONF_FIELD_SENSORS_DISABLED: Final = "field_sensors_disabled"
+CONF_PACKET_EVENTS: Final = "packet_events"
+CONF_ALERT_RULES: Final = "alert_rules"
+CONF_EXPORT_URL: Final = "export_url"
+CONF_EXPORT_TOKEN: Final = "export_token"  # noqa: S105
+
+# Uncertainty in meters of a position with 0-4 trailing digits blanked,
+# from 0.01 minute up to a full degree of latitude.
+POSITION_AMBIGUITY_TO_ACCURACY: Final[dict[int, float]] = {
+    0: 18.52,
+    1: 185.2,
+    2: 1852.0,
+    3: 18520.0,
+    4: 111120.0,
+}
+
 APRSIS_USER_DEFINED_PORT: Final = 14580
 APRSIS_FULL_FEED_PORT: Final = 10152
+# Longest a shutdown or reload waits for the listener thread
+LISTENER_SHUTDOWN_TIMEOUT: Final = 5.0  # seconds
+
+APRSIS_DEVICE_CALLSIGN: Final = "APRS-IS"
+
+METRIC_LINES_RECEIVED: Final = "lines_received"
+METRIC_PACKETS_PARSED: Final = "packets_parsed"
+METRIC_PARSE_FAILURES: Final = "parse_failures"
+METRIC_PACKETS_FILTERED: Final = "packets_filtered"
+METRIC_LOOP_HANDOFFS: Final = "loop_handoffs"
+METRIC_STATE_WRITES: Final = "state_writes"
+METRIC_RECONNECTS: Final = "reconnects"
+METRIC_PROCESSING_ERRORS: Final = "processing_errors"
+METRIC_PACKETS_PER_SECOND: Final = "packets_per_second"
+
+METRIC_COUNTERS: Final = (
+    METRIC_LINES_RECEIVED,
+    METRIC_PACKETS_PARSED,
+    METRIC_PARSE_FAILURES,
+    METRIC_PACKETS_FILTERED,
+    METRIC_LOOP_HANDOFFS,
+    METRIC_STATE_WRITES,
+    METRIC_RECONNECTS,
+    METRIC_PROCESSING_ERRORS,
+)
+METRIC_SENSOR_TYPES: Final = (*METRIC_COUNTERS, METRIC_PACKETS_PER_SECOND)
 
 SENSOR_TYPE_TO_MDI_ICONS: Final[dict[str, str]] = {
     "timestamp": "mdi:clock-outline",
@@ -33,25 +92,35 @@ SENSOR_TYPE_TO_MDI_ICONS: Final[dict[str, str]] = {
     "wind_gust": "mdi:weather-windy-variant",
     "temperature": "mdi:thermometer",
     "precipitation": "mdi:weather-rainy",
+    "rain_24h": "mdi:weather-pouring",
+    "rain_since_midnight": "mdi:weather-pouring",
+    "rain_raw": "mdi:counter",
+    "rain_total": "mdi:water-plus",
+    "snow": "mdi:weather-snowy",
     "humidity": "mdi:water-percent",
     "atmospheric_pressure": "mdi:gauge",
     "illuminance": "mdi:brightness-5",
     "location": "mdi:map-marker",
+    "telemetry_1": "mdi:chart-line",
+    "telemetry_2": "mdi:chart-line",
+    "telemetry_3": "mdi:chart-line",
+    "telemetry_4": "mdi:chart-line",
+    "telemetry_5": "mdi:chart-line",
+    "dew_point": "mdi:thermometer-water",
+    "heat_index": "mdi:sun-thermometer",
+    "wind_chill": "mdi:snowflake-thermometer",
+    "apparent_temperature": "mdi:thermometer-lines",
+    "absolute_humidity": "mdi:water",
     "is_connected": "mdi:connection",
-}
-
-SENSOR_TYPE_TO_SENSOR_STATE_CLASS: Final[dict[str, SensorStateClass | None]] = {
-    "timestamp": SensorStateClass.TOTAL_INCREASING,
-    "packet_received": SensorStateClass.TOTAL_INCREASING,
-    "wind_speed": SensorStateClass.MEASUREMENT,
-    "wind_direction": SensorStateClass.MEASUREMENT_ANGLE,
-    "wind_gust": SensorStateClass.MEASUREMENT,
-    "temperature": SensorStateClass.MEASUREMENT,
-    "precipitation": SensorStateClass.MEASUREMENT,
-    "humidity": SensorStateClass.MEASUREMENT,
-    "atmospheric_pressure": SensorStateClass.MEASUREMENT,
-    "illuminance": SensorStateClass.MEASUREMENT,
-    "is_connected": None,
+    "lines_received": "mdi:download-network",
+    "packets_parsed": "mdi:message-processing",
+    "parse_failures": "mdi:message-alert",
+    "packets_filtered": "mdi:filter",
+    "loop_handoffs": "mdi:swap-horizontal",
+    "state_writes": "mdi:database-edit",
+    "reconnects": "mdi:connection",
+    "processing_errors": "mdi:alert-circle",
+    "packets_per_second": "mdi:speedometer",
 }
 
 SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT: Final[dict[str, str | None]] = {
@@ -62,22 +131,32 @@ SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT: Final[dict[str, str | None]] = {
     "wind_gust": UnitOfSpeed.METERS_PER_SECOND,
     "temperature": UnitOfTemperature.CELSIUS,
     "precipitation": UnitOfPrecipitationDepth.MILLIMETERS,
+    "rain_24h": UnitOfPrecipitationDepth.MILLIMETERS,
+    "rain_since_midnight": UnitOfPrecipitationDepth.MILLIMETERS,
+    "rain_raw": None,
+    "rain_total": UnitOfPrecipitationDepth.MILLIMETERS,
+    "snow": UnitOfPrecipitationDepth.MILLIMETERS,
     "humidity": PERCENTAGE,
     "atmospheric_pressure": UnitOfPressure.HPA,
     "illuminance": LIGHT_LUX,
+    "dew_point": UnitOfTemperature.CELSIUS,
+    "heat_index": UnitOfTemperature.CELSIUS,
+    "wind_chill": UnitOfTemperature.CELSIUS,
+    "apparent_temperature": UnitOfTemperature.CELSIUS,
+    "absolute_humidity": CONCENTRATION_GRAMS_PER_CUBIC_METER,
+    "telemetry_1": None,
+    "telemetry_2": None,
+    "telemetry_3": None,
+    "telemetry_4": None,
+    "telemetry_5": None,
     "is_connected": None,
-}
-
-SENSOR_TYPE_TO_SENSOR_DEVICE_CLASS: Final[dict[str, SensorDeviceClass | None]] = {
-    "timestamp": SensorDeviceClass.TIMESTAMP,
-    "packet_received": None,
-    "wind_speed": SensorDeviceClass.WIND_SPEED,
-    "wind_direction": SensorDeviceClass.WIND_DIRECTION,
-    "wind_gust": SensorDeviceClass.WIND_SPEED,
-    "temperature": SensorDeviceClass.TEMPERATURE,
-    "precipitation": SensorDeviceClass.PRECIPITATION,
-    "humidity": SensorDeviceClass.HUMIDITY,
-    "atmospheric_pressure": SensorDeviceClass.ATMOSPHERIC_PRESSURE,
-    "illuminance": SensorDeviceClass.ILLUMINANCE,
-    "is_connected": SensorDeviceClass.ENUM,
+    "lines_received": None,
+    "packets_parsed": None,
+    "parse_failures": None,
+    "packets_filtered": None,
+    "loop_handoffs": None,
+    "state_writes": None,
+    "reconnects": None,
+    "processing_errors": None,
+    "packets_per_second": "packets/s",
 }
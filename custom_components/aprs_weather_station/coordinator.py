@@ -2,62 +2,246 @@
 
 from __future__ import annotations
 
-from time import time
+from time import monotonic, perf_counter_ns, time
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .aprs_parser import APRSPacketParser
-from .const import CONF_CALLSIGN, LOGGER
-from .data import APRSWSSensorData
+from .const import (
+    APRSIS_DEVICE_CALLSIGN,
+    CONF_CALLSIGN,
+    DOMAIN,
+    LOGGER,
+    METRIC_COUNTERS,
+    METRIC_LOOP_HANDOFFS,
+    METRIC_PACKETS_FILTERED,
+    METRIC_PACKETS_PER_SECOND,
+)
+from .data import APRSWSSensorData, APRSWSStationState
+from .metadata import update_metadata
+from .meteorology import derive
+from .packet_log import STATUS_DECODED, STATUS_FILTERED
+from .quality import APRSWSQualityControl
+from .rain import accumulate_rain
+from .tracing import STAGE_DISPATCH, STAGE_HANDOFF, STAGE_PARSE
 
 if TYPE_CHECKING:
-    from .data import APRSWSConfigEntry
+    from .data import APRSWSConfigEntry, APRSWSStationMetadata
+    from .tracing import APRSWSTrace
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-class APRSWSDataUpdateCoordinator(DataUpdateCoordinator[list[APRSWSSensorData]]):
-    """Class to manage fetching data from the API."""
+class APRSWSDataUpdateCoordinator(DataUpdateCoordinator[dict[str, APRSWSSensorData]]):
+    """
+    Class to manage fetching data from the API.
+
+    Data is the latest packet (or APRS-IS status) keyed by sensor key, so
+    each entity finds its value with one lookup.
+    """
 
     config_entry: APRSWSConfigEntry
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize coordinator."""
+        super().__init__(*args, **kwargs)
+        self._parser = APRSPacketParser()
+        # Listener thread only, removed stations are dropped from the loop
+        self._stations: dict[str, APRSWSStationState] = {}
+        self.quality_control = APRSWSQualityControl()
+        # Latest metadata per station, on the loop
+        self.station_metadata: dict[str, APRSWSStationMetadata] = {}
+
     def aprs_callback(self, packet: dict[str, Any]) -> None:
         """Execute on non-loop thread. Handle APRS packet."""
-        LOGGER.debug("Received packet: %s", packet)
-
-        data = APRSPacketParser().parse(packet)
-
-        LOGGER.debug("update data %s", data)
+        metrics = self.config_entry.runtime_data.metrics
+        trace = self.config_entry.runtime_data.tracer.take()
+        packet_events = self.config_entry.runtime_data.packet_events
+        if packet_events is not None:
+            packet_events.process(packet)
+
+        started = perf_counter_ns()
+        data = self._parser.parse(packet, received_at=int(time()))
+        metrics.add_parse_time(perf_counter_ns() - started)
+        packet_log = self.config_entry.runtime_data.packet_log
+        raw = packet.get("raw", "").encode()
+        if not data:
+            metrics.increment(METRIC_PACKETS_FILTERED)
+            packet_log.record(raw, STATUS_FILTERED)
+            return
+        callsign = data[0].callsign
+        state = self._stations.get(callsign)
+        if state is None:
+            state = self._stations[callsign] = APRSWSStationState()
+        metadata = update_metadata(packet, state.metadata)
+        if metadata is not None:
+            state.metadata = metadata
+            # Scheduled before the packet data, so entities see it with it
+            self.hass.add_job(self._async_set_metadata, callsign, metadata)
+        # Before deriving, so glitches do not spread to derived values
+        data = self.quality_control.filter(data, state)
+        data.extend(derive(data, state))
+        data.extend(accumulate_rain(data, state))
+        alerts = self.config_entry.runtime_data.alerts
+        if alerts is not None:
+            alerts.evaluate(data)
+        packet_log.record(raw, STATUS_DECODED, data)
+        if trace:
+            trace.mark(STAGE_PARSE)
+
+        timeseries = self.config_entry.runtime_data.timeseries
+        if timeseries is not None:
+            try:
+                timeseries.append(data)
+            except (OSError, ValueError):
+                LOGGER.exception("Failed to append to time-series store")
+        exporter = self.config_entry.runtime_data.exporter
+        if exporter is not None:
+            exporter.append(data)
+
+        metrics.increment(METRIC_LOOP_HANDOFFS)
         self.hass.add_job(
-            self.async_set_updated_data,
-            data,
+            self._async_set_packet_data,
+            callsign,
+            {sensor_data.key: sensor_data for sensor_data in data},
+            trace,
         )
 
-    async def _async_update_data(self) -> list[APRSWSSensorData]:
+    @callback
+    def _async_set_packet_data(
+        self,
+        callsign: str,
+        data: dict[str, APRSWSSensorData],
+        trace: APRSWSTrace | None,
+    ) -> None:
+        """Push packet data to entities, tracing the sampled packets."""
+        self.config_entry.runtime_data.staleness.async_beacon(callsign)
+        if trace is None:
+            self.async_set_updated_data(data)
+            return
+
+        trace.mark(STAGE_HANDOFF)
+        self.async_set_updated_data(data)
+        trace.mark(STAGE_DISPATCH)
+        self.config_entry.runtime_data.tracer.record(trace)
+
+    @callback
+    def async_restore_rain_total(self, callsign: str, total: float) -> None:
+        """Continue the rain total of a station from the value before a restart."""
+        state = self._stations.get(callsign)
+        if state is not None:
+            state.rain_offset = total
+
+    @callback
+    def _async_set_metadata(
+        self, callsign: str, metadata: APRSWSStationMetadata
+    ) -> None:
+        """Keep changed station metadata, update the device if its software did."""
+        previous = self.station_metadata.get(callsign)
+        self.station_metadata[callsign] = metadata
+        if previous is None or previous.to == metadata.to:
+            # A new station's device is created with it by its entities
+            return
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, callsign)})
+        if device is not None:
+            device_registry.async_update_device(device.id, sw_version=metadata.to)
+
+    async def _async_update_data(self) -> dict[str, APRSWSSensorData]:
         """Update data via library."""
         LOGGER.debug("_async_update_data")
         client = self.config_entry.runtime_data.client
+        metrics = self.config_entry.runtime_data.metrics
+        timestamp = int(time())
         data = [
             APRSWSSensorData(
-                timestamp=int(time()),
-                callsign="APRS-IS",
+                timestamp=timestamp,
+                callsign=APRSIS_DEVICE_CALLSIGN,
                 type="is_connected",
                 value=client.is_connected(),
-            )
+            ),
+            APRSWSSensorData(
+                timestamp=timestamp,
+                callsign=APRSIS_DEVICE_CALLSIGN,
+                type=METRIC_PACKETS_PER_SECOND,
+                value=metrics.update_rate(),
+            ),
         ]
+        data.extend(
+            APRSWSSensorData(
+                timestamp=timestamp,
+                callsign=APRSIS_DEVICE_CALLSIGN,
+                type=name,
+                value=metrics.get(name),
+            )
+            for name in METRIC_COUNTERS
+        )
+
+        await self.async_apply_budlist()
 
+        return {sensor_data.key: sensor_data for sensor_data in data}
+
+    async def async_apply_budlist(self) -> None:
+        """
+        Follow the stations configured as subentries.
+
+        Removed stations lose their per-station state, their entities are
+        removed with the subentry by Home Assistant. The server filter of the
+        running listener is changed in place, the listener is only restarted
+        when it has to switch port.
+        """
+        client = self.config_entry.runtime_data.client
         budlist = [e.data[CONF_CALLSIGN] for e in self.config_entry.subentries.values()]
+        if budlist == client.budlist:
+            return
+        started = monotonic()
+        for callsign in set(client.budlist or ()).difference(budlist):
+            self._async_forget_station(callsign)
+
         if not budlist:
             LOGGER.warning("budlist is None, skip start_listening!")
-            return data
-
-        if budlist != client.budlist:
+            await self.hass.async_add_executor_job(client.stop_and_join)
             client.budlist = budlist
-            client.start_listening(self.aprs_callback)
+        elif not client.update_budlist(budlist):
+            client.budlist = budlist
+            await self.hass.async_add_executor_job(
+                client.start_listening, self.aprs_callback
+            )
+        LOGGER.debug(
+            "Applied budlist %s in %.3f seconds", budlist, monotonic() - started
+        )
 
-        return data
+    @callback
+    def _async_forget_station(self, callsign: str) -> None:
+        runtime_data = self.config_entry.runtime_data
+        self._stations.pop(callsign, None)
+        self.station_metadata.pop(callsign, None)
+        runtime_data.tracks.pop(callsign, None)
+        runtime_data.staleness.async_forget(callsign)
+        if runtime_data.alerts is not None:
+            runtime_data.alerts.forget(callsign)
+        if self.data:
+            # Keep platforms from recreating its entities from the last packet
+            self.data = {
+                key: sensor_data
+                for key, sensor_data in self.data.items()
+                if sensor_data.callsign != callsign
+            }
 
     async def async_shutdown(self) -> None:
         """Run shutdown clean up."""
-        self.config_entry.runtime_data.client.stop_and_join()
+        await self.hass.async_add_executor_job(
+            self.config_entry.runtime_data.client.stop_and_join
+        )
+        if self.config_entry.runtime_data.relay is not None:
+            await self.hass.async_add_executor_job(
+                self.config_entry.runtime_data.relay.stop_and_join
+            )
+        self.config_entry.runtime_data.staleness.async_stop()
+        if self.config_entry.runtime_data.exporter is not None:
+            await self.config_entry.runtime_data.exporter.async_stop()
+        if self.config_entry.runtime_data.timeseries is not None:
+            self.config_entry.runtime_data.timeseries.close()
         await super().async_shutdown()
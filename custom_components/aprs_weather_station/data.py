@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from datetime import datetime
@@ -11,8 +11,18 @@ if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
+    from .alerts import APRSWSAlertEngine
     from .api import APRSWSApiClient
     from .coordinator import APRSWSDataUpdateCoordinator
+    from .exporter import APRSWSExporter
+    from .metrics import APRSWSMetrics
+    from .packet_events import APRSWSPacketEvents
+    from .packet_log import APRSWSPacketLog
+    from .relay import APRSWSRelayServer
+    from .staleness import APRSWSStalenessScheduler
+    from .timeseries import APRSWSTimeSeriesStore
+    from .tracing import APRSWSLatencyTracer
+    from .track import APRSWSTrack
 
 
 type APRSWSConfigEntry = ConfigEntry[APRSWSRuntimeData]
@@ -25,9 +35,36 @@ class APRSWSRuntimeData:
     client: APRSWSApiClient
     coordinator: APRSWSDataUpdateCoordinator
     integration: Integration
-
-
-@dataclass(frozen=True)
+    metrics: APRSWSMetrics
+    tracer: APRSWSLatencyTracer
+    packet_log: APRSWSPacketLog
+    staleness: APRSWSStalenessScheduler
+    timeseries: APRSWSTimeSeriesStore | None = None
+    relay: APRSWSRelayServer | None = None
+    exporter: APRSWSExporter | None = None
+    packet_events: APRSWSPacketEvents | None = None
+    alerts: APRSWSAlertEngine | None = None
+    tracks: dict[str, APRSWSTrack] = field(default_factory=dict)
+    # Entry data and options the entry was set up with, changes to them
+    # need a reload while subentry changes are applied in place
+    setup_snapshot: tuple[dict[str, Any], dict[str, Any]] = field(
+        default_factory=lambda: ({}, {})
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class APRSWSLocation:
+    """Reported station position."""
+
+    latitude: float
+    longitude: float
+    # Number of trailing position digits blanked by the station (0-4)
+    ambiguity: int
+    # Radius in meters of the area the position may lie in
+    accuracy: float
+
+
+@dataclass(frozen=True, slots=True)
 class APRSWSSensorData:
     """Base class for sensor data."""
 
@@ -35,11 +72,22 @@ class APRSWSSensorData:
     callsign: str
     type: str
 
-    value: str | int | float | datetime | None
+    value: str | int | float | datetime | APRSWSLocation | None
+    # Label and unit announced by the station itself, e.g. for telemetry
+    name: str | None = None
+    unit: str | None = None
+    # Unique key for sensor, built once instead of on every lookup
+    key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Build key."""
+        object.__setattr__(self, "key", f"{self.callsign}_{self.type}")
 
     @classmethod
     def from_other_with_new_value(
-        cls, other: APRSWSSensorData, value: str | float | datetime | None
+        cls,
+        other: APRSWSSensorData,
+        value: str | float | datetime | APRSWSLocation | None,
     ) -> APRSWSSensorData:
         """Create copy with new value."""
         return APRSWSSensorData(
@@ -47,9 +95,45 @@ class APRSWSSensorData:
             callsign=other.callsign,
             type=other.type,
             value=value,
+            name=other.name,
+            unit=other.unit,
         )
 
-    @property
-    def key(self) -> str:
-        """Unique key for sensor."""
-        return f"{self.callsign}_{self.type}"
+
+@dataclass(frozen=True, slots=True)
+class APRSWSStationMetadata:
+    """Station details packets carry besides readings."""
+
+    comment: str | None = None
+    symbol: str | None = None
+    symbol_table: str | None = None
+    # Destination callsign, identifies the station software, e.g. APXR04
+    to: str | None = None
+    via: str | None = None
+    path: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class APRSWSReadingHistory:
+    """Accepted readings of one sensor type, for quality control."""
+
+    # Most recent last, a list as a deque takes several times the memory
+    recent: list[float] = field(default_factory=list)
+    last_timestamp: int = 0
+    rejected_in_row: int = 0
+
+
+@dataclass(slots=True)
+class APRSWSStationState:
+    """State the coordinator keeps for one station between packets."""
+
+    # Derived sensor type -> inputs it was last computed from
+    derived_inputs: dict[str, tuple[float, ...]] = field(default_factory=dict)
+    # Rain accumulation: last value per source sensor type, the total since
+    # start and the total restored by the sensor
+    rain_last: dict[str, float] = field(default_factory=dict)
+    rain_total: float = 0.0
+    rain_offset: float = 0.0
+    # Sensor type -> accepted readings, for quality control
+    readings: dict[str, APRSWSReadingHistory] = field(default_factory=dict)
+    metadata: APRSWSStationMetadata = field(default_factory=APRSWSStationMetadata)
@@ -0,0 +1,71 @@
+"""Packet decoders for aprs_weather_station, loaded on first use."""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Final, Protocol
+
+if TYPE_CHECKING:
+    from .data import APRSWSSensorData
+
+# Decoder name -> (module, class)
+DECODERS: Final = {
+    "position": ("position_decoder", "APRSWSPositionDecoder"),
+    "weather": ("weather_decoder", "APRSWSWeatherDecoder"),
+    "telemetry": ("telemetry_decoder", "APRSWSTelemetryDecoder"),
+}
+
+# aprslib packet format -> decoders run on it, in order
+FORMAT_TO_DECODERS: Final[dict[str, tuple[str, ...]]] = {
+    "uncompressed": ("position", "weather", "telemetry"),
+    "compressed": ("position", "weather", "telemetry"),
+    "mic-e": ("position", "telemetry"),
+    "object": ("position", "weather"),
+    "wx": ("weather",),
+    "telemetry": ("telemetry",),
+    "telemetry-message": ("telemetry",),
+}
+
+
+class APRSWSDecoder(Protocol):
+    """Turn one aspect of a parsed packet into sensor data."""
+
+    def decode(
+        self, packet: dict[str, Any], callsign: str, timestamp: int
+    ) -> list[APRSWSSensorData]:
+        """Return sensor data found in `packet`."""
+
+
+class APRSWSDecoderRegistry:
+    """
+    Decoders by packet format.
+
+    A decoder module is imported and its decoder created the first time a
+    packet format using it is seen. Decoders keep their state (for example
+    telemetry definitions) for the lifetime of the registry.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty registry."""
+        self._decoders: dict[str, APRSWSDecoder] = {}
+        self._formats: dict[str | None, tuple[APRSWSDecoder, ...]] = {}
+
+    def _decoder(self, name: str) -> APRSWSDecoder:
+        decoder = self._decoders.get(name)
+        if decoder is None:
+            module, class_name = DECODERS[name]
+            decoder_class = getattr(
+                import_module(f".{module}", __package__), class_name
+            )
+            decoder = self._decoders[name] = decoder_class()
+        return decoder
+
+    def get(self, packet_format: str | None) -> tuple[APRSWSDecoder, ...]:
+        """Return decoders for `packet_format`."""
+        decoders = self._formats.get(packet_format)
+        if decoders is None:
+            decoders = self._formats[packet_format] = tuple(
+                self._decoder(name)
+                for name in FORMAT_TO_DECODERS.get(packet_format or "", ())
+            )
+        return decoders
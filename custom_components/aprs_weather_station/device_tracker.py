@@ -2,23 +2,29 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.device_tracker.config_entry import (
     TrackerEntity,
     TrackerEntityDescription,
 )
 from homeassistant.core import callback
+from homeassistant.util.location import distance
 
 from .const import (
     CONF_CALLSIGN,
+    CONF_MIN_MOVEMENT_DISTANCE,
+    DEFAULT_MIN_MOVEMENT_DISTANCE,
     LOGGER,
     SENSOR_TYPE_TO_MDI_ICONS,
 )
+from .data import APRSWSLocation
 from .entity import APRSWSEntity
+from .track import APRSWSTrack
 
 if TYPE_CHECKING:
-    from datetime import datetime
+    from collections.abc import Mapping
     from types import MappingProxyType
 
     from homeassistant.config_entries import ConfigSubentry
@@ -56,27 +62,22 @@ async def async_setup_entry(
         new_sensors = list(
             filter(
                 lambda s: s.key not in known_sensors and s.type == "location",
-                coordinator.data,
+                coordinator.data.values(),
             )
         )
-        LOGGER.debug(
-            "_check_device entry.subentries:%s\nknown_sensors:%s\nnew_sensors:%s",
-            entry.subentries,
-            known_sensors,
-            new_sensors,
-        )
         for sensor in list(new_sensors):
             subentry = _find_subentry(entry.subentries, sensor.callsign)
             if not subentry:
                 LOGGER.error("Cannot find subentry %s", sensor.callsign)
                 continue
+            entity = APRSWSLocationSensor(
+                data=sensor,
+                coordinator=coordinator,
+            )
+            # Allow re-adding the entity if it gets removed
+            entity.async_on_remove(partial(known_sensors.discard, sensor.key))
             async_add_entities(
-                [
-                    APRSWSLocationSensor(
-                        data=sensor,
-                        coordinator=coordinator,
-                    ),
-                ],
+                [entity],
                 config_subentry_id=subentry.subentry_id,
             )
             known_sensors.add(sensor.key)
@@ -88,6 +89,8 @@ async def async_setup_entry(
 class APRSWSLocationSensor(APRSWSEntity, TrackerEntity):
     """APRS Weather Station Sensor class."""
 
+    _unrecorded_attributes = frozenset({"track"})
+
     def __init__(
         self,
         data: APRSWSSensorData,
@@ -105,40 +108,59 @@ class APRSWSLocationSensor(APRSWSEntity, TrackerEntity):
 
         super().__init__(coordinator, entity_description, data.callsign)
         self.entity_description = entity_description
-        self._set_location_data(data.value)
+        self._min_movement_distance: float = coordinator.config_entry.options.get(
+            CONF_MIN_MOVEMENT_DISTANCE, DEFAULT_MIN_MOVEMENT_DISTANCE
+        )
+        self._position_ambiguity = 0
+        self._track = coordinator.config_entry.runtime_data.tracks.setdefault(
+            data.callsign, APRSWSTrack()
+        )
+        if isinstance(data.value, APRSWSLocation):
+            self._set_location_data(data.value)
+            self._track.append(
+                data.value.latitude, data.value.longitude, data.timestamp
+            )
         self.data = data
         if self.device_info:
             self.device_info.update(name=data.callsign)
 
-    @staticmethod
-    def _find_sensor_data(
-        sensors: list[APRSWSSensorData], key: str
-    ) -> APRSWSSensorData | None:
-        return next(
-            (data for data in sensors if data.key == key),
-            None,
+    def _set_location_data(self, location: APRSWSLocation) -> None:
+        self._attr_latitude = location.latitude
+        self._attr_longitude = location.longitude
+        self._attr_location_accuracy = location.accuracy
+        self._position_ambiguity = location.ambiguity
+
+    def _has_moved(self, location: APRSWSLocation) -> bool:
+        """Return True if `location` differs enough from the written one."""
+        if self._attr_latitude is None or self._attr_longitude is None:
+            return True
+        if location.ambiguity != self._position_ambiguity:
+            return True
+        moved = distance(
+            self._attr_latitude,
+            self._attr_longitude,
+            location.latitude,
+            location.longitude,
         )
+        return moved is None or moved >= self._min_movement_distance
 
-    def _set_location_data(self, value: str | float | datetime | None) -> bool:
-        if not isinstance(value, str):
-            LOGGER.error("value is not str, %s", value)
-            return False
-        lat, lon = value.split(",")
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return position ambiguity and the encoded polyline of the track."""
+        return {
+            "position_ambiguity": self._position_ambiguity,
+            "track": self._track.encoded_polyline(),
+        }
 
-        lat = float(lat)
-        lon = float(lon)
-
-        self._attr_latitude = lat
-        self._attr_longitude = lon
-
-        return True
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop track history of the station."""
+        await super().async_will_remove_from_hass()
+        self.coordinator.config_entry.runtime_data.tracks.pop(self.data.callsign, None)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        new_data = self._find_sensor_data(
-            self.coordinator.data, self.entity_description.key
-        )
+        new_data = self.coordinator.data.get(self.entity_description.key)
         if not new_data:
             return
 
@@ -146,12 +168,15 @@ class APRSWSLocationSensor(APRSWSEntity, TrackerEntity):
             LOGGER.warning("found duplicated timestamp, ignore data...")
             return
 
-        if not self._set_location_data(new_data.value):
+        location = new_data.value
+        if not isinstance(location, APRSWSLocation):
+            LOGGER.error("value is not a location, %s", location)
             return
 
-        LOGGER.debug(
-            "update sensor_data for %s with value %s %s",
-            new_data.key,
-        )
         self.data = new_data
+        self._track.append(location.latitude, location.longitude, new_data.timestamp)
+        if not self._has_moved(location):
+            return
+
+        self._set_location_data(location)
         self.async_write_ha_state()
@@ -0,0 +1,53 @@
+"""Diagnostics support for aprs_weather_station."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from .const import CONF_CALLSIGN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import APRSWSConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: APRSWSConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    runtime_data = entry.runtime_data
+    timeseries = None
+    if runtime_data.timeseries is not None:
+        timeseries = await hass.async_add_executor_job(runtime_data.timeseries.stats)
+    return {
+        "config_entry": {
+            "data": dict(entry.data),
+            "budlist": [
+                subentry.data[CONF_CALLSIGN] for subentry in entry.subentries.values()
+            ],
+        },
+        "is_connected": runtime_data.client.is_connected(),
+        "metrics": runtime_data.metrics.as_dict(),
+        "latency": runtime_data.tracer.as_dict(),
+        "quality_control": runtime_data.coordinator.quality_control.as_dict(),
+        "timeseries": timeseries,
+        "station_metadata": {
+            callsign: asdict(metadata)
+            for callsign, metadata in runtime_data.coordinator.station_metadata.items()
+        },
+        "packet_log": {
+            "memory_bytes": runtime_data.packet_log.memory_usage(),
+            "stations": runtime_data.packet_log.as_dict(),
+        },
+        "relay": runtime_data.relay.as_dict() if runtime_data.relay else None,
+        "packet_events": (
+            runtime_data.packet_events.as_dict() if runtime_data.packet_events else None
+        ),
+        "alerts": runtime_data.alerts.as_dict() if runtime_data.alerts else None,
+        "exporter": (
+            runtime_data.exporter.as_dict() if runtime_data.exporter else None
+        ),
+    }
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION
+from .const import APRSIS_DEVICE_CALLSIGN, ATTRIBUTION, METRIC_STATE_WRITES
 from .coordinator import APRSWSDataUpdateCoordinator
+from .staleness import station_signal
 
 if TYPE_CHECKING:
     from homeassistant.helpers.entity import EntityDescription
@@ -27,6 +30,8 @@ class APRSWSEntity(CoordinatorEntity[APRSWSDataUpdateCoordinator]):
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
+        self._device_id = device_id
+        self._station_available = True
         self._attr_unique_id = entity_description.key
         self._attr_device_info = DeviceInfo(
             identifiers={
@@ -36,3 +41,39 @@ class APRSWSEntity(CoordinatorEntity[APRSWSDataUpdateCoordinator]):
                 ),
             },
         )
+        metadata = coordinator.station_metadata.get(device_id)
+        if metadata is not None and metadata.to:
+            self._attr_device_info["sw_version"] = metadata.to
+
+    async def async_added_to_hass(self) -> None:
+        """Follow availability of the station."""
+        await super().async_added_to_hass()
+        if self._device_id == APRSIS_DEVICE_CALLSIGN:
+            return
+        runtime_data = self.coordinator.config_entry.runtime_data
+        self._station_available = runtime_data.staleness.is_available(self._device_id)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                station_signal(self.coordinator.config_entry.entry_id, self._device_id),
+                self._async_set_station_available,
+            )
+        )
+
+    @callback
+    def _async_set_station_available(self, available: bool) -> None:  # noqa: FBT001
+        self._station_available = available
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return False if the coordinator failed or the station went silent."""
+        return super().available and self._station_available
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine and account it in metrics."""
+        self.coordinator.config_entry.runtime_data.metrics.increment(
+            METRIC_STATE_WRITES
+        )
+        super().async_write_ha_state()
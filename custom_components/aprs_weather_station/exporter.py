@@ -0,0 +1,264 @@
+"""Batched export of station readings as InfluxDB line protocol."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import math
+import os
+from collections import deque
+from contextlib import suppress
+from datetime import timedelta
+from pathlib import Path
+from time import time_ns
+from typing import TYPE_CHECKING, Any, Final
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN, LOGGER
+from .timeseries import EXCLUDED_SENSOR_TYPES
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+    from .data import APRSWSSensorData
+
+MEASUREMENT: Final = DOMAIN
+BATCH_SIZE: Final = 5000  # lines
+FLUSH_INTERVAL: Final = timedelta(seconds=10)
+POST_TIMEOUT: Final = 30  # seconds
+# Last flush on shutdown, what is not sent by then is spilled
+STOP_TIMEOUT: Final = 5  # seconds
+# Failed batches kept in memory, older ones are spilled to disk
+MAX_BUFFER_BYTES: Final = 4 * 1024 * 1024
+# Spilled batches kept on disk, the oldest are dropped beyond this
+MAX_SPILL_BYTES: Final = 64 * 1024 * 1024
+SPILL_SUFFIX: Final = ".lp.gz"
+
+_TAG_ESCAPES: Final = str.maketrans({",": r"\,", "=": r"\=", " ": r"\ "})
+
+
+def encode_line(sensor_data: Iterable[APRSWSSensorData]) -> bytes | None:
+    """
+    Encode the numeric values of a parsed packet as one line protocol line.
+
+    Values are written as floats, so a field never changes type between
+    packets. Returns None if the packet has no numeric value.
+    """
+    fields: list[str] = []
+    first: APRSWSSensorData | None = None
+    for data in sensor_data:
+        value = data.value
+        if (
+            data.type in EXCLUDED_SENSOR_TYPES
+            or isinstance(value, bool)
+            or not isinstance(value, (int, float))
+            or not math.isfinite(value)
+        ):
+            continue
+        first = first or data
+        fields.append(f"{data.type}={float(value)!r}")
+    if first is None:
+        return None
+    callsign = first.callsign.translate(_TAG_ESCAPES)
+    return (
+        f"{MEASUREMENT},callsign={callsign} {','.join(fields)} "
+        f"{first.timestamp * 1_000_000_000}"
+    ).encode()
+
+
+def _compress(lines: list[bytes]) -> bytes:
+    return gzip.compress(b"\n".join(lines), compresslevel=6)
+
+
+def _spilled_points(path: Path) -> int:
+    return int(path.name.removesuffix(SPILL_SUFFIX).split("_")[1])
+
+
+class APRSWSExporter:
+    """
+    Write readings to an InfluxDB compatible `/write` endpoint.
+
+    The listener thread encodes each packet to a line and queues it. On the
+    event loop, queued lines are gzipped in batches of up to `BATCH_SIZE` and
+    posted over Home Assistant's shared HTTP session, every `FLUSH_INTERVAL`
+    or as soon as a batch is full. Batches that could not be sent are kept
+    and retried oldest first. Beyond `MAX_BUFFER_BYTES` they are spilled to
+    disk, so readings survive a database outage and a restart.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, url: str, token: str | None, spill_dir: str
+    ) -> None:
+        """Initialize exporter."""
+        self._hass = hass
+        self._url = url
+        self._headers = {
+            "Content-Encoding": "gzip",
+            "Content-Type": "text/plain; charset=utf-8",
+        }
+        if token:
+            self._headers["Authorization"] = f"Token {token}"
+        self._spill_dir = Path(spill_dir)
+        # Encoded lines, appended on the listener thread
+        self._pending: deque[bytes] = deque()
+        # (points, gzipped body) of batches not sent yet, oldest first
+        self._batches: deque[tuple[int, bytes]] = deque()
+        self._buffered_bytes = 0
+        self._spilled_bytes = 0
+        self._lock = asyncio.Lock()
+        self._unsub: Callable[[], None] | None = None
+        self._available = True
+        self.points_sent = 0
+        self.points_dropped = 0
+
+    def append(self, sensor_data: Iterable[APRSWSSensorData]) -> None:
+        """Queue a parsed packet. Called on the listener thread."""
+        line = encode_line(sensor_data)
+        if line is None:
+            return
+        self._pending.append(line)
+        if len(self._pending) == BATCH_SIZE:
+            self._hass.loop.call_soon_threadsafe(self._async_flush_soon)
+
+    async def async_start(self) -> None:
+        """Pick up batches spilled by a previous run and start flushing."""
+        self._spilled_bytes = await self._hass.async_add_executor_job(self._scan_spill)
+        self._unsub = async_track_time_interval(
+            self._hass, self._async_flush, FLUSH_INTERVAL, name=f"{DOMAIN} export"
+        )
+
+    async def async_stop(self) -> None:
+        """Flush one last time and spill what could not be sent."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._available:
+            with suppress(TimeoutError):
+                async with asyncio.timeout(STOP_TIMEOUT):
+                    await self._async_flush()
+        async with self._lock:
+            await self._async_batch_pending()
+            if self._batches:
+                await self._hass.async_add_executor_job(self._spill, 0)
+
+    @callback
+    def _async_flush_soon(self) -> None:
+        self._hass.async_create_background_task(
+            self._async_flush(), f"{DOMAIN} export flush"
+        )
+
+    async def _async_flush(self, _now: datetime | None = None) -> None:
+        if self._lock.locked():
+            return
+        async with self._lock:
+            await self._async_batch_pending()
+            if self._buffered_bytes > MAX_BUFFER_BYTES:
+                await self._hass.async_add_executor_job(
+                    self._spill, MAX_BUFFER_BYTES // 2
+                )
+            if self._spilled_bytes and not await self._async_send_spilled():
+                return
+            while self._batches:
+                count, body = self._batches[0]
+                if not await self._async_post(body, count):
+                    return
+                self._batches.popleft()
+                self._buffered_bytes -= len(body)
+
+    async def _async_batch_pending(self) -> None:
+        while self._pending:
+            count = min(len(self._pending), BATCH_SIZE)
+            lines = [self._pending.popleft() for _ in range(count)]
+            body = await self._hass.async_add_executor_job(_compress, lines)
+            self._batches.append((count, body))
+            self._buffered_bytes += len(body)
+
+    async def _async_post(self, body: bytes, points: int) -> bool:
+        """Send one batch, return False if it should be retried."""
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.post(
+                self._url,
+                data=body,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=POST_TIMEOUT),
+            ) as response:
+                status = response.status
+                reason = await response.text() if status >= 400 else ""  # noqa: PLR2004
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self._set_available(available=False, reason=str(err))
+            return False
+        if status == 429 or status >= 500:  # noqa: PLR2004
+            self._set_available(available=False, reason=f"HTTP {status}")
+            return False
+        self._set_available(available=True)
+        if status >= 400:  # noqa: PLR2004
+            # Retrying a rejected batch cannot succeed
+            LOGGER.error("Export rejected %s points: %s %s", points, status, reason)
+            self.points_dropped += points
+        else:
+            self.points_sent += points
+        return True
+
+    def _set_available(self, *, available: bool, reason: str = "") -> None:
+        if available == self._available:
+            return
+        self._available = available
+        if available:
+            LOGGER.info("Export resumed")
+        else:
+            LOGGER.warning("Export failed, buffering: %s", reason)
+
+    async def _async_send_spilled(self) -> bool:
+        """Send spilled batches oldest first, return False on failure."""
+        for path in await self._hass.async_add_executor_job(self._spill_files):
+            body = await self._hass.async_add_executor_job(path.read_bytes)
+            if not await self._async_post(body, _spilled_points(path)):
+                return False
+            await self._hass.async_add_executor_job(path.unlink)
+            self._spilled_bytes -= len(body)
+        return True
+
+    def _spill_files(self) -> list[Path]:
+        return sorted(self._spill_dir.glob(f"*{SPILL_SUFFIX}"))
+
+    def _scan_spill(self) -> int:
+        return sum(path.stat().st_size for path in self._spill_files())
+
+    def _spill(self, keep_bytes: int) -> None:
+        """Move the oldest batches to disk until `keep_bytes` remain buffered."""
+        self._spill_dir.mkdir(parents=True, exist_ok=True)
+        while self._batches and self._buffered_bytes > keep_bytes:
+            count, body = self._batches.popleft()
+            self._buffered_bytes -= len(body)
+            path = self._spill_dir / f"{time_ns():020d}_{count}{SPILL_SUFFIX}"
+            path.write_bytes(body)
+            self._spilled_bytes += len(body)
+        files = self._spill_files()
+        while files and self._spilled_bytes > MAX_SPILL_BYTES:
+            oldest = files.pop(0)
+            size = oldest.stat().st_size
+            oldest.unlink()
+            self._spilled_bytes -= size
+            self.points_dropped += _spilled_points(oldest)
+            LOGGER.warning("Export spill full, dropped %s", oldest.name)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return exporter state for diagnostics."""
+        return {
+            "available": self._available,
+            "points_sent": self.points_sent,
+            "points_dropped": self.points_dropped,
+            "points_queued": len(self._pending),
+            "buffered_batches": len(self._batches),
+            "buffered_bytes": self._buffered_bytes,
+            "spilled_bytes": self._spilled_bytes,
+            "spill_dir": os.fspath(self._spill_dir),
+        }
@@ -0,0 +1,197 @@
+"""KISS over TCP listener thread, e.g. for a local Direwolf TNC."""
+
+from __future__ import annotations
+
+import select
+import socket
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import LOGGER, METRIC_RECONNECTS
+from .packet_source import APRSWSPacketSource
+from .relay import compile_filter
+
+if TYPE_CHECKING:
+    import re
+    import threading
+    from collections.abc import Callable
+
+    from .metrics import APRSWSMetrics
+    from .packet_log import APRSWSPacketLog
+    from .packet_source import APRSWSDuplicateFilter
+    from .relay import APRSWSRelayServer
+    from .tracing import APRSWSLatencyTracer
+
+FEND: Final = b"\xc0"
+FESC: Final = b"\xdb"
+TFEND: Final = b"\xdc"
+TFESC: Final = b"\xdd"
+# Low nibble of the KISS type byte, high nibble is the TNC port
+KISS_DATA_FRAME: Final = 0x00
+
+AX25_ADDRESS_LENGTH: Final = 7
+AX25_MAX_DIGIPEATERS: Final = 8
+# Control and protocol id of an AX.25 UI frame without layer 3
+AX25_UI_FRAME: Final = b"\x03\xf0"
+
+CONNECT_TIMEOUT: Final = 10.0  # seconds
+
+
+def kiss_unescape(data: bytes) -> bytes:
+    """Undo KISS byte stuffing of a frame."""
+    return data.replace(FESC + TFEND, FEND).replace(FESC + TFESC, FESC)
+
+
+def ax25_to_tnc2(frame: bytes) -> bytes | None:
+    """
+    Return the TNC2 line (`SRC>DEST,PATH:info`) of an AX.25 UI frame.
+
+    Returns None for frames that are not APRS UI frames. The last digipeater
+    that has repeated the frame is marked with `*`.
+    """
+    addresses: list[tuple[bytes, bool]] = []
+    offset = 0
+    while True:
+        field = frame[offset : offset + AX25_ADDRESS_LENGTH]
+        if len(field) < AX25_ADDRESS_LENGTH:
+            return None
+        callsign = bytes(byte >> 1 for byte in field[:6]).rstrip(b" ")
+        ssid = (field[6] >> 1) & 0x0F
+        if ssid:
+            callsign += b"-%d" % ssid
+        addresses.append((callsign, bool(field[6] & 0x80)))
+        offset += AX25_ADDRESS_LENGTH
+        if field[6] & 0x01:
+            break
+        if len(addresses) >= 2 + AX25_MAX_DIGIPEATERS:
+            return None
+    if len(addresses) < 2:  # noqa: PLR2004 destination and source
+        return None
+    if frame[offset : offset + 2] != AX25_UI_FRAME:
+        return None
+
+    (destination, _), (source, _), *digipeaters = addresses
+    repeated = [index for index, (_, done) in enumerate(digipeaters) if done]
+    last_repeated = repeated[-1] if repeated else -1
+    path = [
+        callsign + b"*" if index == last_repeated else callsign
+        for index, (callsign, _) in enumerate(digipeaters)
+    ]
+    information = frame[offset + 2 :].rstrip(b"\r\n")
+    return b",".join((source + b">" + destination, *path)) + b":" + information
+
+
+class APRSWSKissListener(APRSWSPacketSource):
+    """
+    Receive packets heard on RF from a KISS TNC over TCP.
+
+    Frames are turned into the TNC2 lines APRS-IS delivers and go through the
+    same parsing as APRS-IS lines. The TNC passes everything it hears, so the
+    budlist filter is applied locally. Reconnects until stopped.
+    """
+
+    RETRY_DELAY = 5  # seconds
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        port: int,
+        budlist_filter: str | None,
+        callback: Callable[[dict[str, Any]], None] | None,
+        metrics: APRSWSMetrics | None = None,
+        tracer: APRSWSLatencyTracer | None = None,
+        packet_log: APRSWSPacketLog | None = None,
+        relay: APRSWSRelayServer | None = None,
+        duplicates: APRSWSDuplicateFilter | None = None,
+        dispatch_lock: threading.Lock | None = None,
+    ) -> None:
+        """Initialize the KISS listener."""
+        super().__init__(
+            "kiss",
+            budlist_filter,
+            callback,
+            metrics=metrics,
+            tracer=tracer,
+            packet_log=packet_log,
+            relay=relay,
+            duplicates=duplicates,
+            dispatch_lock=dispatch_lock,
+        )
+        self._host = host
+        self._port = port
+        self._filter: re.Pattern[bytes] | None = compile_filter(budlist_filter or "")
+        self._sock: socket.socket | None = None
+
+    def set_filter(self, budlist_filter: str | None) -> None:
+        """Replace the local filter."""
+        self._budlist_filter = budlist_filter
+        self._filter = compile_filter(budlist_filter or "")
+
+    def _consume(self, sock: socket.socket) -> None:
+        """Read frames until stopped, raise OSError if the connection drops."""
+        sock.setblocking(False)  # noqa: FBT003
+        buffer = b""
+        while not self._stop_event.is_set():
+            readable, _, _ = select.select([sock], [], [], self.POLL_INTERVAL)
+            if not readable:
+                continue
+            try:
+                chunk = sock.recv(4096)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                msg = "connection closed by TNC"
+                raise ConnectionError(msg)
+            *frames, buffer = (buffer + chunk).split(FEND)
+            for frame in frames:
+                if frame and frame[0] & 0x0F == KISS_DATA_FRAME:
+                    self._handle_frame(kiss_unescape(frame[1:]))
+
+    def _handle_frame(self, frame: bytes) -> None:
+        line = ax25_to_tnc2(frame)
+        if line is None:
+            return
+        line_filter = self._filter
+        if line_filter is not None and not line_filter.fullmatch(
+            line[: line.find(b">")]
+        ):
+            return
+        self._consumer_callback(line)
+
+    def run(self) -> None:
+        """Thread entry point - connects to the TNC and consumes frames."""
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self._sock = socket.create_connection(
+                        (self._host, self._port), timeout=CONNECT_TIMEOUT
+                    )
+                except OSError as e:
+                    LOGGER.warning(
+                        "Cannot connect to KISS TNC %s:%s: %s. Retrying in %d seconds.",
+                        self._host,
+                        self._port,
+                        e,
+                        self.RETRY_DELAY,
+                    )
+                    self._stop_event.wait(self.RETRY_DELAY)
+                    continue
+                LOGGER.info("Connected to KISS TNC %s:%s", self._host, self._port)
+                try:
+                    self._consume(self._sock)
+                except OSError as e:
+                    self._metrics.increment(METRIC_RECONNECTS)
+                    LOGGER.warning("KISS connection dropped: %s. Reconnecting...", e)
+                finally:
+                    self._sock.close()
+                    self._sock = None
+        except Exception as e:  # noqa: BLE001
+            # Catch all other exceptions to prevent thread from hanging
+            LOGGER.error(
+                "Unexpected error in KISS listener thread: %s", e, exc_info=True
+            )
+        finally:
+            LOGGER.debug("KISS listener stopped")
+
+    def is_connected(self) -> bool:
+        """Check if the TNC connection is open."""
+        return self._sock is not None
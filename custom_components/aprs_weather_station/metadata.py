@@ -0,0 +1,56 @@
+"""Station metadata for aprs_weather_station."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from .data import APRSWSStationMetadata
+
+# Packet fields kept, named as aprslib does
+METADATA_FIELDS: Final = ("comment", "symbol", "symbol_table", "to", "via", "path")
+# Change with the route a packet took, not with the station
+VOLATILE_METADATA_FIELDS: Final = frozenset({"via", "path"})
+
+
+def update_metadata(
+    packet: dict[str, Any], current: APRSWSStationMetadata
+) -> APRSWSStationMetadata | None:
+    """
+    Merge the metadata of a packet, return the new metadata if it changed.
+
+    Fields a packet does not carry keep their last value, as not every
+    packet type has a comment or a symbol.
+    """
+    changes: dict[str, Any] = {}
+    for name in METADATA_FIELDS:
+        value = packet.get(name)
+        if value is None:
+            continue
+        if name == "path":
+            value = tuple(value)
+        elif not isinstance(value, str):
+            continue
+        if getattr(current, name) != value:
+            changes[name] = value
+    if not changes:
+        return None
+    if "to" in changes:
+        # Few software identifiers, shared by many stations
+        changes["to"] = sys.intern(changes["to"])
+    return replace(current, **changes)
+
+
+def metadata_attributes(metadata: APRSWSStationMetadata) -> dict[str, Any]:
+    """Return the known metadata as state attributes."""
+    attributes: dict[str, Any] = {}
+    for name in METADATA_FIELDS:
+        value = getattr(metadata, name)
+        if name == "path":
+            if value:
+                attributes[name] = list(value)
+        elif value is not None:
+            attributes[name] = value
+    return attributes
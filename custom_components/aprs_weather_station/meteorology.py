@@ -0,0 +1,140 @@
+"""Derived meteorological quantities for aprs_weather_station."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Final
+
+from .data import APRSWSSensorData
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .data import APRSWSStationState
+
+# Magnus formula coefficients over water
+MAGNUS_B: Final = 17.62
+MAGNUS_C: Final = 243.12  # °C
+# NWS heat index is only defined from 26.7 °C (80 °F)
+HEAT_INDEX_MIN_TEMPERATURE: Final = 26.7
+# Wind chill is only defined up to 10 °C and from 4.8 km/h
+WIND_CHILL_MAX_TEMPERATURE: Final = 10.0
+WIND_CHILL_MIN_WIND_SPEED: Final = 4.8  # km/h
+WATER_VAPOR_GAS_CONSTANT: Final = 461.5  # J/(kg K)
+
+
+def _vapor_pressure(temperature: float, humidity: float) -> float:
+    """Return water vapor pressure in hPa."""
+    saturation = 6.112 * math.exp(MAGNUS_B * temperature / (MAGNUS_C + temperature))
+    return saturation * humidity / 100
+
+
+def dew_point(temperature: float, humidity: float) -> float:
+    """Return dew point in °C (Magnus formula)."""
+    gamma = math.log(max(humidity, 1) / 100) + MAGNUS_B * temperature / (
+        MAGNUS_C + temperature
+    )
+    return MAGNUS_C * gamma / (MAGNUS_B - gamma)
+
+
+def heat_index(temperature: float, humidity: float) -> float:
+    """Return heat index in °C (Rothfusz regression), air temperature below it."""
+    if temperature < HEAT_INDEX_MIN_TEMPERATURE:
+        return temperature
+    t = temperature * 9 / 5 + 32
+    rh = humidity
+    index = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 6.83783e-3 * t * t
+        - 5.481717e-2 * rh * rh
+        + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh
+        - 1.99e-6 * t * t * rh * rh
+    )
+    return (index - 32) * 5 / 9
+
+
+def wind_chill(temperature: float, wind_speed: float) -> float:
+    """Return wind chill in °C (JAG/TI), air temperature outside its range."""
+    speed = wind_speed * 3.6
+    if temperature > WIND_CHILL_MAX_TEMPERATURE or speed < WIND_CHILL_MIN_WIND_SPEED:
+        return temperature
+    factor = speed**0.16
+    return 13.12 + 0.6215 * temperature - 11.37 * factor + 0.3965 * temperature * factor
+
+
+def apparent_temperature(
+    temperature: float, humidity: float, wind_speed: float
+) -> float:
+    """Return apparent temperature in °C (Steadman, shade)."""
+    return (
+        temperature
+        + 0.33 * _vapor_pressure(temperature, humidity)
+        - 0.70 * wind_speed
+        - 4.00
+    )
+
+
+def absolute_humidity(temperature: float, humidity: float) -> float:
+    """Return absolute humidity in g/m³."""
+    return (
+        _vapor_pressure(temperature, humidity)
+        * 100
+        / (WATER_VAPOR_GAS_CONSTANT * (temperature + 273.15))
+        * 1000
+    )
+
+
+# Derived sensor type -> (input sensor types, formula, decimals)
+DERIVED_SENSOR_TYPES: Final[
+    dict[str, tuple[tuple[str, ...], Callable[..., float], int]]
+] = {
+    "dew_point": (("temperature", "humidity"), dew_point, 1),
+    "heat_index": (("temperature", "humidity"), heat_index, 1),
+    "wind_chill": (("temperature", "wind_speed"), wind_chill, 1),
+    "apparent_temperature": (
+        ("temperature", "humidity", "wind_speed"),
+        apparent_temperature,
+        1,
+    ),
+    "absolute_humidity": (("temperature", "humidity"), absolute_humidity, 2),
+}
+
+
+def derive(
+    sensor_data: list[APRSWSSensorData], state: APRSWSStationState
+) -> list[APRSWSSensorData]:
+    """
+    Return derived sensor data for a parsed packet.
+
+    A derived value is only returned when one of its inputs changed since
+    the station's previous packet.
+    """
+    values = {
+        data.type: float(data.value)
+        for data in sensor_data
+        if isinstance(data.value, (int, float)) and not isinstance(data.value, bool)
+    }
+    if "temperature" not in values:
+        return []
+    first = sensor_data[0]
+    derived: list[APRSWSSensorData] = []
+    for sensor_type, (inputs, formula, decimals) in DERIVED_SENSOR_TYPES.items():
+        if not all(name in values for name in inputs):
+            continue
+        arguments = tuple(values[name] for name in inputs)
+        if state.derived_inputs.get(sensor_type) == arguments:
+            continue
+        state.derived_inputs[sensor_type] = arguments
+        derived.append(
+            APRSWSSensorData(
+                timestamp=first.timestamp,
+                callsign=first.callsign,
+                type=sensor_type,
+                value=round(formula(*arguments), decimals),
+            )
+        )
+    return derived
@@ -0,0 +1,73 @@
+"""Runtime metrics for aprs_weather_station."""
+
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import Any
+
+from .const import (
+    METRIC_COUNTERS,
+    METRIC_PACKETS_PARSED,
+)
+
+
+class APRSWSMetrics:
+    """
+    Counters shared between the listener thread and the event loop.
+
+    Updates take a single uncontended lock, which keeps them cheap enough to
+    call on every line received from APRS-IS.
+    """
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = dict.fromkeys(METRIC_COUNTERS, 0)
+        self._parse_ns = 0
+        self._started_at = monotonic()
+        self._rate_sampled_at = self._started_at
+        self._rate_sampled_packets = 0
+        self.packets_per_second = 0.0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increment counter `name` by `amount`."""
+        with self._lock:
+            self._counters[name] += amount
+
+    def add_parse_time(self, elapsed_ns: int) -> None:
+        """Account time spent decoding a packet."""
+        with self._lock:
+            self._parse_ns += elapsed_ns
+
+    def get(self, name: str) -> int:
+        """Return current value of counter `name`."""
+        return self._counters[name]
+
+    def update_rate(self) -> float:
+        """Recompute packets per second since the previous call."""
+        now = monotonic()
+        packets = self._counters[METRIC_PACKETS_PARSED]
+        elapsed = now - self._rate_sampled_at
+        if elapsed > 0:
+            self.packets_per_second = round(
+                (packets - self._rate_sampled_packets) / elapsed, 3
+            )
+        self._rate_sampled_at = now
+        self._rate_sampled_packets = packets
+        return self.packets_per_second
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a snapshot suitable for diagnostics."""
+        with self._lock:
+            counters = dict(self._counters)
+            parse_ns = self._parse_ns
+        parsed = counters[METRIC_PACKETS_PARSED]
+        return {
+            "uptime_seconds": round(monotonic() - self._started_at, 1),
+            "counters": counters,
+            "packets_per_second": self.packets_per_second,
+            "average_parse_time_us": (
+                round(parse_ns / parsed / 1000, 2) if parsed else None
+            ),
+        }
@@ -0,0 +1,172 @@
+"""Home Assistant events for packets matching user subscriptions."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from fnmatch import translate
+from typing import TYPE_CHECKING, Any, Final
+
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from homeassistant.core import HomeAssistant
+
+EVENT_PACKET: Final = f"{DOMAIN}_packet"
+# Events per minute a subscription may fire unless it sets its own rate
+DEFAULT_RATE: Final = 6.0
+
+SUBSCRIPTION_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required("name"): cv.string,
+        vol.Optional("callsign", default=["*"]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("format", default=[]): vol.All(cv.ensure_list, [cv.string]),
+        # Packet field, dotted for nested ones such as `weather.temperature`,
+        # to a glob its value has to match
+        vol.Optional("fields", default={}): {cv.string: cv.string},
+        vol.Optional("rate", default=DEFAULT_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, min_included=False)
+        ),
+    }
+)
+SUBSCRIPTIONS_SCHEMA: Final = vol.All(cv.ensure_list, [SUBSCRIPTION_SCHEMA])
+
+
+def _compile_globs(patterns: Iterable[str]) -> re.Pattern[str]:
+    return re.compile(
+        "|".join(translate(pattern) for pattern in patterns), re.IGNORECASE
+    )
+
+
+def _field_value(packet: dict[str, Any], path: tuple[str, ...]) -> Any:
+    value: Any = packet
+    for name in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+class APRSWSPacketSubscription:
+    """One compiled subscription with its rate cap."""
+
+    __slots__ = (
+        "_callsign",
+        "_capacity",
+        "_fields",
+        "_formats",
+        "_refill",
+        "_tokens",
+        "_updated",
+        "dropped",
+        "fired",
+        "name",
+    )
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Compile a validated subscription."""
+        self.name: str = config["name"]
+        self._callsign = _compile_globs(config["callsign"])
+        self._formats = frozenset(config["format"])
+        self._fields = tuple(
+            (tuple(name.split(".")), _compile_globs([pattern]))
+            for name, pattern in config["fields"].items()
+        )
+        # Token bucket allowing a burst of a minute's worth of events
+        self._capacity = max(config["rate"], 1.0)
+        self._refill = config["rate"] / 60
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self.fired = 0
+        self.dropped = 0
+
+    def matches(self, packet: dict[str, Any]) -> bool:
+        """Return True if the packet matches all conditions."""
+        if not self._callsign.fullmatch(packet.get("from") or ""):
+            return False
+        if self._formats and packet.get("format") not in self._formats:
+            return False
+        for path, pattern in self._fields:
+            value = _field_value(packet, path)
+            if value is None or not pattern.fullmatch(str(value)):
+                return False
+        return True
+
+    def take(self, now: float) -> bool:
+        """Return True if an event may be fired, False if over the rate cap."""
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._refill
+        )
+        self._updated = now
+        if self._tokens < 1:
+            self.dropped += 1
+            return False
+        self._tokens -= 1
+        self.fired += 1
+        return True
+
+
+class APRSWSPacketEvents:
+    """
+    Fire `aprs_weather_station_packet` for packets matching a subscription.
+
+    Subscriptions are compiled once and evaluated on the listener thread. A
+    single regex of all callsign globs rejects most packets of a full feed
+    before any subscription is looked at. Each subscription is capped at its
+    `rate` events per minute, further matches are counted and dropped.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, config: Any) -> None:
+        """Compile subscriptions, raise vol.Invalid if they are malformed."""
+        self._hass = hass
+        self._entry_id = entry_id
+        subscriptions = SUBSCRIPTIONS_SCHEMA(config)
+        self._subscriptions = [
+            APRSWSPacketSubscription(subscription) for subscription in subscriptions
+        ]
+        self._any_callsign = _compile_globs(
+            pattern
+            for subscription in subscriptions
+            for pattern in subscription["callsign"]
+        )
+        self._lock = threading.Lock()
+
+    def process(self, packet: dict[str, Any]) -> None:
+        """Fire an event per matching subscription. Called on the listener thread."""
+        if not self._any_callsign.fullmatch(packet.get("from") or ""):
+            return
+        now = time.monotonic()
+        for subscription in self._subscriptions:
+            if not subscription.matches(packet):
+                continue
+            with self._lock:
+                allowed = subscription.take(now)
+            if not allowed:
+                LOGGER.debug("Packet event %s over its rate", subscription.name)
+                continue
+            # Thread safe, the event is fired on the loop
+            self._hass.bus.fire(
+                EVENT_PACKET,
+                {
+                    **packet,
+                    "entry_id": self._entry_id,
+                    "subscription": subscription.name,
+                },
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return per-subscription counters for diagnostics."""
+        with self._lock:
+            return {
+                subscription.name: {
+                    "fired": subscription.fired,
+                    "dropped": subscription.dropped,
+                }
+                for subscription in self._subscriptions
+            }
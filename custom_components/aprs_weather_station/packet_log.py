@@ -0,0 +1,181 @@
+"""Always-on ring buffer of recent raw packets per station."""
+
+from __future__ import annotations
+
+import struct
+import sys
+import threading
+from collections import deque
+from datetime import UTC, datetime
+from time import time
+from typing import TYPE_CHECKING, Any, Final
+
+from .data import APRSWSLocation
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .data import APRSWSSensorData
+
+DEFAULT_PACKETS_PER_STATION: Final = 32
+# Stations kept when listening to the full feed, least recently heard dropped
+DEFAULT_MAX_STATIONS: Final = 256
+
+STATUS_DECODED: Final = 0
+STATUS_FILTERED: Final = 1
+STATUS_FAILED: Final = 2
+STATUS_NAMES: Final = ("decoded", "filtered", "failed")
+
+UNKNOWN_STATION: Final = "?"
+
+# An entry is one bytes object: the header, the raw line, then per sensor
+# data a type id and a tagged value
+_HEADER: Final = struct.Struct("<dBH")  # received at, status, raw line length
+_ITEM: Final = struct.Struct("<HB")  # type id, value tag
+_INT: Final = struct.Struct("<q")
+_FLOAT: Final = struct.Struct("<d")
+_LOCATION: Final = struct.Struct("<dd")
+_LENGTH: Final = struct.Struct("<H")
+_MAX_LENGTH: Final = 0xFFFF
+_INT_RANGE: Final = range(-(1 << 63), 1 << 63)
+
+VALUE_NONE: Final = 0
+VALUE_FALSE: Final = 1
+VALUE_TRUE: Final = 2
+VALUE_INT: Final = 3
+VALUE_FLOAT: Final = 4
+VALUE_LOCATION: Final = 5
+VALUE_TEXT: Final = 6
+
+
+def _station(line: bytes) -> str:
+    callsign, sep, _ = line.partition(b">")
+    return callsign.decode("ascii", errors="replace") if sep else UNKNOWN_STATION
+
+
+def _encode_value(value: object) -> tuple[int, bytes]:
+    """Return tag and packed bytes of a sensor value."""
+    if value is None:
+        return VALUE_NONE, b""
+    if isinstance(value, bool):
+        return (VALUE_TRUE if value else VALUE_FALSE), b""
+    if isinstance(value, int) and value in _INT_RANGE:
+        return VALUE_INT, _INT.pack(value)
+    if isinstance(value, float):
+        return VALUE_FLOAT, _FLOAT.pack(value)
+    if isinstance(value, APRSWSLocation):
+        return VALUE_LOCATION, _LOCATION.pack(value.latitude, value.longitude)
+    text = str(value).encode()[:_MAX_LENGTH]
+    return VALUE_TEXT, _LENGTH.pack(len(text)) + text
+
+
+def _decode_value(tag: int, entry: bytes, offset: int) -> tuple[object, int]:
+    """Return value and the offset after it."""
+    if tag == VALUE_INT:
+        return _INT.unpack_from(entry, offset)[0], offset + _INT.size
+    if tag == VALUE_FLOAT:
+        return _FLOAT.unpack_from(entry, offset)[0], offset + _FLOAT.size
+    if tag == VALUE_LOCATION:
+        latitude, longitude = _LOCATION.unpack_from(entry, offset)
+        return f"{latitude},{longitude}", offset + _LOCATION.size
+    if tag == VALUE_TEXT:
+        (length,) = _LENGTH.unpack_from(entry, offset)
+        offset += _LENGTH.size
+        text = entry[offset : offset + length].decode(errors="replace")
+        return text, offset + length
+    return (None, False, True)[tag], offset
+
+
+class APRSWSPacketLog:
+    """
+    Keep the last raw lines of each station with what they decoded to.
+
+    Each entry is packed into a single bytes object: the receive time,
+    status, raw line and the sensor data it decoded to as type ids and
+    binary values. Nothing is formatted for display until the buffer is read.
+    """
+
+    def __init__(
+        self,
+        packets_per_station: int = DEFAULT_PACKETS_PER_STATION,
+        max_stations: int = DEFAULT_MAX_STATIONS,
+    ) -> None:
+        """Initialize empty log."""
+        self._packets_per_station = packets_per_station
+        self._max_stations = max_stations
+        self._lock = threading.Lock()
+        self._stations: dict[str, deque[bytes]] = {}
+        # Sensor types by id, shared by all entries
+        self._types: list[str] = []
+        self._type_ids: dict[str, int] = {}
+
+    def record(
+        self,
+        line: bytes,
+        status: int,
+        result: Iterable[APRSWSSensorData] = (),
+    ) -> None:
+        """Add a raw line and its parse result."""
+        line = line[:_MAX_LENGTH]
+        callsign = _station(line)
+        parts = [_HEADER.pack(time(), status, len(line)), line]
+        with self._lock:
+            for data in result:
+                type_id = self._type_ids.get(data.type)
+                if type_id is None:
+                    type_id = self._type_ids[data.type] = len(self._types)
+                    self._types.append(data.type)
+                tag, value = _encode_value(data.value)
+                parts.append(_ITEM.pack(type_id, tag))
+                parts.append(value)
+            entry = b"".join(parts)
+            entries = self._stations.pop(callsign, None)
+            if entries is None:
+                entries = deque(maxlen=self._packets_per_station)
+                if len(self._stations) >= self._max_stations:
+                    del self._stations[next(iter(self._stations))]
+            # Reinsert to keep the dict ordered by last heard
+            self._stations[callsign] = entries
+            entries.append(entry)
+
+    @staticmethod
+    def _decode(entry: bytes, types: list[str]) -> dict[str, Any]:
+        received_at, status, length = _HEADER.unpack_from(entry)
+        offset = _HEADER.size + length
+        result: list[str] = []
+        while offset < len(entry):
+            type_id, tag = _ITEM.unpack_from(entry, offset)
+            value, offset = _decode_value(tag, entry, offset + _ITEM.size)
+            result.append(f"{types[type_id]}={value}")
+        return {
+            "received_at": datetime.fromtimestamp(received_at, tz=UTC).isoformat(),
+            "status": STATUS_NAMES[status],
+            "raw": entry[_HEADER.size : _HEADER.size + length].decode(
+                "utf-8", errors="replace"
+            ),
+            "result": ";".join(result) or None,
+        }
+
+    def as_dict(self, callsign: str | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Return decoded entries, oldest first, of one or all stations."""
+        with self._lock:
+            snapshot = {
+                station: list(entries)
+                for station, entries in self._stations.items()
+                if callsign is None or station == callsign
+            }
+            # Ids are only appended, a copy covers every entry in the snapshot
+            types = list(self._types)
+        return {
+            station: [self._decode(entry, types) for entry in entries]
+            for station, entries in snapshot.items()
+        }
+
+    def memory_usage(self) -> int:
+        """Return bytes held by entries."""
+        with self._lock:
+            return sum(
+                sys.getsizeof(entry)
+                for entries in self._stations.values()
+                for entry in entries
+            )
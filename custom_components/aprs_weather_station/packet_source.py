@@ -0,0 +1,193 @@
+"""Base of the threads feeding raw APRS lines to the integration."""
+
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Final
+
+import aprslib
+import aprslib.exceptions
+
+from .const import (
+    LOGGER,
+    METRIC_LINES_RECEIVED,
+    METRIC_PACKETS_FILTERED,
+    METRIC_PACKETS_PARSED,
+    METRIC_PARSE_FAILURES,
+    METRIC_PROCESSING_ERRORS,
+)
+from .metrics import APRSWSMetrics
+from .packet_log import STATUS_FAILED, APRSWSPacketLog
+from .tracing import APRSWSLatencyTracer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .relay import APRSWSRelayServer
+
+# Same packet heard on RF and through APRS-IS, as APRS-IS servers use
+DUPLICATE_WINDOW: Final = 30.0  # seconds
+
+
+class APRSWSDuplicateFilter:
+    """
+    Drop packets another source already delivered.
+
+    Packets are identified like APRS-IS does, by source, destination and
+    information field, ignoring the path. Shared by all sources of a client.
+    """
+
+    def __init__(self, window: float = DUPLICATE_WINDOW) -> None:
+        """Initialize empty filter."""
+        self._window = window
+        self._lock = threading.Lock()
+        # Ordered by time seen, oldest first
+        self._seen: dict[bytes, float] = {}
+
+    def is_duplicate(self, line: bytes) -> bool:
+        """Return True if `line` was seen within the window, record it if not."""
+        header, sep, information = line.partition(b":")
+        if not sep:
+            return False
+        key = header.partition(b",")[0] + b":" + information
+        now = time.monotonic()
+        with self._lock:
+            while self._seen:
+                oldest = next(iter(self._seen))
+                if now - self._seen[oldest] < self._window:
+                    break
+                del self._seen[oldest]
+            if key in self._seen:
+                return True
+            self._seen[key] = now
+        return False
+
+
+class APRSWSPacketSource(threading.Thread, ABC):
+    """
+    Thread receiving raw TNC2 lines and routing parsed packets to a callback.
+
+    Subclasses connect to their source in `run` and hand every line to
+    `_consumer_callback`. When a client runs several sources, they share a
+    duplicate filter and a lock held while a line is handled, so the
+    callback and the shared tracer never run concurrently.
+    """
+
+    POLL_INTERVAL = 0.5  # seconds between checks of the stop flag while idle
+
+    def __init__(  # noqa: PLR0913
+        self,
+        name: str,
+        budlist_filter: str | None,
+        callback: Callable[[dict[str, Any]], None] | None,
+        metrics: APRSWSMetrics | None = None,
+        tracer: APRSWSLatencyTracer | None = None,
+        packet_log: APRSWSPacketLog | None = None,
+        relay: APRSWSRelayServer | None = None,
+        duplicates: APRSWSDuplicateFilter | None = None,
+        dispatch_lock: threading.Lock | None = None,
+    ) -> None:
+        """Initialize the source."""
+        # Daemon so a source stuck in a blocking read never holds up exit
+        super().__init__(name=f"{__package__} {name}", daemon=True)
+        self.source_name = name
+        self._budlist_filter = budlist_filter
+        self._callback = callback
+        self._metrics = metrics or APRSWSMetrics()
+        self._tracer = tracer or APRSWSLatencyTracer()
+        self._packet_log = packet_log or APRSWSPacketLog()
+        self._relay = relay
+        self._duplicates = duplicates
+        self._dispatch_lock = dispatch_lock or nullcontext()
+        self._stop_event = threading.Event()
+        self._filter_changed = threading.Event()
+
+    def _consumer_callback(self, line: bytes) -> None:
+        """Handle incoming raw line, a line that fails is logged and skipped."""
+        with self._dispatch_lock:
+            try:
+                self._handle_line(line)
+            except Exception:  # noqa: BLE001
+                # Ending the thread would stop ingestion for good
+                self._metrics.increment(METRIC_PROCESSING_ERRORS)
+                LOGGER.exception("Failed to process %s", line.decode(errors="replace"))
+
+    def _handle_line(self, line: bytes) -> None:
+        self._tracer.begin()
+        self._metrics.increment(METRIC_LINES_RECEIVED)
+        if self._duplicates is not None and self._duplicates.is_duplicate(line):
+            self._metrics.increment(METRIC_PACKETS_FILTERED)
+            return
+        if self._relay is not None:
+            self._relay.publish(line)
+        started = time.perf_counter_ns()
+        try:
+            packet = aprslib.parse(line)
+        except aprslib.exceptions.UnknownFormat:
+            packet = self._parse_unsupported(line)
+            if packet is None:
+                self._metrics.increment(METRIC_PARSE_FAILURES)
+                self._packet_log.record(line, STATUS_FAILED)
+                return
+        except aprslib.exceptions.ParseError:
+            self._metrics.increment(METRIC_PARSE_FAILURES)
+            self._packet_log.record(line, STATUS_FAILED)
+            return
+        finally:
+            self._metrics.add_parse_time(time.perf_counter_ns() - started)
+        self._metrics.increment(METRIC_PACKETS_PARSED)
+        self._run_callback(packet)
+
+    @staticmethod
+    def _parse_unsupported(line: bytes) -> dict[str, Any] | None:
+        """Parse formats aprslib rejects, currently `T#` telemetry reports."""
+        if b":T#" not in line:
+            return None
+        from .telemetry_decoder import parse_telemetry_report  # noqa: PLC0415
+
+        return parse_telemetry_report(line)
+
+    def _dispatch_packet(self, packet: dict[str, Any]) -> None:
+        """Route a packet that did not come in as a line to the callback."""
+        with self._dispatch_lock:
+            self._run_callback(packet)
+
+    def _run_callback(self, packet: dict[str, Any]) -> None:
+        """Route parsed packet to callback, a packet that fails is skipped."""
+        if self._callback:
+            try:
+                self._callback(packet)
+            except Exception:  # noqa: BLE001
+                self._metrics.increment(METRIC_PROCESSING_ERRORS)
+                LOGGER.exception("Failed to process %s", packet.get("raw"))
+
+    def set_filter(self, budlist_filter: str | None) -> None:
+        """
+        Replace the APRS-IS style filter without reconnecting.
+
+        The filter is applied by the source thread within `POLL_INTERVAL`, and
+        is kept for later reconnects.
+        """
+        self._budlist_filter = budlist_filter
+        self._filter_changed.set()
+
+    def stop(self) -> None:
+        """
+        Signal the source to stop.
+
+        The thread closes its connection itself within `POLL_INTERVAL`, or
+        once a pending connect attempt times out.
+        """
+        LOGGER.debug("stop() %s", self.name)
+        self._stop_event.set()
+
+    @abstractmethod
+    def run(self) -> None:
+        """Connect to the source and feed its lines until stopped."""
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Check if the source is connected."""
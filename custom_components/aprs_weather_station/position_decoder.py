@@ -0,0 +1,35 @@
+"""Position decoder."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import POSITION_AMBIGUITY_TO_ACCURACY
+from .data import APRSWSLocation, APRSWSSensorData
+
+
+class APRSWSPositionDecoder:
+    """Decode station location."""
+
+    def decode(
+        self, packet: dict[str, Any], callsign: str, timestamp: int
+    ) -> list[APRSWSSensorData]:
+        """Return location if latitude and longitude are available."""
+        if "latitude" not in packet or "longitude" not in packet:
+            return []
+        ambiguity = packet.get("posambiguity", 0)
+        return [
+            APRSWSSensorData(
+                timestamp=timestamp,
+                callsign=callsign,
+                type="location",
+                value=APRSWSLocation(
+                    latitude=float(packet["latitude"]),
+                    longitude=float(packet["longitude"]),
+                    ambiguity=ambiguity,
+                    accuracy=POSITION_AMBIGUITY_TO_ACCURACY.get(
+                        ambiguity, POSITION_AMBIGUITY_TO_ACCURACY[4]
+                    ),
+                ),
+            )
+        ]
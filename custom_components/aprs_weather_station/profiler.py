@@ -0,0 +1,110 @@
+"""On-demand sampling profiler for aprs_weather_station."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+DEFAULT_SAMPLE_INTERVAL: Final = 0.005  # seconds
+REPORT_TOP_FUNCTIONS: Final = 50
+PACKAGE_PATH: Final = str(Path(__file__).parent)
+OTHER_STACK: Final = "[other]"
+
+THREAD_EVENT_LOOP: Final = "event_loop"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}:{code.co_firstlineno}"
+
+
+class APRSWSProfiler:
+    """
+    Sample stacks of the packet source threads and the event loop thread.
+
+    Sampling runs on the calling thread for the requested duration only, so
+    nothing is hooked into the profiled threads and there is no cost while
+    the profiler is not running. Event loop samples that do not pass through
+    this integration (coordinator and entity callbacks) are folded into a
+    single `[other]` stack.
+    """
+
+    def __init__(
+        self,
+        threads: dict[str, int | None],
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        """Initialize profiler for `threads` (name -> thread ident)."""
+        self._threads = {name: ident for name, ident in threads.items() if ident}
+        self._interval = interval
+        self._stacks: Counter[str] = Counter()
+        self._samples: Counter[str] = Counter()
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()  # noqa: SLF001
+        for name, ident in self._threads.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            self._samples[name] += 1
+            labels: list[str] = []
+            ours = False
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                ours = ours or frame.f_code.co_filename.startswith(PACKAGE_PATH)
+                frame = frame.f_back
+            if name == THREAD_EVENT_LOOP and not ours:
+                self._stacks[f"{name};{OTHER_STACK}"] += 1
+                continue
+            labels.append(name)
+            self._stacks[";".join(reversed(labels))] += 1
+
+    def run(self, duration: float) -> None:
+        """Sample stacks for `duration` seconds, blocking the calling thread."""
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            self._sample()
+            time.sleep(self._interval)
+
+    def report(self) -> str:
+        """Return per-thread function report sorted by inclusive samples."""
+        lines: list[str] = []
+        for name, total in self._samples.most_common():
+            inclusive: Counter[str] = Counter()
+            exclusive: Counter[str] = Counter()
+            for stack, count in self._stacks.items():
+                thread, *labels = stack.split(";")
+                if thread != name:
+                    continue
+                for label in set(labels):
+                    inclusive[label] += count
+                exclusive[labels[-1]] += count
+            lines.append(f"Thread {name}: {total} samples")
+            lines.append(f"{'inclusive':>10} {'self':>10}  function")
+            lines.extend(
+                f"{count / total:>10.1%} {exclusive[label] / total:>10.1%}  {label}"
+                for label, count in inclusive.most_common(REPORT_TOP_FUNCTIONS)
+            )
+            lines.append("")
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Return stacks in flame graph collapsed format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self._stacks.most_common()
+        )
+
+    def write(self, directory: str, prefix: str) -> tuple[str, str]:
+        """Write report and collapsed stacks to `directory`."""
+        base = Path(directory) / f"{prefix}_{int(time.time())}"
+        report_path = base.with_suffix(".txt")
+        collapsed_path = base.with_suffix(".collapsed")
+        report_path.write_text(self.report(), encoding="utf-8")
+        collapsed_path.write_text(self.collapsed(), encoding="utf-8")
+        return str(report_path), str(collapsed_path)
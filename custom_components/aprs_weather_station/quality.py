@@ -0,0 +1,169 @@
+"""Quality control of station readings for aprs_weather_station."""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from statistics import median
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import LOGGER
+from .data import APRSWSReadingHistory
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .data import APRSWSSensorData, APRSWSStationState
+
+REJECT_RANGE: Final = "range"
+REJECT_RATE: Final = "rate"
+REJECT_SPIKE: Final = "spike"
+
+# Accepted values the spike filter takes the median of
+MEDIAN_WINDOW: Final = 5
+# Fewer recent values give no useful median
+MEDIAN_MIN_VALUES: Final = 3
+# Change a fixed or replaced sensor is trusted after, as a glitch repeating
+# this often is no glitch
+MAX_REJECTED_IN_ROW: Final = 3
+# Rate limits are applied over at least this long, as beacons a few seconds
+# apart carry readings taken further apart
+MIN_RATE_INTERVAL: Final = 60.0  # seconds
+
+
+@dataclass(frozen=True, slots=True)
+class APRSWSQualityLimits:
+    """Plausible values of a sensor type, in its sensor unit."""
+
+    minimum: float
+    maximum: float
+    # Largest change per second from the last accepted reading
+    max_rate: float | None = None
+    # Largest difference from the median of the recent accepted readings
+    max_spike: float | None = None
+
+
+# Raw types only, derived values are computed from accepted readings. Wind
+# is gusty, so it only gets range and spike checks.
+QUALITY_LIMITS: Final[dict[str, APRSWSQualityLimits]] = {
+    "temperature": APRSWSQualityLimits(-80, 65, max_rate=3 / 60, max_spike=15),
+    "humidity": APRSWSQualityLimits(0, 100, max_rate=30 / 60, max_spike=50),
+    "atmospheric_pressure": APRSWSQualityLimits(
+        850, 1090, max_rate=2 / 60, max_spike=15
+    ),
+    "wind_speed": APRSWSQualityLimits(0, 100, max_spike=30),
+    "wind_gust": APRSWSQualityLimits(0, 120, max_spike=40),
+    "wind_direction": APRSWSQualityLimits(0, 360),
+    "precipitation": APRSWSQualityLimits(0, 500),
+    "rain_24h": APRSWSQualityLimits(0, 2000),
+    "rain_since_midnight": APRSWSQualityLimits(0, 2000),
+    "snow": APRSWSQualityLimits(0, 5000),
+    "illuminance": APRSWSQualityLimits(0, 200_000),
+}
+
+
+class APRSWSQualityControl:
+    """
+    Drop implausible readings before they reach entities.
+
+    A reading is rejected when it is outside its type's physical range,
+    changed faster than the type can from the last accepted reading, or is
+    far from the median of the recent accepted readings. A station whose
+    readings are rejected `MAX_REJECTED_IN_ROW` times in a row has really
+    changed, its reading is then accepted and its history restarted. Runs on
+    the listener thread, counters are read for diagnostics.
+    """
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        # (reason, sensor type) -> rejected readings
+        self._rejected: Counter[tuple[str, str]] = Counter()
+        self._checked = 0
+
+    def filter(
+        self, sensor_data: Iterable[APRSWSSensorData], state: APRSWSStationState
+    ) -> list[APRSWSSensorData]:
+        """Return the readings of a packet that pass, record the rejected ones."""
+        accepted: list[APRSWSSensorData] = []
+        rejected: list[tuple[str, str]] = []
+        for data in sensor_data:
+            limits = QUALITY_LIMITS.get(data.type)
+            if (
+                limits is None
+                or isinstance(data.value, bool)
+                or not isinstance(data.value, (int, float))
+            ):
+                accepted.append(data)
+                continue
+            reason = self._check(data, float(data.value), limits, state)
+            if reason is None:
+                accepted.append(data)
+            else:
+                rejected.append((reason, data.type))
+                LOGGER.debug(
+                    "Rejected %s %s=%s: %s",
+                    data.callsign,
+                    data.type,
+                    data.value,
+                    reason,
+                )
+        with self._lock:
+            self._checked += len(accepted) + len(rejected)
+            self._rejected.update(rejected)
+        return accepted
+
+    @staticmethod
+    def _check(
+        data: APRSWSSensorData,
+        value: float,
+        limits: APRSWSQualityLimits,
+        state: APRSWSStationState,
+    ) -> str | None:
+        """Return why the reading is rejected, None if it is accepted."""
+        # Outside the range is never real, and does not count towards a change
+        if not limits.minimum <= value <= limits.maximum:
+            return REJECT_RANGE
+        history = state.readings.get(data.type)
+        if history is None:
+            history = state.readings[data.type] = APRSWSReadingHistory()
+
+        reason = None
+        if limits.max_rate is not None and history.recent:
+            interval = max(data.timestamp - history.last_timestamp, MIN_RATE_INTERVAL)
+            if abs(value - history.recent[-1]) > limits.max_rate * interval:
+                reason = REJECT_RATE
+        if (
+            reason is None
+            and limits.max_spike is not None
+            and len(history.recent) >= MEDIAN_MIN_VALUES
+            and abs(value - median(history.recent)) > limits.max_spike
+        ):
+            reason = REJECT_SPIKE
+
+        if reason is not None:
+            history.rejected_in_row += 1
+            if history.rejected_in_row < MAX_REJECTED_IN_ROW:
+                return reason
+            history.recent.clear()
+        history.rejected_in_row = 0
+        history.recent.append(value)
+        if len(history.recent) > MEDIAN_WINDOW:
+            del history.recent[0]
+        history.last_timestamp = data.timestamp
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return rejection counters for diagnostics."""
+        with self._lock:
+            rejected = dict(self._rejected)
+            checked = self._checked
+        by_reason: dict[str, dict[str, int]] = {}
+        for (reason, sensor_type), count in sorted(rejected.items()):
+            by_reason.setdefault(reason, {})[sensor_type] = count
+        return {
+            "readings_checked": checked,
+            "readings_rejected": sum(rejected.values()),
+            "rejected": by_reason,
+        }
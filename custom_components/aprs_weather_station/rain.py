@@ -0,0 +1,71 @@
+"""Rain accumulation for aprs_weather_station."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Final
+
+from .data import APRSWSSensorData
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .data import APRSWSStationState
+
+# Rolling rain values in order of preference. Rain since midnight only drops
+# when the station resets it, rain over the last 24 hours also drops when
+# old rain leaves the window, so only its increases can be counted.
+RAIN_SOURCE_TYPES: Final = ("rain_since_midnight", "rain_24h")
+RAIN_TOTAL_TYPE: Final = "rain_total"
+
+
+def accumulate_rain(
+    sensor_data: Iterable[APRSWSSensorData], state: APRSWSStationState
+) -> list[APRSWSSensorData]:
+    """
+    Turn rolling rain values into a monotonic total, return it if it changed.
+
+    The increase is taken from the preferred source the previous packet also
+    carried, so a station switching source keeps counting as long as one
+    packet has both. The total is restored by its sensor after a restart.
+    """
+    readings = {
+        data.type: data
+        for data in sensor_data
+        if data.type in RAIN_SOURCE_TYPES
+        and isinstance(data.value, (int, float))
+        and not isinstance(data.value, bool)
+    }
+    if not readings:
+        return []
+    last = state.rain_last
+    # Only values of the previous packet, an older one would count rain
+    # another source already counted
+    state.rain_last = {
+        source: float(data.value)  # type: ignore[arg-type]
+        for source, data in readings.items()
+    }
+    source = next((t for t in RAIN_SOURCE_TYPES if t in readings and t in last), None)
+    if source is None:
+        # First report, or no source in common with the last packet
+        return []
+    value = state.rain_last[source]
+    if value >= last[source]:
+        delta = value - last[source]
+    elif source == "rain_since_midnight":
+        # Reset at midnight, everything reported since is new rain
+        delta = value
+    else:
+        delta = 0.0
+    if not delta:
+        return []
+    state.rain_total += delta
+
+    data = readings[source]
+    return [
+        APRSWSSensorData(
+            timestamp=data.timestamp,
+            callsign=data.callsign,
+            type=RAIN_TOTAL_TYPE,
+            value=round(state.rain_total + state.rain_offset, 2),
+        )
+    ]
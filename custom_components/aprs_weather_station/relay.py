@@ -0,0 +1,322 @@
+"""Local APRS-IS compatible relay of the received feed."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+import selectors
+import socket
+import threading
+from collections import deque
+from contextlib import suppress
+from itertools import islice
+from typing import Any, Final
+
+from .const import DEFAULT_RELAY_HOST, LISTENER_SHUTDOWN_TIMEOUT, LOGGER
+
+SERVER_BANNER: Final = b"# aprs_weather_station relay\r\n"
+# Clients that cannot keep up are disconnected instead of buffered forever
+MAX_PENDING_BYTES: Final = 256 * 1024
+# Longest line accepted from a client, login and filter commands are short
+MAX_COMMAND_LENGTH: Final = 1024
+# Buffers handed to one sendmsg call
+SEND_BATCH: Final = 64
+
+
+def compile_filter(text: str) -> re.Pattern[bytes] | None:
+    """
+    Compile the budlist (`b/`) and prefix (`p/`) parts of an APRS-IS filter.
+
+    Returns a pattern to be fully matched against the source callsign, or
+    None to pass every line. Other filter types are ignored, the upstream
+    connection is already limited to the configured stations.
+    """
+    alternatives: list[str] = []
+    for part in text.split():
+        kind, _, arguments = part.partition("/")
+        values = [value for value in arguments.split("/") if value]
+        if kind == "b":
+            alternatives.extend(fnmatch.translate(value) for value in values)
+        elif kind == "p":
+            alternatives.extend(f"{re.escape(value)}.*" for value in values)
+        else:
+            LOGGER.debug("Relay ignores filter %s", part)
+    if not alternatives:
+        return None
+    return re.compile("|".join(alternatives).encode(), re.IGNORECASE)
+
+
+class _Client:
+    """Connection of one local client."""
+
+    __slots__ = (
+        "address",
+        "filter",
+        "inbox",
+        "logged_in",
+        "pending",
+        "pending_bytes",
+        "sock",
+        "writing",
+    )
+
+    def __init__(self, sock: socket.socket, address: str) -> None:
+        self.sock = sock
+        self.address = address
+        self.filter: re.Pattern[bytes] | None = None
+        self.inbox = b""
+        self.logged_in = False
+        # Views of lines shared by all clients, the head may be partly sent
+        self.pending: deque[memoryview] = deque()
+        self.pending_bytes = 0
+        self.writing = False
+
+
+class APRSWSRelayServer(threading.Thread):
+    """
+    Serve the lines received from APRS-IS to local APRS-IS clients.
+
+    Clients log in like to an APRS-IS server and may send a filter, in the
+    login line or later as `#filter`. The listener thread hands each line
+    over as-is, the relay thread wraps it once and queues the same buffer to
+    every matching client. Writes are non-blocking, what a client cannot
+    take yet stays queued until its socket is writable. The relay is
+    receive-only, lines sent by clients other than commands are dropped.
+    """
+
+    POLL_INTERVAL = 0.5  # seconds between checks of the stop flag while idle
+
+    def __init__(self, port: int, host: str = DEFAULT_RELAY_HOST) -> None:
+        """Initialize relay, `start` binds the port on `host`, "" for all."""
+        super().__init__(name=f"{__package__} relay", daemon=True)
+        self._host = host
+        self._port = port
+        self._stop_event = threading.Event()
+        self._selector = selectors.DefaultSelector()
+        self._server: socket.socket | None = None
+        self._waker, self._wake_target = socket.socketpair()
+        self._wakeup_pending = False
+        self._outbox: deque[bytes] = deque()
+        self._lock = threading.Lock()
+        self._clients: dict[socket.socket, _Client] = {}
+        self._logged_in = 0
+        self._dropped = 0
+
+    def start(self) -> None:
+        """Bind the port and start serving. Blocking, run in executor."""
+        self._server = socket.create_server((self._host, self._port))
+        self._server.setblocking(False)  # noqa: FBT003
+        self._waker.setblocking(False)  # noqa: FBT003
+        self._wake_target.setblocking(False)  # noqa: FBT003
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._waker, selectors.EVENT_READ)
+        super().start()
+        LOGGER.info("Relay listening on %s:%s", self._host or "*", self._port)
+
+    def publish(self, line: bytes) -> None:
+        """Queue a received line for the clients. Called on the listener thread."""
+        if not self._logged_in:
+            return
+        self._outbox.append(line)
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            # Full socket buffer means a wakeup is pending anyway
+            with suppress(BlockingIOError):
+                self._wake_target.send(b"\x00")
+
+    def run(self) -> None:
+        """Thread entry point - serve clients until stopped."""
+        try:
+            while not self._stop_event.is_set():
+                for key, events in self._selector.select(self.POLL_INTERVAL):
+                    if key.fileobj is self._server:
+                        self._accept()
+                    elif key.fileobj is self._waker:
+                        self._drain_waker()
+                    else:
+                        client = key.data
+                        if events & selectors.EVENT_READ:
+                            self._read(client)
+                        if events & selectors.EVENT_WRITE:
+                            self._flush(client)
+                self._distribute()
+        except Exception:  # noqa: BLE001
+            LOGGER.exception("Unexpected error in relay thread")
+        finally:
+            for client in list(self._clients.values()):
+                self._drop(client)
+            self._selector.close()
+            if self._server is not None:
+                self._server.close()
+            self._waker.close()
+            self._wake_target.close()
+            LOGGER.debug("Relay stopped")
+
+    def _accept(self) -> None:
+        try:
+            sock, (host, port, *_) = self._server.accept()  # type: ignore[union-attr]
+        except BlockingIOError:
+            return
+        sock.setblocking(False)  # noqa: FBT003
+        client = _Client(sock, f"{host}:{port}")
+        with self._lock:
+            self._clients[sock] = client
+        self._selector.register(sock, selectors.EVENT_READ, client)
+        self._queue(client, memoryview(SERVER_BANNER))
+        self._flush(client)
+        LOGGER.debug("Relay client %s connected", client.address)
+
+    def _drain_waker(self) -> None:
+        try:
+            while self._waker.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        # Cleared only once drained, so the byte of a publish racing with this
+        # is not swallowed. Lines queued before it are picked up by the
+        # `_distribute` that follows every select.
+        self._wakeup_pending = False
+
+    def _read(self, client: _Client) -> None:
+        try:
+            data = client.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(client)
+            return
+        *lines, client.inbox = (client.inbox + data).split(b"\n")
+        if len(client.inbox) > MAX_COMMAND_LENGTH:
+            self._drop(client)
+            return
+        for line in lines:
+            self._command(client, line.rstrip(b"\r"))
+
+    def _command(self, client: _Client, line: bytes) -> None:
+        text = line.decode("utf-8", errors="replace")
+        if text.startswith("user "):
+            words = text.split()
+            callsign = words[1] if len(words) > 1 else "N0CALL"
+            if "filter" in words:
+                client.filter = compile_filter(
+                    " ".join(words[words.index("filter") + 1 :])
+                )
+            self._queue(
+                client,
+                memoryview(
+                    f"# logresp {callsign} unverified, server RELAY\r\n".encode()
+                ),
+            )
+            if not client.logged_in:
+                client.logged_in = True
+                self._logged_in += 1
+            self._flush(client)
+        elif text.startswith("#filter"):
+            client.filter = compile_filter(text.removeprefix("#filter"))
+        elif text and not text.startswith("#"):
+            LOGGER.debug("Relay drops line from %s: %s", client.address, text)
+
+    def _distribute(self) -> None:
+        if not self._outbox:
+            return
+        ready: list[_Client] = [c for c in self._clients.values() if c.logged_in]
+        while self._outbox:
+            # Flush between batches so a burst is not queued up all at once
+            touched: set[_Client] = set()
+            for _ in range(min(len(self._outbox), SEND_BATCH)):
+                line = self._outbox.popleft()
+                callsign = line[: line.find(b">")]
+                view = memoryview(line + b"\r\n")
+                for client in ready:
+                    if not client.logged_in:
+                        # Dropped in an earlier batch
+                        continue
+                    if client.filter is None or client.filter.fullmatch(callsign):
+                        self._queue(client, view)
+                        touched.add(client)
+            for client in touched:
+                self._flush(client)
+                if client.logged_in and client.pending_bytes > MAX_PENDING_BYTES:
+                    LOGGER.warning(
+                        "Relay client %s too slow, disconnecting", client.address
+                    )
+                    self._dropped += 1
+                    self._drop(client)
+
+    @staticmethod
+    def _queue(client: _Client, view: memoryview) -> None:
+        client.pending.append(view)
+        client.pending_bytes += len(view)
+
+    def _flush(self, client: _Client) -> None:
+        if client.sock not in self._clients:
+            return
+        while client.pending:
+            try:
+                sent = client.sock.sendmsg(list(islice(client.pending, SEND_BATCH)))
+            except BlockingIOError:
+                break
+            except OSError:
+                self._drop(client)
+                return
+            client.pending_bytes -= sent
+            while sent:
+                head = client.pending[0]
+                if sent < len(head):
+                    client.pending[0] = head[sent:]
+                    break
+                sent -= len(head)
+                client.pending.popleft()
+            else:
+                continue
+            # Socket buffer full
+            break
+        writing = bool(client.pending)
+        if writing != client.writing:
+            client.writing = writing
+            events = selectors.EVENT_READ
+            if writing:
+                events |= selectors.EVENT_WRITE
+            self._selector.modify(client.sock, events, client)
+
+    def _drop(self, client: _Client) -> None:
+        with self._lock:
+            if self._clients.pop(client.sock, None) is None:
+                return
+        if client.logged_in:
+            client.logged_in = False
+            self._logged_in -= 1
+        self._selector.unregister(client.sock)
+        client.sock.close()
+        client.pending.clear()
+        LOGGER.debug("Relay client %s disconnected", client.address)
+
+    def stop_and_join(self, timeout: float = LISTENER_SHUTDOWN_TIMEOUT) -> bool:
+        """Stop serving and join thread. Blocking, run in executor."""
+        self._stop_event.set()
+        if not self.is_alive():
+            return True
+        with suppress(OSError):
+            self._wake_target.send(b"\x00")
+        self.join(timeout)
+        return not self.is_alive()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return connected clients for diagnostics."""
+        with self._lock:
+            clients = list(self._clients.values())
+        return {
+            "port": self._port,
+            "dropped_slow_clients": self._dropped,
+            "clients": [
+                {
+                    "address": client.address,
+                    "logged_in": client.logged_in,
+                    "filter": client.filter.pattern.decode() if client.filter else None,
+                    "pending_bytes": client.pending_bytes,
+                }
+                for client in clients
+            ],
+        }
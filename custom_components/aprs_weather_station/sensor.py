@@ -2,27 +2,39 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import replace
+from decimal import Decimal
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.const import EntityCategory
 from homeassistant.core import callback
 
 from .const import (
+    APRSIS_DEVICE_CALLSIGN,
     CONF_CALLSIGN,
+    CONF_FIELD_SENSORS_DISABLED,
+    CONF_WEATHER_ENTITY,
     LOGGER,
+    METRIC_SENSOR_TYPES,
     SENSOR_TYPE_TO_MDI_ICONS,
-    SENSOR_TYPE_TO_SENSOR_DEVICE_CLASS,
-    SENSOR_TYPE_TO_SENSOR_STATE_CLASS,
     SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT,
 )
 from .data import APRSWSSensorData
 from .entity import APRSWSEntity
+from .metadata import VOLATILE_METADATA_FIELDS, metadata_attributes
+from .rain import RAIN_TOTAL_TYPE
+from .weather import SENSOR_TYPE_TO_WEATHER_ATTRIBUTE
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from datetime import datetime
     from types import MappingProxyType
 
@@ -32,7 +44,84 @@ if TYPE_CHECKING:
     from homeassistant.helpers.typing import StateType
 
     from .coordinator import APRSWSDataUpdateCoordinator
-    from .data import APRSWSConfigEntry
+    from .data import APRSWSConfigEntry, APRSWSStationMetadata
+
+
+SENSOR_TYPE_TO_SENSOR_STATE_CLASS: Final[dict[str, SensorStateClass | None]] = {
+    "timestamp": SensorStateClass.TOTAL_INCREASING,
+    "packet_received": SensorStateClass.TOTAL_INCREASING,
+    "wind_speed": SensorStateClass.MEASUREMENT,
+    "wind_direction": SensorStateClass.MEASUREMENT_ANGLE,
+    "wind_gust": SensorStateClass.MEASUREMENT,
+    "temperature": SensorStateClass.MEASUREMENT,
+    "precipitation": SensorStateClass.MEASUREMENT,
+    "rain_24h": SensorStateClass.MEASUREMENT,
+    "rain_since_midnight": SensorStateClass.MEASUREMENT,
+    "rain_raw": SensorStateClass.MEASUREMENT,
+    "rain_total": SensorStateClass.TOTAL_INCREASING,
+    "snow": SensorStateClass.MEASUREMENT,
+    "humidity": SensorStateClass.MEASUREMENT,
+    "atmospheric_pressure": SensorStateClass.MEASUREMENT,
+    "illuminance": SensorStateClass.MEASUREMENT,
+    "dew_point": SensorStateClass.MEASUREMENT,
+    "heat_index": SensorStateClass.MEASUREMENT,
+    "wind_chill": SensorStateClass.MEASUREMENT,
+    "apparent_temperature": SensorStateClass.MEASUREMENT,
+    "absolute_humidity": SensorStateClass.MEASUREMENT,
+    "telemetry_1": SensorStateClass.MEASUREMENT,
+    "telemetry_2": SensorStateClass.MEASUREMENT,
+    "telemetry_3": SensorStateClass.MEASUREMENT,
+    "telemetry_4": SensorStateClass.MEASUREMENT,
+    "telemetry_5": SensorStateClass.MEASUREMENT,
+    "is_connected": None,
+    "lines_received": SensorStateClass.TOTAL_INCREASING,
+    "packets_parsed": SensorStateClass.TOTAL_INCREASING,
+    "parse_failures": SensorStateClass.TOTAL_INCREASING,
+    "packets_filtered": SensorStateClass.TOTAL_INCREASING,
+    "loop_handoffs": SensorStateClass.TOTAL_INCREASING,
+    "state_writes": SensorStateClass.TOTAL_INCREASING,
+    "reconnects": SensorStateClass.TOTAL_INCREASING,
+    "processing_errors": SensorStateClass.TOTAL_INCREASING,
+    "packets_per_second": SensorStateClass.MEASUREMENT,
+}
+
+SENSOR_TYPE_TO_SENSOR_DEVICE_CLASS: Final[dict[str, SensorDeviceClass | None]] = {
+    "timestamp": SensorDeviceClass.TIMESTAMP,
+    "packet_received": None,
+    "wind_speed": SensorDeviceClass.WIND_SPEED,
+    "wind_direction": SensorDeviceClass.WIND_DIRECTION,
+    "wind_gust": SensorDeviceClass.WIND_SPEED,
+    "temperature": SensorDeviceClass.TEMPERATURE,
+    "precipitation": SensorDeviceClass.PRECIPITATION,
+    "rain_24h": SensorDeviceClass.PRECIPITATION,
+    "rain_since_midnight": SensorDeviceClass.PRECIPITATION,
+    "rain_raw": None,
+    "rain_total": SensorDeviceClass.PRECIPITATION,
+    "snow": SensorDeviceClass.PRECIPITATION,
+    "humidity": SensorDeviceClass.HUMIDITY,
+    "atmospheric_pressure": SensorDeviceClass.ATMOSPHERIC_PRESSURE,
+    "illuminance": SensorDeviceClass.ILLUMINANCE,
+    "dew_point": SensorDeviceClass.TEMPERATURE,
+    "heat_index": SensorDeviceClass.TEMPERATURE,
+    "wind_chill": SensorDeviceClass.TEMPERATURE,
+    "apparent_temperature": SensorDeviceClass.TEMPERATURE,
+    "absolute_humidity": SensorDeviceClass.ABSOLUTE_HUMIDITY,
+    "telemetry_1": None,
+    "telemetry_2": None,
+    "telemetry_3": None,
+    "telemetry_4": None,
+    "telemetry_5": None,
+    "is_connected": SensorDeviceClass.ENUM,
+    "lines_received": None,
+    "packets_parsed": None,
+    "parse_failures": None,
+    "packets_filtered": None,
+    "loop_handoffs": None,
+    "state_writes": None,
+    "reconnects": None,
+    "processing_errors": None,
+    "packets_per_second": None,
+}
 
 
 def _find_subentry(
@@ -62,17 +151,11 @@ async def async_setup_entry(
         new_sensors = list(
             filter(
                 lambda s: s.key not in known_sensors and s.type != "location",
-                coordinator.data,
+                coordinator.data.values(),
             )
         )
-        LOGGER.debug(
-            "_check_device entry.subentries:%s\nknown_sensors:%s\nnew_sensors:%s",
-            entry.subentries,
-            known_sensors,
-            new_sensors,
-        )
         for sensor in list(new_sensors):
-            if sensor.type == "is_connected":
+            if sensor.callsign == APRSIS_DEVICE_CALLSIGN:
                 entities = [
                     APRSWSSensor(
                         data=sensor,
@@ -85,13 +168,27 @@ async def async_setup_entry(
                 if not subentry:
                     LOGGER.error("Cannot find subentry %s", sensor.callsign)
                     continue
-                if sensor.type == "packet_received":
+                if sensor.type == "timestamp":
+                    entities = [
+                        APRSWSLastPacketSensor(
+                            data=sensor,
+                            coordinator=coordinator,
+                        )
+                    ]
+                elif sensor.type == "packet_received":
                     entities = [
                         APRSWSPacketReceivedSensor(
                             data=sensor,
                             coordinator=coordinator,
                         )
                     ]
+                elif sensor.type == RAIN_TOTAL_TYPE:
+                    entities = [
+                        APRSWSRainTotalSensor(
+                            data=sensor,
+                            coordinator=coordinator,
+                        )
+                    ]
                 else:
                     entities = [
                         APRSWSSensor(
@@ -100,6 +197,9 @@ async def async_setup_entry(
                         )
                     ]
                 subentry_id = subentry.subentry_id
+            for entity in entities:
+                # Allow re-adding the entity if it gets removed
+                entity.async_on_remove(partial(known_sensors.discard, sensor.key))
             async_add_entities(
                 entities,
                 config_subentry_id=subentry_id,
@@ -160,7 +260,21 @@ class APRSWSSensor(APRSWSEntity, SensorEntity):
                     ],
                     entity_category=EntityCategory.DIAGNOSTIC,
                 )
+            elif data.type in METRIC_SENSOR_TYPES:
+                entity_description = SensorEntityDescription(
+                    key=data.key,
+                    translation_key=data.type,
+                    has_entity_name=True,
+                    device_class=SENSOR_TYPE_TO_SENSOR_DEVICE_CLASS[data.type],
+                    icon=SENSOR_TYPE_TO_MDI_ICONS[data.type],
+                    state_class=SENSOR_TYPE_TO_SENSOR_STATE_CLASS[data.type],
+                    native_unit_of_measurement=SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT[
+                        data.type
+                    ],
+                    entity_category=EntityCategory.DIAGNOSTIC,
+                )
             else:
+                options = coordinator.config_entry.options
                 entity_description = SensorEntityDescription(
                     key=data.key,
                     translation_key=data.type,
@@ -171,11 +285,19 @@ class APRSWSSensor(APRSWSEntity, SensorEntity):
                     native_unit_of_measurement=SENSOR_TYPE_TO_UNIT_OF_MEASUREMENT[
                         data.type
                     ],
+                    # Already shown by the weather entity
+                    entity_registry_enabled_default=not (
+                        data.type in SENSOR_TYPE_TO_WEATHER_ATTRIBUTE
+                        and options.get(CONF_WEATHER_ENTITY, False)
+                        and options.get(CONF_FIELD_SENSORS_DISABLED, False)
+                    ),
                 )
 
         super().__init__(coordinator, entity_description, data.callsign)
         self.entity_description = entity_description
         self.data = data
+        if data.name:
+            self._attr_name = data.name
         if self.device_info:
             self.device_info.update(name=data.callsign)
 
@@ -184,21 +306,15 @@ class APRSWSSensor(APRSWSEntity, SensorEntity):
         """Return the native value of the sensor."""
         return self.data.value
 
-    @staticmethod
-    def _find_sensor_data(
-        sensors: list[APRSWSSensorData], key: str
-    ) -> APRSWSSensorData | None:
-        return next(
-            (data for data in sensors if data.key == key),
-            None,
-        )
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return unit announced by the station, else the unit of the type."""
+        return self.data.unit or super().native_unit_of_measurement
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        new_data = self._find_sensor_data(
-            self.coordinator.data, self.entity_description.key
-        )
+        new_data = self.coordinator.data.get(self.entity_description.key)
         if not new_data:
             return
 
@@ -206,15 +322,54 @@ class APRSWSSensor(APRSWSEntity, SensorEntity):
             LOGGER.warning("found duplicated timestamp, ignore data...")
             return
 
-        LOGGER.debug(
-            "update sensor_data for %s with value %s",
-            new_data.key,
-            new_data.value,
-        )
         self.data = new_data
         self.async_write_ha_state()
 
 
+class APRSWSLastPacketSensor(APRSWSSensor):
+    """Sensor for the last packet time, with the station metadata as attributes."""
+
+    _unrecorded_attributes = VOLATILE_METADATA_FIELDS
+
+    def __init__(
+        self,
+        data: APRSWSSensorData,
+        coordinator: APRSWSDataUpdateCoordinator,
+        entity_description: SensorEntityDescription | None = None,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(data, coordinator, entity_description)
+        self._metadata: APRSWSStationMetadata | None = None
+        self._attr_extra_state_attributes = {}
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return station metadata, rebuilt only when it changed."""
+        metadata = self.coordinator.station_metadata.get(self.data.callsign)
+        if metadata is not self._metadata:
+            self._metadata = metadata
+            self._attr_extra_state_attributes = (
+                metadata_attributes(metadata) if metadata else {}
+            )
+        return self._attr_extra_state_attributes
+
+
+class APRSWSRainTotalSensor(APRSWSSensor, RestoreSensor):
+    """Rain total, continued from its last value after a restart."""
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the total before following the coordinator."""
+        last = await self.async_get_last_sensor_data()
+        if last is not None and isinstance(last.native_value, (int, float, Decimal)):
+            restored = float(last.native_value)
+            self.coordinator.async_restore_rain_total(self.data.callsign, restored)
+            if isinstance(self.data.value, (int, float)):
+                self.data = replace(
+                    self.data, value=round(self.data.value + restored, 2)
+                )
+        await super().async_added_to_hass()
+
+
 class APRSWSPacketReceivedSensor(APRSWSSensor):
     """Sensor for packet received with incremental counter."""
 
@@ -230,9 +385,7 @@ class APRSWSPacketReceivedSensor(APRSWSSensor):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        new_data = self._find_sensor_data(
-            self.coordinator.data, self.entity_description.key
-        )
+        new_data = self.coordinator.data.get(self.entity_description.key)
         if not new_data:
             return
 
@@ -248,17 +401,5 @@ class APRSWSPacketReceivedSensor(APRSWSSensor):
             ),
         )
 
-        LOGGER.debug(
-            "self.data.value=%s new_data.value=%s new_data_copy.value=%s",
-            self.data.value,
-            new_data.value,
-            new_data_copy.value,
-        )
-
-        LOGGER.debug(
-            "update sensor_data for %s with value %s",
-            new_data_copy.key,
-            new_data_copy.value,
-        )
         self.data = new_data_copy
         self.async_write_ha_state()
@@ -0,0 +1,242 @@
+"""Services for aprs_weather_station."""
+
+from __future__ import annotations
+
+import asyncio
+from importlib import import_module
+from typing import TYPE_CHECKING, Final
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_CALLSIGN, DOMAIN, LOGGER
+from .profiler import THREAD_EVENT_LOOP, APRSWSProfiler
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .data import APRSWSConfigEntry
+
+SERVICE_PROFILE: Final = "profile"
+SERVICE_IMPORT_STATISTICS: Final = "import_statistics"
+SERVICE_QUERY_TIMESERIES: Final = "query_timeseries"
+SERVICE_GET_TRACK: Final = "get_track"
+SERVICE_DUMP_PACKETS: Final = "dump_packets"
+
+ATTR_SECONDS: Final = "seconds"
+ATTR_PATH: Final = "path"
+ATTR_SENSOR_TYPE: Final = "sensor_type"
+ATTR_START: Final = "start"
+ATTR_END: Final = "end"
+
+PROFILE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SECONDS, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+    }
+)
+
+IMPORT_STATISTICS_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+    }
+)
+
+QUERY_TIMESERIES_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(CONF_CALLSIGN): vol.Match(r"^[A-Za-z0-9-]+$"),
+        vol.Required(ATTR_SENSOR_TYPE): vol.Match(r"^[a-z0-9_]+$"),
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+GET_TRACK_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(CONF_CALLSIGN): cv.string,
+    }
+)
+
+DUMP_PACKETS_SCHEMA: Final = GET_TRACK_SCHEMA
+
+
+def _as_timestamp(value: datetime) -> int:
+    return int(dt_util.as_utc(value).timestamp())
+
+
+def _get_entry(hass: HomeAssistant, call: ServiceCall) -> APRSWSConfigEntry:
+    entry: APRSWSConfigEntry | None = hass.config_entries.async_get_entry(
+        call.data[ATTR_CONFIG_ENTRY_ID]
+    )
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+        )
+    return entry
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services."""
+    profile_lock = asyncio.Lock()
+
+    async def _async_profile(call: ServiceCall) -> ServiceResponse:
+        entry = _get_entry(hass, call)
+        if profile_lock.locked():
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profile_running",
+            )
+        async with profile_lock:
+            profiler = APRSWSProfiler(
+                {
+                    **entry.runtime_data.client.listener_thread_ids,
+                    THREAD_EVENT_LOOP: hass.loop_thread_id,
+                }
+            )
+            await hass.async_add_executor_job(profiler.run, call.data[ATTR_SECONDS])
+            report, collapsed = await hass.async_add_executor_job(
+                profiler.write, hass.config.path(), f"{DOMAIN}_profile"
+            )
+        LOGGER.info("Wrote profile report to %s and %s", report, collapsed)
+        return {"report": report, "collapsed": collapsed}
+
+    async def _async_import_statistics(call: ServiceCall) -> ServiceResponse:
+        entry = _get_entry(hass, call)
+        path = call.data[ATTR_PATH]
+        if not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="path_not_allowed",
+                translation_placeholders={"path": path},
+            )
+        entity_ids = {
+            entity.unique_id: entity.entity_id
+            for entity in er.async_entries_for_config_entry(
+                er.async_get(hass), entry.entry_id
+            )
+            if entity.domain == "sensor"
+        }
+        # The recorder is only pulled in once statistics are imported
+        backfill_module = await hass.async_add_import_executor_job(
+            import_module, f"{__package__}.backfill"
+        )
+        backfill = backfill_module.APRSWSBackfill(hass, entity_ids)
+        try:
+            result = await hass.async_add_executor_job(backfill.run, path)
+        except OSError as ex:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="path_unreadable",
+                translation_placeholders={"path": path, "error": str(ex)},
+            ) from ex
+        response = result.as_dict()
+        LOGGER.info(
+            "Imported %s hourly statistics from %s (%s rows/s)",
+            response["rows"],
+            path,
+            response["rows_per_second"],
+        )
+        return response
+
+    async def _async_query_timeseries(call: ServiceCall) -> ServiceResponse:
+        entry = _get_entry(hass, call)
+        timeseries = entry.runtime_data.timeseries
+        if timeseries is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="timeseries_disabled",
+            )
+        start = _as_timestamp(call.data[ATTR_START])
+        end = _as_timestamp(call.data.get(ATTR_END, dt_util.utcnow()))
+        samples = await hass.async_add_executor_job(
+            timeseries.query,
+            call.data[CONF_CALLSIGN].upper(),
+            call.data[ATTR_SENSOR_TYPE],
+            start,
+            end,
+        )
+        return {
+            "timestamps": [timestamp for timestamp, _ in samples],
+            "values": [value for _, value in samples],
+        }
+
+    async def _async_get_track(call: ServiceCall) -> ServiceResponse:
+        entry = _get_entry(hass, call)
+        callsign = call.data.get(CONF_CALLSIGN)
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                track.as_geojson(track_callsign)
+                for track_callsign, track in entry.runtime_data.tracks.items()
+                if callsign is None or track_callsign == callsign.upper()
+            ],
+        }
+
+    async def _async_dump_packets(call: ServiceCall) -> ServiceResponse:
+        entry = _get_entry(hass, call)
+        callsign = call.data.get(CONF_CALLSIGN)
+        return entry.runtime_data.packet_log.as_dict(
+            callsign.upper() if callsign else None
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_PACKETS,
+        _async_dump_packets,
+        schema=DUMP_PACKETS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_TRACK,
+        _async_get_track,
+        schema=GET_TRACK_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_TIMESERIES,
+        _async_query_timeseries,
+        schema=QUERY_TIMESERIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_STATISTICS,
+        _async_import_statistics,
+        schema=IMPORT_STATISTICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
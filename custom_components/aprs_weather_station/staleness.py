@@ -0,0 +1,158 @@
+"""Station availability tracking for aprs_weather_station."""
+
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, Final
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from asyncio import TimerHandle
+
+    from homeassistant.core import HomeAssistant
+
+# Interval assumed until a station's own interval has been observed
+DEFAULT_BEACON_INTERVAL: Final = 1800.0  # seconds
+MIN_BEACON_INTERVAL: Final = 60.0
+MAX_BEACON_INTERVAL: Final = 6 * 3600.0
+# Copies of a packet relayed by several gateways arrive within seconds
+DUPLICATE_WINDOW: Final = 10.0
+# Weight of the newest observation in the learned interval
+INTERVAL_SMOOTHING: Final = 0.3
+# Heap entries per tracked station before superseded ones are dropped
+HEAP_COMPACT_RATIO: Final = 4
+
+
+def station_signal(entry_id: str, callsign: str) -> str:
+    """Return dispatcher signal carrying availability of a station."""
+    return f"{DOMAIN}_{entry_id}_{callsign}_available"
+
+
+class APRSWSStalenessScheduler:
+    """
+    Mark stations unavailable after `missed_beacons` expected beacons.
+
+    Each station's beacon interval is learned from its packets. Expected
+    deadlines sit in one heap served by a single timer. A beacon pushes a new
+    deadline and leaves the superseded one to be skipped when it comes up,
+    once superseded entries make up most of the heap it is rebuilt from the
+    live deadlines, so it stays within `HEAP_COMPACT_RATIO` entries per
+    station. Expiry sends one dispatcher signal per station, which all of the
+    station's entities listen to. Runs on the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, missed_beacons: int) -> None:
+        """Initialize scheduler."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._missed_beacons = missed_beacons
+        # callsign -> (last beacon, learned interval, deadline)
+        self._stations: dict[str, tuple[float, float | None, float]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._unavailable: set[str] = set()
+        self._timer: TimerHandle | None = None
+        self._timer_deadline: float | None = None
+
+    def is_available(self, callsign: str) -> bool:
+        """Return False if the station missed its beacons."""
+        return callsign not in self._unavailable
+
+    @callback
+    def async_beacon(self, callsign: str) -> None:
+        """Record a packet from `callsign`."""
+        if not self._missed_beacons:
+            return
+        now = self._hass.loop.time()
+        station = self._stations.get(callsign)
+        interval = station[1] if station else None
+        if station is not None and callsign not in self._unavailable:
+            last, interval, _ = station
+            observed = now - last
+            if observed < DUPLICATE_WINDOW:
+                return
+            observed = min(max(observed, MIN_BEACON_INTERVAL), MAX_BEACON_INTERVAL)
+            interval = (
+                observed
+                if interval is None
+                else interval + INTERVAL_SMOOTHING * (observed - interval)
+            )
+        deadline = now + self._missed_beacons * (interval or DEFAULT_BEACON_INTERVAL)
+        self._stations[callsign] = (now, interval, deadline)
+        returned = callsign in self._unavailable
+        self._unavailable.discard(callsign)
+        heapq.heappush(self._heap, (deadline, callsign))
+        if len(self._heap) > HEAP_COMPACT_RATIO * len(self._stations):
+            self._compact()
+        self._async_schedule()
+
+        if returned:
+            LOGGER.debug("Station %s is available again", callsign)
+            async_dispatcher_send(
+                self._hass,
+                station_signal(self._entry_id, callsign),
+                True,  # noqa: FBT003
+            )
+
+    @callback
+    def async_forget(self, callsign: str) -> None:
+        """Stop tracking a removed station, its heap entries expire unused."""
+        self._stations.pop(callsign, None)
+        self._unavailable.discard(callsign)
+
+    def _compact(self) -> None:
+        """Rebuild the heap from the deadlines still pending."""
+        self._heap = [
+            (deadline, callsign)
+            for callsign, (_, _, deadline) in self._stations.items()
+            if callsign not in self._unavailable
+        ]
+        heapq.heapify(self._heap)
+
+    @callback
+    def _async_schedule(self) -> None:
+        if not self._heap:
+            return
+        deadline = self._heap[0][0]
+        if self._timer is not None:
+            if self._timer_deadline is not None and self._timer_deadline <= deadline:
+                return
+            self._timer.cancel()
+        self._timer_deadline = deadline
+        self._timer = self._hass.loop.call_at(deadline, self._async_expire)
+
+    @callback
+    def _async_expire(self) -> None:
+        self._timer = None
+        self._timer_deadline = None
+        now = self._hass.loop.time()
+        while self._heap and self._heap[0][0] <= now:
+            deadline, callsign = heapq.heappop(self._heap)
+            station = self._stations.get(callsign)
+            if (
+                station is None
+                or station[2] != deadline
+                or callsign in self._unavailable
+            ):
+                # Superseded by a later beacon, or an earlier entry with the
+                # same deadline already expired the station
+                continue
+            self._unavailable.add(callsign)
+            LOGGER.debug("Station %s missed %s beacons", callsign, self._missed_beacons)
+            async_dispatcher_send(
+                self._hass,
+                station_signal(self._entry_id, callsign),
+                False,  # noqa: FBT003
+            )
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+            self._timer_deadline = None
@@ -0,0 +1,131 @@
+"""Telemetry decoder."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from .data import APRSWSSensorData
+
+TELEMETRY_CHANNELS: Final = 5
+TELEMETRY_SENSOR_TYPES: Final = tuple(
+    f"telemetry_{channel}" for channel in range(1, TELEMETRY_CHANNELS + 1)
+)
+# Identity equation: a*x^2 + b*x + c with a=0, b=1, c=0
+IDENTITY_EQUATION: Final = (0.0, 1.0, 0.0)
+
+
+def _default_names() -> list[str | None]:
+    return [None] * TELEMETRY_CHANNELS
+
+
+def _default_equations() -> list[tuple[float, float, float]]:
+    return [IDENTITY_EQUATION] * TELEMETRY_CHANNELS
+
+
+@dataclass(slots=True)
+class _Definitions:
+    """PARM/UNIT/EQNS definitions of one station's analog channels."""
+
+    names: list[str | None] = field(default_factory=_default_names)
+    units: list[str | None] = field(default_factory=_default_names)
+    equations: list[tuple[float, float, float]] = field(
+        default_factory=_default_equations
+    )
+
+
+def parse_telemetry_report(line: bytes) -> dict[str, Any] | None:
+    """
+    Parse a `T#` telemetry report aprslib does not support.
+
+    Returns a packet shaped like aprslib's comment telemetry, or None if the
+    line is not a telemetry report.
+    """
+    from aprslib.exceptions import ParseError  # noqa: PLC0415
+    from aprslib.parsing.common import parse_header  # noqa: PLC0415
+
+    text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+    head, _, body = text.partition(":")
+    if not body.startswith("T#"):
+        return None
+    sequence, *fields = body[2:].split(",")
+    values: list[float | None] = []
+    for value in fields[:TELEMETRY_CHANNELS]:
+        try:
+            values.append(float(value))
+        except ValueError:
+            values.append(None)
+    try:
+        header = parse_header(head)
+    except ParseError:
+        return None
+    packet: dict[str, Any] = {
+        "raw": text,
+        **header,
+        "format": "telemetry",
+        "telemetry": {"seq": sequence.strip(), "vals": values},
+    }
+    if len(fields) > TELEMETRY_CHANNELS:
+        packet["telemetry"]["bits"] = fields[TELEMETRY_CHANNELS].strip()[:8]
+    return packet
+
+
+class APRSWSTelemetryDecoder:
+    """
+    Decode analog telemetry channels.
+
+    Definition messages (PARM, UNIT, EQNS) are cached per station when they
+    arrive, reports are then scaled and labelled from the cache.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty definition cache."""
+        self._definitions: dict[str, _Definitions] = {}
+
+    def _update_definitions(self, packet: dict[str, Any]) -> None:
+        target = packet.get("addresse", "").strip()
+        if not target:
+            return
+        definitions = self._definitions.setdefault(target, _Definitions())
+        if "tPARM" in packet:
+            definitions.names = [
+                name.strip() or None for name in packet["tPARM"][:TELEMETRY_CHANNELS]
+            ]
+        if "tUNIT" in packet:
+            definitions.units = [
+                unit.strip() or None for unit in packet["tUNIT"][:TELEMETRY_CHANNELS]
+            ]
+        if "tEQNS" in packet:
+            definitions.equations = [
+                (float(a), float(b), float(c))
+                for a, b, c in packet["tEQNS"][:TELEMETRY_CHANNELS]
+            ]
+
+    def decode(
+        self, packet: dict[str, Any], callsign: str, timestamp: int
+    ) -> list[APRSWSSensorData]:
+        """Return scaled analog channels of a telemetry report."""
+        if packet.get("format") == "telemetry-message":
+            self._update_definitions(packet)
+            return []
+        telemetry = packet.get("telemetry")
+        if not telemetry:
+            return []
+
+        definitions = self._definitions.get(callsign) or _Definitions()
+        sensor_data: list[APRSWSSensorData] = []
+        for channel, raw in enumerate(telemetry.get("vals", ())):
+            if raw is None or channel >= TELEMETRY_CHANNELS:
+                continue
+            a, b, c = definitions.equations[channel]
+            sensor_data.append(
+                APRSWSSensorData(
+                    timestamp=timestamp,
+                    callsign=callsign,
+                    type=TELEMETRY_SENSOR_TYPES[channel],
+                    value=round(a * raw * raw + b * raw + c, 3),
+                    name=definitions.names[channel],
+                    unit=definitions.units[channel],
+                )
+            )
+        return sensor_data
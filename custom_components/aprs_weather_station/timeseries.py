@@ -0,0 +1,264 @@
+"""Append-only memory-mapped time-series store for aprs_weather_station."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from contextlib import suppress
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .data import APRSWSSensorData
+
+SEGMENT_MAGIC: Final = b"APRSTS1\x00"
+SEGMENT_SUFFIX: Final = ".seg"
+# Segments that cannot be read are renamed to this and left for inspection
+CORRUPT_SUFFIX: Final = ".corrupt"
+SEGMENT_CAPACITY: Final = 4096  # samples per segment
+# magic, sample count, last timestamp
+HEADER: Final = struct.Struct("<8sQq")
+TIMESTAMP_SIZE: Final = 8
+VALUE_SIZE: Final = 8
+SEGMENT_SIZE: Final = HEADER.size + SEGMENT_CAPACITY * (TIMESTAMP_SIZE + VALUE_SIZE)
+PRUNE_INTERVAL: Final = timedelta(hours=1)
+# Sensor types that are not a float measurement over time.
+EXCLUDED_SENSOR_TYPES: Final = frozenset({"timestamp", "packet_received", "location"})
+
+
+class _Segment:
+    """
+    One fixed-size segment file with a timestamp column and a value column.
+
+    Layout is a header followed by SEGMENT_CAPACITY int64 timestamps and then
+    SEGMENT_CAPACITY float64 values, so a range scan only touches the
+    timestamp pages plus the matching slice of the value column.
+    """
+
+    __slots__ = ("_file", "_mmap", "count", "last", "path", "timestamps")
+
+    def __init__(self, path: Path, *, create: bool) -> None:
+        self.path = path
+        if create:
+            with path.open("wb") as file:
+                file.truncate(SEGMENT_SIZE)
+                file.write(HEADER.pack(SEGMENT_MAGIC, 0, 0))
+        self._file = path.open("r+b")
+        try:
+            # Raises ValueError if the file was truncated
+            self._mmap = mmap.mmap(self._file.fileno(), SEGMENT_SIZE)
+        except ValueError:
+            self._file.close()
+            raise
+        magic, self.count, self.last = HEADER.unpack_from(self._mmap)
+        if magic != SEGMENT_MAGIC or self.count > SEGMENT_CAPACITY:
+            self.close()
+            msg = f"Invalid segment {path}"
+            raise ValueError(msg)
+        self.timestamps = memoryview(self._mmap)[
+            HEADER.size : HEADER.size + SEGMENT_CAPACITY * TIMESTAMP_SIZE
+        ].cast("q")
+
+    @property
+    def full(self) -> bool:
+        return self.count >= SEGMENT_CAPACITY
+
+    def append(self, timestamp: int, value: float) -> None:
+        index = self.count
+        self.timestamps[index] = timestamp
+        struct.pack_into("<d", self._mmap, self._value_offset(index), value)
+        # Count is written last so a crash never exposes a torn sample
+        self.count = index + 1
+        self.last = timestamp
+        HEADER.pack_into(self._mmap, 0, SEGMENT_MAGIC, self.count, self.last)
+
+    @staticmethod
+    def _value_offset(index: int) -> int:
+        return HEADER.size + SEGMENT_CAPACITY * TIMESTAMP_SIZE + index * VALUE_SIZE
+
+    def read(self, start: int, end: int) -> list[tuple[int, float]]:
+        timestamps = self.timestamps[: self.count]
+        low = bisect_left(timestamps, start)
+        high = bisect_right(timestamps, end)
+        if low >= high:
+            return []
+        values = struct.unpack_from(
+            f"<{high - low}d", self._mmap, self._value_offset(low)
+        )
+        return list(zip(timestamps[low:high], values, strict=True))
+
+    def close(self) -> None:
+        if hasattr(self, "timestamps"):
+            self.timestamps.release()
+        self._mmap.close()
+        self._file.close()
+
+
+class APRSWSTimeSeriesStore:
+    """
+    Columnar per-station store written from the listener thread.
+
+    Each (callsign, sensor type) series is a directory of fixed-size segments
+    named after their first timestamp. Samples cost 16 bytes on disk. Segments
+    whose newest sample is older than the retention are deleted by `prune`,
+    and queries never return samples older than the retention. Segments that
+    cannot be read are set aside and the series continues in a new one.
+    """
+
+    def __init__(self, root: str, retention_days: int) -> None:
+        """Initialize store rooted at `root`."""
+        self._root = Path(root)
+        self._retention = retention_days * 86400
+        self._lock = threading.Lock()
+        self._writers: dict[tuple[str, str], _Segment] = {}
+
+    def _series_dir(self, callsign: str, sensor_type: str) -> Path:
+        return self._root / callsign / sensor_type
+
+    def _segments(self, directory: Path) -> list[Path]:
+        if not directory.is_dir():
+            return []
+        return sorted(
+            directory.glob(f"*{SEGMENT_SUFFIX}"), key=lambda path: int(path.stem)
+        )
+
+    @staticmethod
+    def _open(path: Path) -> _Segment | None:
+        """Open an existing segment, set it aside and return None if corrupt."""
+        try:
+            return _Segment(path, create=False)
+        except ValueError:
+            LOGGER.warning("Corrupt time-series segment %s, setting it aside", path)
+            path.replace(path.with_suffix(CORRUPT_SUFFIX))
+            return None
+
+    def _writer(self, callsign: str, sensor_type: str, timestamp: int) -> _Segment:
+        series = (callsign, sensor_type)
+        segment = self._writers.get(series)
+        if segment is not None and not segment.full:
+            return segment
+        if segment is not None:
+            segment.close()
+
+        directory = self._series_dir(callsign, sensor_type)
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = self._segments(directory)
+        if segment is None and existing:
+            segment = self._open(existing[-1])
+            if segment is not None and not segment.full:
+                self._writers[series] = segment
+                return segment
+            if segment is not None:
+                segment.close()
+
+        segment = _Segment(directory / f"{timestamp}{SEGMENT_SUFFIX}", create=True)
+        self._writers[series] = segment
+        return segment
+
+    def prune(self, now: float | None = None) -> int:
+        """Delete segments of all series past the retention, return how many."""
+        cutoff = int(now if now is not None else time.time()) - self._retention
+        removed = 0
+        with self._lock:
+            for directory in self._root.glob("*/*"):
+                series = (directory.parent.name, directory.name)
+                for path in self._segments(directory):
+                    writer = self._writers.get(series)
+                    if writer is not None and writer.path == path:
+                        segment, last = None, writer.last
+                    else:
+                        segment = self._open(path)
+                        if segment is None:
+                            continue
+                        last = segment.last
+                        segment.close()
+                    if last >= cutoff:
+                        # Segments are time ordered, the remaining ones are newer
+                        break
+                    if writer is not None and writer.path == path:
+                        writer.close()
+                        del self._writers[series]
+                    LOGGER.debug("Removing expired segment %s", path)
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                with suppress(OSError):
+                    # Only succeeds once a silent series has no segment left
+                    directory.rmdir()
+                    directory.parent.rmdir()
+        return removed
+
+    def append(self, sensor_data: Iterable[APRSWSSensorData]) -> None:
+        """Append numeric values of a parsed packet."""
+        with self._lock:
+            for data in sensor_data:
+                if (
+                    data.type in EXCLUDED_SENSOR_TYPES
+                    or isinstance(data.value, bool)
+                    or not isinstance(data.value, (int, float))
+                ):
+                    continue
+                segment = self._writer(data.callsign, data.type, data.timestamp)
+                if data.timestamp < segment.last:
+                    # Append-only, late packets would break the sort order
+                    continue
+                segment.append(data.timestamp, float(data.value))
+
+    def query(
+        self, callsign: str, sensor_type: str, start: int, end: int
+    ) -> list[tuple[int, float]]:
+        """Return samples of one series between `start` and `end` (inclusive)."""
+        start = max(start, int(time.time()) - self._retention)
+        samples: list[tuple[int, float]] = []
+        with self._lock:
+            for path in self._segments(self._series_dir(callsign, sensor_type)):
+                if int(path.stem) > end:
+                    break
+                writer = self._writers.get((callsign, sensor_type))
+                if writer is not None and writer.path == path:
+                    samples.extend(writer.read(start, end))
+                    continue
+                segment = self._open(path)
+                if segment is None:
+                    continue
+                try:
+                    if segment.last >= start:
+                        samples.extend(segment.read(start, end))
+                finally:
+                    segment.close()
+        return samples
+
+    def stats(self) -> dict[str, Any]:
+        """Return disk usage summary."""
+        segments = list(self._root.glob(f"*/*/*{SEGMENT_SUFFIX}"))
+        samples = 0
+        with self._lock:
+            for path in list(segments):
+                segment = self._open(path)
+                if segment is None:
+                    segments.remove(path)
+                    continue
+                samples += segment.count
+                segment.close()
+        disk_bytes = len(segments) * SEGMENT_SIZE
+        return {
+            "series": len({path.parent for path in segments}),
+            "segments": len(segments),
+            "samples": samples,
+            "disk_bytes": disk_bytes,
+            "bytes_per_sample": round(disk_bytes / samples, 1) if samples else None,
+        }
+
+    def close(self) -> None:
+        """Close all open segments."""
+        with self._lock:
+            for segment in self._writers.values():
+                segment.close()
+            self._writers.clear()
@@ -0,0 +1,164 @@
+"""Sampled per-stage latency tracing for aprs_weather_station."""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from time import perf_counter_ns
+from typing import Any, Final
+
+STAGE_DECODE: Final = "decode"
+STAGE_PARSE: Final = "parse"
+STAGE_HANDOFF: Final = "handoff"
+STAGE_DISPATCH: Final = "dispatch"
+STAGE_TOTAL: Final = "total"
+
+STAGES: Final = (
+    STAGE_DECODE,
+    STAGE_PARSE,
+    STAGE_HANDOFF,
+    STAGE_DISPATCH,
+    STAGE_TOTAL,
+)
+
+# Upper bounds of histogram buckets in microseconds, last bucket is open ended.
+BUCKET_BOUNDS_US: Final = (
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    20_000,
+    50_000,
+    100_000,
+    200_000,
+    500_000,
+    1_000_000,
+    2_000_000,
+    5_000_000,
+)
+
+DEFAULT_SAMPLE_RATE: Final = 100
+
+
+class APRSWSTrace:
+    """Stage timestamps of a single sampled packet."""
+
+    __slots__ = ("_last", "stages", "started")
+
+    def __init__(self, started: int) -> None:
+        """Start trace at `started` (perf_counter_ns)."""
+        self.started = started
+        self._last = started
+        self.stages: list[tuple[str, int]] = []
+
+    def mark(self, stage: str) -> None:
+        """Record time elapsed since previous stage."""
+        now = perf_counter_ns()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> int:
+        """Time elapsed between start and last stage in nanoseconds."""
+        return self._last - self.started
+
+
+class APRSWSLatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("buckets", "count")
+
+    def __init__(self) -> None:
+        """Initialize empty histogram."""
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+
+    def add(self, elapsed_ns: int) -> None:
+        """Add a sample."""
+        self.buckets[bisect_left(BUCKET_BOUNDS_US, elapsed_ns / 1000)] += 1
+        self.count += 1
+
+    def percentile(self, quantile: float) -> int | None:
+        """Return bucket upper bound (us) holding `quantile`, None if open ended."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        cumulative = 0
+        for bound, bucket in zip((*BUCKET_BOUNDS_US, None), self.buckets, strict=True):
+            cumulative += bucket
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return histogram summary."""
+        return {
+            "count": self.count,
+            "p50_us": self.percentile(0.50),
+            "p95_us": self.percentile(0.95),
+            "p99_us": self.percentile(0.99),
+            "buckets": dict(
+                zip(
+                    [*(f"<={bound}" for bound in BUCKET_BOUNDS_US), "inf"],
+                    self.buckets,
+                    strict=True,
+                )
+            ),
+        }
+
+
+class APRSWSLatencyTracer:
+    """
+    Trace one in `sample_rate` packets from socket read to state write.
+
+    `begin` and `take` are called on the listener thread, `record` on the
+    event loop, so only the histograms need a lock.
+    """
+
+    def __init__(self, sample_rate: int = DEFAULT_SAMPLE_RATE) -> None:
+        """Initialize tracer."""
+        self.sample_rate = max(sample_rate, 1)
+        self._seen = 0
+        self._pending: APRSWSTrace | None = None
+        self._lock = threading.Lock()
+        self._histograms = {stage: APRSWSLatencyHistogram() for stage in STAGES}
+
+    def begin(self) -> None:
+        """Mark a line read from the socket, sampling every Nth one."""
+        self._seen += 1
+        if self._seen < self.sample_rate:
+            self._pending = None
+            return
+        self._seen = 0
+        self._pending = APRSWSTrace(perf_counter_ns())
+
+    def take(self) -> APRSWSTrace | None:
+        """Claim the pending trace for the packet being handled, if sampled."""
+        trace, self._pending = self._pending, None
+        if trace is not None:
+            trace.mark(STAGE_DECODE)
+        return trace
+
+    def record(self, trace: APRSWSTrace) -> None:
+        """Aggregate a completed trace."""
+        with self._lock:
+            for stage, elapsed in trace.stages:
+                self._histograms[stage].add(elapsed)
+            self._histograms[STAGE_TOTAL].add(trace.total)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a snapshot suitable for diagnostics."""
+        with self._lock:
+            return {
+                "sample_rate": self.sample_rate,
+                "stages": {
+                    stage: histogram.as_dict()
+                    for stage, histogram in self._histograms.items()
+                },
+            }
@@ -0,0 +1,124 @@
+"""Simplified track history of mobile stations."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any, Final
+
+DEFAULT_TRACK_TOLERANCE: Final = 25.0  # meters
+DEFAULT_TRACK_MAX_POINTS: Final = 500
+# Points held back while the simplification window is open, bounds the
+# per-packet cost on long straight legs.
+MAX_WINDOW_POINTS: Final = 64
+EARTH_RADIUS: Final = 6371008.8  # meters
+POLYLINE_PRECISION: Final = 1e5
+
+type TrackPoint = tuple[float, float, int]  # latitude, longitude, timestamp
+
+
+def _offset_distance(origin: TrackPoint, start: TrackPoint, end: TrackPoint) -> float:
+    """Return distance in meters of `origin` from the segment `start`-`end`."""
+    # Equirectangular projection around `start`, exact enough at track scale
+    scale = math.cos(math.radians(start[0]))
+    bx = math.radians(end[1] - start[1]) * scale * EARTH_RADIUS
+    by = math.radians(end[0] - start[0]) * EARTH_RADIUS
+    px = math.radians(origin[1] - start[1]) * scale * EARTH_RADIUS
+    py = math.radians(origin[0] - start[0]) * EARTH_RADIUS
+    length = bx * bx + by * by
+    if not length:
+        return math.hypot(px, py)
+    t = max(0.0, min(1.0, (px * bx + py * by) / length))
+    return math.hypot(px - t * bx, py - t * by)
+
+
+def _encode_value(value: int) -> str:
+    value = ~(value << 1) if value < 0 else value << 1
+    chunks: list[str] = []
+    while value >= 0x20:  # noqa: PLR2004
+        chunks.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    chunks.append(chr(value + 63))
+    return "".join(chunks)
+
+
+class APRSWSTrack:
+    """
+    Bounded track of one station simplified as points arrive.
+
+    Uses an opening window line simplification: points after the last kept
+    point are held back as long as all of them lie within `tolerance` of the
+    line from the last kept point to the newest one. When a point falls
+    outside, the previous point is kept and the window restarts from it. Kept
+    points are capped at `max_points`, dropping the oldest.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = DEFAULT_TRACK_TOLERANCE,
+        max_points: int = DEFAULT_TRACK_MAX_POINTS,
+    ) -> None:
+        """Initialize empty track."""
+        self._tolerance = tolerance
+        self._points: deque[TrackPoint] = deque(maxlen=max_points)
+        self._window: list[TrackPoint] = []
+
+    def __len__(self) -> int:
+        """Return number of points of the simplified track."""
+        return len(self._points) + (1 if self._window else 0)
+
+    def append(self, latitude: float, longitude: float, timestamp: int) -> None:
+        """Add a position report."""
+        point = (latitude, longitude, timestamp)
+        if not self._points:
+            self._points.append(point)
+            return
+        anchor = self._points[-1]
+        last = self._window[-1] if self._window else anchor
+        if _offset_distance(point, last, last) <= self._tolerance:
+            # Stationary, nothing to add
+            return
+        if len(self._window) < MAX_WINDOW_POINTS and all(
+            _offset_distance(held, anchor, point) <= self._tolerance
+            for held in self._window
+        ):
+            self._window.append(point)
+            return
+        self._points.append(self._window[-1])
+        self._window = [point]
+
+    @property
+    def points(self) -> list[TrackPoint]:
+        """Return simplified track, oldest first."""
+        if self._window:
+            return [*self._points, self._window[-1]]
+        return list(self._points)
+
+    def encoded_polyline(self) -> str:
+        """Return track in encoded polyline format (precision 5)."""
+        chunks: list[str] = []
+        previous_lat = previous_lon = 0
+        for latitude, longitude, _ in self.points:
+            lat = round(latitude * POLYLINE_PRECISION)
+            lon = round(longitude * POLYLINE_PRECISION)
+            chunks.append(_encode_value(lat - previous_lat))
+            chunks.append(_encode_value(lon - previous_lon))
+            previous_lat, previous_lon = lat, lon
+        return "".join(chunks)
+
+    def as_geojson(self, callsign: str) -> dict[str, Any]:
+        """Return track as a GeoJSON LineString feature."""
+        points = self.points
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": [
+                    [longitude, latitude] for latitude, longitude, _ in points
+                ],
+            },
+            "properties": {
+                "callsign": callsign,
+                "timestamps": [timestamp for _, _, timestamp in points],
+            },
+        }
@@ -0,0 +1,177 @@
+"""Weather platform for aprs_weather_station."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.components.weather import (
+    ATTR_CONDITION_RAINY,
+    ATTR_CONDITION_SNOWY,
+    ATTR_CONDITION_WINDY,
+    WeatherEntity,
+    WeatherEntityDescription,
+)
+from homeassistant.const import UnitOfPressure, UnitOfSpeed, UnitOfTemperature
+from homeassistant.core import callback
+
+from .const import CONF_CALLSIGN, CONF_WEATHER_ENTITY, LOGGER
+from .entity import APRSWSEntity
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from types import MappingProxyType
+
+    from homeassistant.config_entries import ConfigSubentry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+    from .coordinator import APRSWSDataUpdateCoordinator
+    from .data import APRSWSConfigEntry
+
+# Beaufort 6, strong breeze
+WINDY_SPEED: Final = 10.8  # m/s
+
+# Sensor type -> weather entity attribute, types without one are exposed
+# as extra state attributes in their sensor unit
+SENSOR_TYPE_TO_WEATHER_ATTRIBUTE: Final[dict[str, str | None]] = {
+    "temperature": "_attr_native_temperature",
+    "humidity": "_attr_humidity",
+    "atmospheric_pressure": "_attr_native_pressure",
+    "wind_speed": "_attr_native_wind_speed",
+    "wind_gust": "_attr_native_wind_gust_speed",
+    "wind_direction": "_attr_wind_bearing",
+    "dew_point": "_attr_native_dew_point",
+    "apparent_temperature": "_attr_native_apparent_temperature",
+    "precipitation": None,
+    "snow": None,
+}
+
+
+def _find_subentry(
+    subentries: MappingProxyType[str, ConfigSubentry], callsign: str
+) -> ConfigSubentry | None:
+    return next(
+        (
+            subentry
+            for subentry in subentries.values()
+            if subentry.data[CONF_CALLSIGN] == callsign
+        ),
+        None,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: APRSWSConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up the weather platform."""
+    if not entry.options.get(CONF_WEATHER_ENTITY, False):
+        return
+    coordinator = entry.runtime_data.coordinator
+
+    known_stations: set[str] = set()
+
+    def _check_device() -> None:
+        new_stations = {
+            sensor.callsign
+            for sensor in coordinator.data.values()
+            if sensor.type in SENSOR_TYPE_TO_WEATHER_ATTRIBUTE
+            and sensor.callsign not in known_stations
+        }
+        for callsign in new_stations:
+            subentry = _find_subentry(entry.subentries, callsign)
+            if not subentry:
+                LOGGER.error("Cannot find subentry %s", callsign)
+                continue
+            entity = APRSWSWeather(callsign=callsign, coordinator=coordinator)
+            # Allow re-adding the entity if it gets removed
+            entity.async_on_remove(partial(known_stations.discard, callsign))
+            async_add_entities(
+                [entity],
+                config_subentry_id=subentry.subentry_id,
+            )
+            known_stations.add(callsign)
+            LOGGER.debug("Added weather %s to %s", callsign, subentry.subentry_id)
+
+    entry.async_on_unload(coordinator.async_add_listener(_check_device))
+
+
+class APRSWSWeather(APRSWSEntity, WeatherEntity):
+    """
+    Current conditions of a station in one entity.
+
+    A packet updates all of its fields with a single state write, instead of
+    one write per sensor.
+    """
+
+    _attr_native_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_native_pressure_unit = UnitOfPressure.HPA
+    _attr_native_wind_speed_unit = UnitOfSpeed.METERS_PER_SECOND
+
+    def __init__(
+        self,
+        callsign: str,
+        coordinator: APRSWSDataUpdateCoordinator,
+        entity_description: WeatherEntityDescription | None = None,
+    ) -> None:
+        """Initialize the weather entity."""
+        if entity_description is None:
+            entity_description = WeatherEntityDescription(
+                key=f"{callsign}_weather",
+                has_entity_name=True,
+                name=None,
+            )
+        super().__init__(coordinator, entity_description, callsign)
+        self.entity_description = entity_description
+        # Sensor key -> sensor type, weather entity attribute
+        self._fields = {
+            f"{callsign}_{sensor_type}": (sensor_type, attribute)
+            for sensor_type, attribute in SENSOR_TYPE_TO_WEATHER_ATTRIBUTE.items()
+        }
+        self._extra: dict[str, float] = {}
+        self._update_fields()
+        if self.device_info:
+            self.device_info.update(name=callsign)
+
+    def _update_fields(self) -> bool:
+        """Take the station's values from the latest packet, True if any changed."""
+        changed = False
+        for key, (sensor_type, attribute) in self._fields.items():
+            data = self.coordinator.data.get(key)
+            if data is None or isinstance(data.value, bool):
+                continue
+            if not isinstance(data.value, (int, float)):
+                continue
+            value = float(data.value)
+            if attribute is None:
+                if self._extra.get(sensor_type) != value:
+                    self._extra[sensor_type] = value
+                    changed = True
+            elif getattr(self, attribute) != value:
+                setattr(self, attribute, value)
+                changed = True
+        return changed
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return precipitation and snow in mm."""
+        return self._extra
+
+    @property
+    def condition(self) -> str | None:
+        """Return a condition the station's own measurements can tell."""
+        if self._extra.get("snow"):
+            return ATTR_CONDITION_SNOWY
+        if self._extra.get("precipitation"):
+            return ATTR_CONDITION_RAINY
+        if (self._attr_native_wind_speed or 0) >= WINDY_SPEED:
+            return ATTR_CONDITION_WINDY
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._update_fields():
+            self.async_write_ha_state()
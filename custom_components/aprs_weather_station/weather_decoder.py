@@ -0,0 +1,71 @@
+"""Weather decoder."""
+
+from __future__ import annotations
+
+from typing import Any, Final
+
+from .data import APRSWSSensorData
+
+# aprslib weather field -> sensor type
+WEATHER_FIELD_TO_SENSOR_TYPE: Final = {
+    "wind_speed": "wind_speed",
+    "wind_direction": "wind_direction",
+    "wind_gust": "wind_gust",
+    "temperature": "temperature",
+    "rain_1h": "precipitation",
+    "rain_24h": "rain_24h",
+    "rain_since_midnight": "rain_since_midnight",
+    "rain_raw": "rain_raw",
+    "snow": "snow",
+    "humidity": "humidity",
+    "pressure": "atmospheric_pressure",
+    "luminosity": "illuminance",
+}
+
+# aprslib reads the wind extension of position weather reports as a course
+# and a speed in knots converted to km/h, while the station sent mph.
+KNOTS_TO_KMH: Final = 1.852
+MPH_TO_MS: Final = 0.44704
+
+
+class APRSWSWeatherDecoder:
+    """Decode the weather block of position and positionless reports."""
+
+    def decode(
+        self, packet: dict[str, Any], callsign: str, timestamp: int
+    ) -> list[APRSWSSensorData]:
+        """Return weather sensor data."""
+        weather = packet.get("weather")
+        if not weather:
+            return []
+        sensor_data = [
+            APRSWSSensorData(
+                timestamp=timestamp,
+                callsign=callsign,
+                type=sensor_type,
+                value=weather[field],
+            )
+            for field, sensor_type in WEATHER_FIELD_TO_SENSOR_TYPE.items()
+            if field in weather
+        ]
+
+        # Position weather reports carry wind as the course/speed extension
+        if "wind_direction" not in weather and "course" in packet:
+            sensor_data.append(
+                APRSWSSensorData(
+                    timestamp=timestamp,
+                    callsign=callsign,
+                    type="wind_direction",
+                    value=packet["course"],
+                )
+            )
+        if "wind_speed" not in weather and "speed" in packet:
+            sensor_data.append(
+                APRSWSSensorData(
+                    timestamp=timestamp,
+                    callsign=callsign,
+                    type="wind_speed",
+                    value=packet["speed"] / KNOTS_TO_KMH * MPH_TO_MS,
+                )
+            )
+        return sensor_data
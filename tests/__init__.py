@@ -0,0 +1 @@
+"""Tests for the aprs_weather_station integration."""
@@ -0,0 +1,180 @@
+"""Stand-in APRS-IS server on localhost for tests."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections import deque
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from custom_components.aprs_weather_station.relay import compile_filter
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Callable, Iterable
+
+BANNER = b"# stand-in aprs-is\r\n"
+POLL_INTERVAL = 0.05  # seconds
+BATCH_LINES = 256
+# aprslib reads the login response with one recv, lines sent right behind
+# it would be lost
+LOGIN_SETTLE = 0.2  # seconds
+
+
+class StandInAPRSISServer:
+    """
+    Serve queued lines to clients logging in like to APRS-IS.
+
+    Lines are taken from one shared queue, so a client reconnecting picks up
+    where the previous connection stopped. The budlist and prefix filters of
+    the login line and of `#filter` commands are applied, as the real server
+    does. With `stall` set, connections are accepted and then left silent,
+    not even the banner is sent.
+    """
+
+    def __init__(self, *, stall: bool = False) -> None:
+        """Initialize, `start` binds a free port."""
+        self.stall = stall
+        self.port = 0
+        self.connections = 0
+        self.lines_sent = 0
+        self.lines_filtered = 0
+        self.filter = ""
+        self._queue: deque[bytes] = deque()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._clients: list[socket.socket] = []
+        self._threads: list[threading.Thread] = []
+        self._server: socket.socket | None = None
+
+    def start(self) -> None:
+        """Bind and start accepting."""
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self._server.settimeout(POLL_INTERVAL)
+        self.port = self._server.getsockname()[1]
+        self._spawn(self._accept)
+
+    def _spawn(self, target: Callable[..., None], *args: object) -> None:
+        thread = threading.Thread(
+            target=target, args=args, name="stand-in APRS-IS", daemon=True
+        )
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+
+    def send(self, lines: Iterable[bytes]) -> None:
+        """Queue lines for the connected client."""
+        self._queue.extend(lines)
+
+    @property
+    def pending(self) -> int:
+        """Return lines not sent yet."""
+        return len(self._queue)
+
+    def drop_clients(self) -> None:
+        """Close all client connections, as a server restart would."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            with suppress(OSError):
+                client.shutdown(socket.SHUT_RDWR)
+            client.close()
+
+    def stop(self) -> None:
+        """Stop serving and wait for all server threads."""
+        self._stop.set()
+        self.drop_clients()
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(5)
+        if self._server is not None:
+            self._server.close()
+
+    def _accept(self) -> None:
+        assert self._server is not None
+        while not self._stop.is_set():
+            try:
+                client, _ = self._server.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
+            self.connections += 1
+            self._spawn(self._serve, client)
+
+    def _serve(self, client: socket.socket) -> None:
+        client.settimeout(POLL_INTERVAL)
+        try:
+            if self.stall:
+                while not self._stop.is_set() and client.fileno() != -1:
+                    with suppress(TimeoutError):
+                        if not client.recv(4096):
+                            return
+                return
+            client.sendall(BANNER)
+            login = self._read_line(client)
+            if login is None:
+                return
+            words = login.decode(errors="replace").split()
+            callsign = words[1] if len(words) > 1 else "N0CALL"
+            if "filter" in words:
+                self.filter = " ".join(words[words.index("filter") + 1 :])
+            line_filter = compile_filter(self.filter) if self.filter else None
+            client.sendall(
+                f"# logresp {callsign} unverified, server STANDIN\r\n".encode()
+            )
+            if not self._stop.wait(LOGIN_SETTLE):
+                self._stream(client, line_filter)
+        except OSError:
+            return
+        finally:
+            client.close()
+
+    def _read_line(self, client: socket.socket) -> bytes | None:
+        data = b""
+        while b"\n" not in data:
+            if self._stop.is_set():
+                return None
+            try:
+                chunk = client.recv(4096)
+            except TimeoutError:
+                continue
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def _stream(
+        self, client: socket.socket, line_filter: re.Pattern[bytes] | None
+    ) -> None:
+        inbox = b""
+        while not self._stop.is_set():
+            try:
+                chunk = client.recv(4096)
+            except TimeoutError:
+                chunk = None
+            if chunk == b"":
+                return
+            if chunk:
+                *commands, inbox = (inbox + chunk).split(b"\n")
+                for command in commands:
+                    if command.startswith(b"#filter"):
+                        self.filter = command.removeprefix(b"#filter").decode().strip()
+                        line_filter = compile_filter(self.filter)
+            batch: list[bytes] = []
+            while self._queue and len(batch) < BATCH_LINES:
+                line = self._queue.popleft()
+                if line_filter is None or line_filter.fullmatch(
+                    line[: line.find(b">")]
+                ):
+                    batch.append(line + b"\r\n")
+                else:
+                    self.lines_filtered += 1
+            if batch:
+                client.sendall(b"".join(batch))
+                self.lines_sent += len(batch)
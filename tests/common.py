@@ -0,0 +1,72 @@
+"""Helpers for aprs_weather_station tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigSubentryData
+
+from custom_components.aprs_weather_station.const import CONF_CALLSIGN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+STATION = "G4ZMG"
+WEATHER_LINE = (
+    b"G4ZMG>APRS,TCPIP*,qAC,T2SYDNEY:@100100z5205.65N/00219.62W_202/008g013t054"
+    b"r001p021P001h98b10038L000.WFL"
+)
+
+
+def weather_line(
+    minute: int, *, temperature: int = 54, rain_since_midnight: int = 1
+) -> bytes:
+    """Return a weather report of STATION at 01:`minute` UTC, in APRS units."""
+    return (
+        f"{STATION}>APRS,TCPIP*,qAC,T2SYDNEY:@1001{minute:02d}z5205.65N/00219.62W"
+        f"_202/008g013t{temperature:03d}r001p021P{rain_since_midnight:03d}h98b10038"
+    ).encode()
+
+
+def budlist_subentry(callsign: str) -> ConfigSubentryData:
+    """Return subentry data following `callsign`."""
+    return ConfigSubentryData(
+        data={CONF_CALLSIGN: callsign},
+        subentry_type="budlist",
+        title=callsign,
+        unique_id=callsign,
+    )
+
+
+async def setup_entry(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Add and set up `entry`."""
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def feed_lines(
+    hass: HomeAssistant, entry: MockConfigEntry, *lines: bytes
+) -> None:
+    """Hand raw lines to the entry the way its listener thread does."""
+    from custom_components.aprs_weather_station.aprs_listener import (  # noqa: PLC0415
+        APRSListener,
+    )
+
+    runtime_data = entry.runtime_data
+    source = APRSListener(
+        "N0CALL",
+        None,
+        runtime_data.coordinator.aprs_callback,
+        metrics=runtime_data.metrics,
+        tracer=runtime_data.tracer,
+        packet_log=runtime_data.packet_log,
+    )
+
+    def _feed() -> None:
+        for line in lines:
+            source._consumer_callback(line)
+
+    await hass.async_add_executor_job(_feed)
+    await hass.async_block_till_done()
@@ -0,0 +1,70 @@
+"""Fixtures for aprs_weather_station tests."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import aprslib
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import CONF_YOUR_CALLSIGN, DOMAIN
+
+from .aprs_is_server import StandInAPRSISServer
+from .common import STATION, budlist_subentry
+from .kiss_server import StandInKissTNC
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components in every test."""
+
+
+@pytest.fixture
+def config_entry() -> MockConfigEntry:
+    """Return an entry following one station."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        subentries_data=[budlist_subentry(STATION)],
+    )
+
+
+@pytest.fixture
+def no_listener() -> Generator[None]:
+    """Keep the client from connecting, packets are fed by the test."""
+    with patch(
+        "custom_components.aprs_weather_station.api.APRSWSApiClient.start_listening"
+    ):
+        yield
+
+
+@pytest.fixture
+def aprs_is_server(socket_enabled: None) -> Generator[StandInAPRSISServer]:  # noqa: ARG001
+    """Point the listener at a stand-in APRS-IS server on localhost."""
+    server = StandInAPRSISServer()
+    server.start()
+    connect_to = aprslib.IS
+    with patch(
+        "custom_components.aprs_weather_station.aprs_listener.aprslib.IS",
+        side_effect=lambda callsign, port: connect_to(  # noqa: ARG005
+            callsign, host="127.0.0.1", port=server.port
+        ),
+    ):
+        yield server
+    server.stop()
+
+
+@pytest.fixture
+def kiss_tnc(socket_enabled: None) -> Generator[StandInKissTNC]:  # noqa: ARG001
+    """Run a stand-in KISS TNC on localhost."""
+    tnc = StandInKissTNC()
+    tnc.start()
+    yield tnc
+    tnc.stop()
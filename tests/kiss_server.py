@@ -0,0 +1,147 @@
+"""Stand-in KISS over TCP TNC on localhost for tests."""
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections import deque
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from custom_components.aprs_weather_station.kiss_listener import (
+    AX25_UI_FRAME,
+    FEND,
+    FESC,
+    KISS_DATA_FRAME,
+    TFEND,
+    TFESC,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+POLL_INTERVAL = 0.05  # seconds
+
+
+def kiss_escape(data: bytes) -> bytes:
+    """Byte stuff a frame, the reverse of `kiss_unescape`."""
+    return data.replace(FESC, FESC + TFESC).replace(FEND, FESC + TFEND)
+
+
+def _ax25_address(callsign: str, flags: int) -> bytes:
+    base, _, ssid = callsign.partition("-")
+    field = bytes(byte << 1 for byte in base.ljust(6).encode())
+    return field + bytes([0x60 | (int(ssid or 0) << 1) | flags])
+
+
+def ax25_frame(
+    source: str,
+    destination: str,
+    information: bytes,
+    digipeaters: Iterable[tuple[str, bool]] = (),
+) -> bytes:
+    """Return an AX.25 UI frame, digipeaters as (callsign, has been repeated)."""
+    digipeaters = list(digipeaters)
+    addresses = [(destination, False), (source, False), *digipeaters]
+    encoded = b"".join(
+        _ax25_address(
+            callsign,
+            (0x80 if repeated else 0) | (0x01 if index == len(addresses) - 1 else 0),
+        )
+        for index, (callsign, repeated) in enumerate(addresses)
+    )
+    return encoded + AX25_UI_FRAME + information
+
+
+def kiss_frame(frame: bytes, kiss_type: int = KISS_DATA_FRAME) -> bytes:
+    """Wrap an AX.25 frame for the TCP stream."""
+    return FEND + bytes([kiss_type]) + kiss_escape(frame) + FEND
+
+
+class StandInKissTNC:
+    """
+    Serve queued KISS bytes to whichever client is connected, like Direwolf.
+
+    Bytes are taken from one shared queue in the chunks they were queued as,
+    one chunk per poll interval, so a test controls how frames are split
+    across reads.
+    """
+
+    def __init__(self) -> None:
+        """Initialize, `start` binds a free port."""
+        self.port = 0
+        self.connections = 0
+        self._queue: deque[bytes] = deque()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._clients: list[socket.socket] = []
+        self._threads: list[threading.Thread] = []
+        self._server: socket.socket | None = None
+
+    def start(self) -> None:
+        """Bind and start accepting."""
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self._server.settimeout(POLL_INTERVAL)
+        self.port = self._server.getsockname()[1]
+        self._spawn(self._accept)
+
+    def _spawn(self, target: Callable[..., None], *args: object) -> None:
+        thread = threading.Thread(
+            target=target, args=args, name="stand-in KISS TNC", daemon=True
+        )
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+
+    def send(self, chunks: Iterable[bytes]) -> None:
+        """Queue raw stream bytes for the connected client."""
+        self._queue.extend(chunks)
+
+    def drop_clients(self) -> None:
+        """Close all client connections, as a TNC restart would."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            with suppress(OSError):
+                client.shutdown(socket.SHUT_RDWR)
+            client.close()
+
+    def stop(self) -> None:
+        """Stop serving and wait for all server threads."""
+        self._stop.set()
+        self.drop_clients()
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join(5)
+        if self._server is not None:
+            self._server.close()
+
+    def _accept(self) -> None:
+        assert self._server is not None
+        while not self._stop.is_set():
+            try:
+                client, _ = self._server.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
+            self.connections += 1
+            self._spawn(self._serve, client)
+
+    def _serve(self, client: socket.socket) -> None:
+        client.settimeout(POLL_INTERVAL)
+        try:
+            while not self._stop.is_set():
+                with suppress(TimeoutError):
+                    if not client.recv(4096):
+                        return
+                if self._queue:
+                    client.sendall(self._queue.popleft())
+        except OSError:
+            return
+        finally:
+            client.close()
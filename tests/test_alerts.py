@@ -0,0 +1,257 @@
+"""Tests for the threshold alert engine."""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import voluptuous as vol
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.aprs_weather_station import alerts
+from custom_components.aprs_weather_station.alerts import (
+    EVENT_ALERT,
+    APRSWSAlertEngine,
+)
+from custom_components.aprs_weather_station.const import (
+    CONF_ALERT_RULES,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+)
+from custom_components.aprs_weather_station.data import APRSWSSensorData
+
+from .common import STATION, budlist_subentry, feed_lines, setup_entry, weather_line
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import Event, HomeAssistant
+
+RULES = 1000
+PACKETS = 1000
+# Measured at about 20 microseconds, generous for slow CI machines
+PACKET_BUDGET = 1e-3  # seconds
+
+
+class _Clock:
+    """Monotonic clock advanced by the test."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    """Replace the clock the engine times cooldowns with."""
+    clock = _Clock()
+    monkeypatch.setattr(alerts, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+def _reading(
+    sensor_type: str, value: float, timestamp: int = 0, callsign: str = STATION
+) -> APRSWSSensorData:
+    return APRSWSSensorData(
+        timestamp=timestamp, callsign=callsign, type=sensor_type, value=value
+    )
+
+
+def _entry(rules: list[dict[str, Any]]) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        options={CONF_ALERT_RULES: rules},
+        subentries_data=[budlist_subentry(STATION)],
+    )
+
+
+class _Harness:
+    """Feed readings to an engine from a worker thread, as the listener does."""
+
+    def __init__(self, hass: HomeAssistant, rules: list[dict[str, Any]]) -> None:
+        self.hass = hass
+        self.engine = APRSWSAlertEngine(hass, "entry", rules)
+        self.events: list[Event] = async_capture_events(hass, EVENT_ALERT)
+
+    async def feed(self, *readings: APRSWSSensorData) -> list[str]:
+        """Evaluate readings one packet each, return the new event states."""
+        seen = len(self.events)
+        for reading in readings:
+            await self.hass.async_add_executor_job(self.engine.evaluate, [reading])
+        await self.hass.async_block_till_done()
+        return [event.data["state"] for event in self.events[seen:]]
+
+
+async def test_hysteresis(hass: HomeAssistant) -> None:
+    """An alert clears only once the value is back past the hysteresis."""
+    harness = _Harness(
+        hass, [{"name": "gust", "sensor": "wind_gust", "above": 20, "hysteresis": 2}]
+    )
+
+    assert await harness.feed(_reading("wind_gust", 21)) == ["on"]
+    assert harness.engine.active["gust"] == {STATION}
+    assert (
+        await harness.feed(_reading("wind_gust", 19), _reading("wind_gust", 21)) == []
+    )
+    assert await harness.feed(_reading("wind_gust", 17.9)) == ["off"]
+    assert harness.engine.active["gust"] == frozenset()
+    assert harness.events[0].data == {
+        "entry_id": "entry",
+        "rule": "gust",
+        "state": "on",
+        "callsign": STATION,
+        "sensor": "wind_gust",
+        "value": 21.0,
+    }
+
+
+async def test_cooldown(hass: HomeAssistant, clock: _Clock) -> None:
+    """A cleared alert stays quiet for the cooldown."""
+    harness = _Harness(
+        hass,
+        [{"name": "cold", "sensor": "temperature", "below": 0, "cooldown": 600}],
+    )
+
+    assert await harness.feed(_reading("temperature", -1)) == ["on"]
+    assert await harness.feed(_reading("temperature", 1)) == ["off"]
+    clock.now += 599
+    assert await harness.feed(_reading("temperature", -1)) == []
+    clock.now += 1
+    assert await harness.feed(_reading("temperature", -1)) == ["on"]
+
+
+async def test_change_over_period(hass: HomeAssistant) -> None:
+    """Rules can watch how far a value changed over a period."""
+    harness = _Harness(
+        hass,
+        [
+            {
+                "name": "falling",
+                "sensor": "atmospheric_pressure",
+                "below": -3,
+                "change_over": {"hours": 3},
+            }
+        ],
+    )
+    hour = 3600
+
+    assert (
+        await harness.feed(
+            _reading("atmospheric_pressure", 1010, 0),
+            _reading("atmospheric_pressure", 1006, 2 * hour),
+        )
+        == []
+    )
+    assert await harness.feed(_reading("atmospheric_pressure", 1006, 3 * hour)) == [
+        "on"
+    ]
+
+
+async def test_callsign_globs(hass: HomeAssistant) -> None:
+    """Only stations matching the rule's callsigns are watched."""
+    harness = _Harness(
+        hass,
+        [{"name": "hot", "sensor": "temperature", "above": 30, "callsign": ["G4*"]}],
+    )
+
+    assert await harness.feed(_reading("temperature", 35, callsign="M0XYZ")) == []
+    assert await harness.feed(_reading("temperature", 35, callsign="G4ZMG")) == ["on"]
+
+
+def test_forget_clears_the_station(hass: HomeAssistant) -> None:
+    """A removed station leaves no alert behind."""
+    engine = APRSWSAlertEngine(
+        hass, "entry", [{"name": "hot", "sensor": "temperature", "above": 30}]
+    )
+    engine.active["hot"] = frozenset({STATION})
+
+    engine.forget(STATION)
+    assert engine.active["hot"] == frozenset()
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        [{"name": "bad", "sensor": "lines_received", "above": 1}],
+        [{"name": "bad", "sensor": "temperature"}],
+        [
+            {"name": "twice", "sensor": "temperature", "above": 1},
+            {"name": "twice", "sensor": "humidity", "above": 1},
+        ],
+    ],
+)
+def test_invalid_rules(hass: HomeAssistant, rules: list[dict[str, Any]]) -> None:
+    """Unknown sensor types, missing thresholds and duplicate names fail."""
+    with pytest.raises(vol.Invalid):
+        APRSWSAlertEngine(hass, "entry", rules)
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_binary_sensor(hass: HomeAssistant) -> None:
+    """A rule's binary sensor lists the stations in alert."""
+    entry = _entry(
+        [{"name": "Warm", "sensor": "temperature", "above": 12, "binary_sensor": True}]
+    )
+    await setup_entry(hass, entry)
+    (entity_id,) = hass.states.async_entity_ids("binary_sensor")
+    assert hass.states.get(entity_id).state == "off"
+
+    await feed_lines(hass, entry, weather_line(0, temperature=56))
+    state = hass.states.get(entity_id)
+    assert state.state == "on"
+    assert state.attributes["stations"] == [STATION]
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_invalid_saved_rules_skip_alerts(hass: HomeAssistant) -> None:
+    """Rules saved before validation was stricter do not break the setup."""
+    entry = _entry([{"name": "x", "sensor": "bogus", "above": 1}])
+    await setup_entry(hass, entry)
+
+    assert entry.runtime_data.alerts is None
+
+
+def test_cost_per_packet(
+    hass: HomeAssistant, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark evaluating a weather packet against many rules."""
+    sensors = ["temperature", "humidity", "atmospheric_pressure", "wind_gust"]
+    engine = APRSWSAlertEngine(
+        hass,
+        "entry",
+        [
+            {
+                "name": f"rule {index}",
+                "sensor": sensors[index % len(sensors)],
+                "above": 1e6,
+                "callsign": [f"M{index % 100:04d}" if index % 2 else f"G{index}*"],
+            }
+            for index in range(RULES)
+        ],
+    )
+    packets = [
+        [
+            _reading(sensor, 10.0, index, callsign=f"M{index % 100:04d}")
+            for sensor in sensors
+        ]
+        for index in range(PACKETS)
+    ]
+
+    started = time.perf_counter()
+    for packet in packets:
+        engine.evaluate(packet)
+    per_packet = (time.perf_counter() - started) / PACKETS
+
+    record_property("seconds_per_packet", per_packet)
+    assert per_packet < PACKET_BUDGET
+    assert engine.events_fired == 0
@@ -0,0 +1,173 @@
+"""Tests for backfilling long-term statistics from packet logs."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.components.recorder.statistics import statistics_during_period
+from homeassistant.util import dt as dt_util
+
+from custom_components.aprs_weather_station import backfill as backfill_module
+from custom_components.aprs_weather_station.backfill import (
+    HOUR,
+    REORDER_WINDOW_HOURS,
+    APRSWSBackfill,
+    _split_received_at,
+)
+from custom_components.aprs_weather_station.const import DOMAIN
+from custom_components.aprs_weather_station.data import APRSWSSensorData
+
+from .common import STATION, WEATHER_LINE, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+    from pytest_homeassistant_custom_component.typing import (
+        RecorderInstanceContextManager,
+    )
+
+# 2025-01-01 00:00 UTC
+START = 1_735_689_600
+TEMPERATURE = "sensor.g4zmg_temperature"
+
+
+@pytest.fixture
+def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Prepare the recorder database before hass starts."""
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        (b"1735689600 G4ZMG>APRS:x", (1_735_689_600, b"G4ZMG>APRS:x")),
+        (b"G4ZMG>APRS:x", (None, b"G4ZMG>APRS:x")),
+        (b"G4ZMG>APRS:x y", (None, b"G4ZMG>APRS:x y")),
+        (b"17356x G4ZMG>APRS:x", (None, b"17356x G4ZMG>APRS:x")),
+        (b"1735689600", (None, b"1735689600")),
+    ],
+)
+def test_split_received_at(line: bytes, expected: tuple[int | None, bytes]) -> None:
+    """Only a leading run of digits followed by a space is a receive time."""
+    assert _split_received_at(line) == expected
+
+
+def _reading(timestamp: int, value: float) -> APRSWSSensorData:
+    return APRSWSSensorData(
+        timestamp=timestamp, callsign=STATION, type="temperature", value=value
+    )
+
+
+def test_hourly_reorder_window(hass: HomeAssistant) -> None:
+    """Late lines within the window join their hour, older hours are closed."""
+    backfill = APRSWSBackfill(hass, {})
+    readings = [
+        _reading(START, 10),
+        _reading(START + HOUR, 20),
+        # Late, but its hour is still open
+        _reading(START + 10, 14),
+        _reading(START + (REORDER_WINDOW_HOURS + 1) * HOUR, 30),
+        _reading(START + (REORDER_WINDOW_HOURS + 1) * HOUR + 60, 32),
+    ]
+
+    buckets = [
+        (hour * HOUR - START, bucket.count, bucket.minimum, bucket.maximum)
+        for _, bucket, hour in backfill._hourly(iter(readings))
+    ]
+    assert buckets == [
+        (0, 2, 10, 14),
+        (HOUR, 1, 20, 20),
+        ((REORDER_WINDOW_HOURS + 1) * HOUR, 2, 30, 32),
+    ]
+    (_, first, hour), *_ = backfill._hourly(iter(readings))
+    assert first.to_statistic(hour)["mean"] == 12
+
+
+def test_circular_mean(hass: HomeAssistant) -> None:
+    """Wind direction is averaged around the compass."""
+    backfill = APRSWSBackfill(hass, {})
+    readings = [
+        APRSWSSensorData(
+            timestamp=START, callsign=STATION, type="wind_direction", value=value
+        )
+        for value in (350, 10)
+    ]
+
+    ((_, bucket, hour),) = backfill._hourly(iter(readings))
+    mean = bucket.to_statistic(hour)["mean"]
+    assert min(mean, 360 - mean) == pytest.approx(0, abs=1e-6)
+
+
+def _log_line(timestamp: int, temperature: int) -> bytes:
+    return (
+        f"{timestamp} {STATION}>APRS,TCPIP*,qAC,T2SYDNEY:"
+        f"!5205.65N/00219.62W_202/008g013t{temperature:03d}h98b10038\n"
+    ).encode()
+
+
+@pytest.mark.usefixtures("recorder_mock", "no_listener")
+async def test_import_in_batches(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Hourly rows reach the recorder in batches, untimed lines are counted."""
+    monkeypatch.setattr(backfill_module, "IMPORT_BATCH_SIZE", 2)
+    flushes: list[int] = []
+    flush = APRSWSBackfill._flush
+
+    def _counting_flush(self: APRSWSBackfill, key: str) -> None:
+        flushes.append(len(self._batches[key][1]))
+        flush(self, key)
+
+    monkeypatch.setattr(APRSWSBackfill, "_flush", _counting_flush)
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, WEATHER_LINE)
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    log = tmp_path / "packets.log"
+    log.write_bytes(
+        b"".join(_log_line(START + index * HOUR, 50 + index) for index in range(5))
+        # No receive time, and no time in the packet either
+        + WEATHER_LINE.replace(b"@100100z", b"!")
+        + b"\n# server comment\nnot a packet\n"
+    )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "import_statistics",
+        {"config_entry_id": config_entry.entry_id, "path": str(log)},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert not [record for record in caplog.records if record.levelno >= logging.ERROR]
+    assert response["lines"] == 8
+    assert response["packets"] == 5
+    assert response["untimed"] == 1
+    assert response["parse_failures"] == 1
+    assert TEMPERATURE in response["statistic_ids"]
+    assert response["rows"] == 5 * len(response["statistic_ids"])
+    assert flushes.count(2) == 2 * len(response["statistic_ids"])
+
+    # The service returned once the recorder committed every batch
+    statistics = await hass.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        dt_util.utc_from_timestamp(START),
+        None,
+        {TEMPERATURE},
+        "hour",
+        None,
+        {"mean"},
+    )
+    means = [row["mean"] for row in statistics[TEMPERATURE]]
+    assert means == pytest.approx(
+        [(50 + index - 32) * 5 / 9 for index in range(5)], abs=0.01
+    )
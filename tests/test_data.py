@@ -0,0 +1,106 @@
+"""Tests for the compact per-station records."""
+
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import aprslib
+
+from custom_components.aprs_weather_station.aprs_parser import APRSPacketParser
+from custom_components.aprs_weather_station.data import (
+    APRSWSSensorData,
+    APRSWSStationState,
+)
+from custom_components.aprs_weather_station.meteorology import derive
+from custom_components.aprs_weather_station.quality import APRSWSQualityControl
+from custom_components.aprs_weather_station.rain import accumulate_rain
+
+from .common import STATION, WEATHER_LINE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+STATIONS = 500
+# Measured at about 6 KiB and 4 KiB, with headroom for other Python versions
+STATION_BUDGET = 8 * 1024  # bytes
+PACKET_BUDGET = 8 * 1024  # bytes
+
+
+def test_sensor_data_is_slotted_with_built_key() -> None:
+    """Records carry no instance dict and build their key once."""
+    data = APRSWSSensorData(timestamp=1, callsign=STATION, type="humidity", value=98)
+
+    assert not hasattr(data, "__dict__")
+    assert data.key == "G4ZMG_humidity"
+    assert APRSWSSensorData.from_other_with_new_value(data, 97).key == data.key
+
+
+def test_callsigns_are_interned() -> None:
+    """Every record of a station shares one callsign string."""
+    parser = APRSPacketParser()
+    packets = [aprslib.parse(WEATHER_LINE) for _ in range(2)]
+    # As read off the socket, each packet has its own copy of the callsign
+    packets[1]["from"] = "".join(STATION)
+    callsigns = [data.callsign for packet in packets for data in parser.parse(packet)]
+
+    assert all(callsign is callsigns[0] for callsign in callsigns)
+
+
+def _station_line(index: int) -> str:
+    return WEATHER_LINE.decode().replace(STATION, f"M{index:04d}", 1)
+
+
+def _measure(action: Callable[[], object]) -> tuple[int, int]:
+    """Return bytes kept by what `action` returns and the peak while running it."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = action()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert kept is not None
+    return current - before, peak - before
+
+
+def test_memory_per_station_and_packet(
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Benchmark the state kept per station and the allocations per packet."""
+    parser = APRSPacketParser()
+    quality_control = APRSWSQualityControl()
+    packets = [aprslib.parse(_station_line(index)) for index in range(STATIONS)]
+    received_at = int(time.time())
+
+    def _process(
+        packet: dict, state: APRSWSStationState
+    ) -> dict[str, APRSWSSensorData]:
+        data = quality_control.filter(parser.parse(packet, received_at), state)
+        data.extend(derive(data, state))
+        data.extend(accumulate_rain(data, state))
+        return {sensor_data.key: sensor_data for sensor_data in data}
+
+    def _track_stations() -> list[object]:
+        # The state and the latest readings, as the coordinator keeps them
+        tracked: list[object] = []
+        for packet in packets:
+            state = APRSWSStationState()
+            tracked.append((state, _process(packet, state)))
+        return tracked
+
+    kept, _ = _measure(_track_stations)
+    per_station = kept // STATIONS
+
+    state = APRSWSStationState()
+    _process(packets[0], state)
+    _, per_packet = _measure(lambda: _process(packets[0], state))
+
+    record_property("bytes_per_station", per_station)
+    record_property("peak_bytes_per_packet", per_packet)
+    assert per_station < STATION_BUDGET
+    assert per_packet < PACKET_BUDGET
@@ -0,0 +1,109 @@
+"""Tests for the packet decoders."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import aprslib
+import pytest
+
+from custom_components.aprs_weather_station.aprs_parser import APRSPacketParser
+from custom_components.aprs_weather_station.decoders import APRSWSDecoderRegistry
+from custom_components.aprs_weather_station.telemetry_decoder import (
+    parse_telemetry_report,
+)
+
+from .common import STATION, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+DEFINITIONS = [
+    f"{STATION}>APRS::{STATION}    :PARM.Battery,Solar,Temp".encode(),
+    f"{STATION}>APRS::{STATION}    :UNIT.V,W,deg.C".encode(),
+    f"{STATION}>APRS::{STATION}    :EQNS.0,0.1,0,0,2,0,0.01,0,-40".encode(),
+]
+REPORT = f"{STATION}>APRS,TCPIP*:T#005,131,045,020,073,123,01101001".encode()
+POSITIONLESS_WEATHER = (
+    f"{STATION}>APRS:_10090556c220s004g005t077r000p000P000h50b09900wRSW".encode()
+)
+
+
+def _parse(line: bytes) -> dict[str, Any]:
+    """Parse a line the way the packet sources do."""
+    return parse_telemetry_report(line) or aprslib.parse(line)
+
+
+def _values(parser: APRSPacketParser, line: bytes) -> dict[str, Any]:
+    return {
+        data.type: (data.value, data.name, data.unit)
+        for data in parser.parse(_parse(line), received_at=1000)
+        if data.type not in {"timestamp", "packet_received"}
+    }
+
+
+def test_registry_loads_decoders_on_first_use() -> None:
+    """Only the decoders of formats seen so far exist, one of each."""
+    registry = APRSWSDecoderRegistry()
+    assert registry.get(None) == ()
+    assert registry.get("unknown") == ()
+    assert registry._decoders == {}
+
+    (weather,) = registry.get("wx")
+    assert list(registry._decoders) == ["weather"]
+    assert registry.get("wx")[0] is weather
+    assert weather in registry.get("uncompressed")
+    assert list(registry._decoders) == ["weather", "position", "telemetry"]
+
+
+def test_parse_telemetry_report() -> None:
+    """A T# report aprslib rejects becomes a telemetry packet."""
+    packet = parse_telemetry_report(REPORT)
+    assert packet is not None
+    assert packet["from"] == STATION
+    assert packet["format"] == "telemetry"
+    assert packet["telemetry"] == {
+        "seq": "005",
+        "vals": [131.0, 45.0, 20.0, 73.0, 123.0],
+        "bits": "01101001",
+    }
+    assert parse_telemetry_report(f"{STATION}>APRS:>status".encode()) is None
+
+
+def test_telemetry_scaled_by_cached_definitions() -> None:
+    """Reports are raw before definitions arrive, scaled and named after."""
+    parser = APRSPacketParser()
+    assert _values(parser, REPORT)["telemetry_1"] == (131.0, None, None)
+
+    for line in DEFINITIONS:
+        assert _values(parser, line) == {}
+    values = _values(parser, REPORT)
+
+    assert values["telemetry_1"] == (13.1, "Battery", "V")
+    assert values["telemetry_2"] == (90.0, "Solar", "W")
+    assert values["telemetry_3"] == (-36.0, "Temp", "deg.C")
+    assert values["telemetry_5"] == (123.0, None, None)
+
+
+def test_positionless_weather() -> None:
+    """A weather report without a position gives weather but no location."""
+    values = _values(APRSPacketParser(), POSITIONLESS_WEATHER)
+
+    assert "location" not in values
+    assert values["humidity"][0] == 50
+    assert values["wind_direction"][0] == 220
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_telemetry_sensors(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Telemetry channels become sensors named and scaled by the station."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, *DEFINITIONS, REPORT)
+
+    state = hass.states.get("sensor.g4zmg_battery")
+    assert state is not None
+    assert state.state == "13.1"
+    assert state.attributes["unit_of_measurement"] == "V"
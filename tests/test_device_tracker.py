@@ -0,0 +1,99 @@
+"""Tests for the station location tracker."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import (
+    CONF_MIN_MOVEMENT_DISTANCE,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+)
+
+from .common import STATION, budlist_subentry, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+ENTITY_ID = "device_tracker.g4zmg_location"
+
+
+def _position_line(minute: int, latitude: str, longitude: str = "00219.62") -> bytes:
+    """Return a weather report of STATION at 01:`minute` UTC from a position."""
+    return (
+        f"{STATION}>APRS,TCPIP*,qAC,T2SYDNEY:@1001{minute:02d}z"
+        f"{latitude}N/{longitude}W_202/008g013t054h98b10038"
+    ).encode()
+
+
+def _entry(min_movement_distance: float | None = None) -> MockConfigEntry:
+    options = {}
+    if min_movement_distance is not None:
+        options[CONF_MIN_MOVEMENT_DISTANCE] = min_movement_distance
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        options=options,
+        subentries_data=[budlist_subentry(STATION)],
+    )
+
+
+def _last_written(hass: HomeAssistant) -> datetime:
+    """Return when the tracker state was last written, changed or not."""
+    return hass.states.get(ENTITY_ID).last_reported
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_position_as_numbers(hass: HomeAssistant) -> None:
+    """Coordinates come through as numbers, an ambiguous one with its radius."""
+    entry = _entry()
+    await setup_entry(hass, entry)
+    await feed_lines(hass, entry, _position_line(0, "5205.65"))
+    state = hass.states.get(ENTITY_ID)
+    assert state.attributes["latitude"] == pytest.approx(52.094167)
+    assert state.attributes["longitude"] == pytest.approx(-2.327)
+    assert state.attributes["position_ambiguity"] == 0
+
+    await feed_lines(hass, entry, _position_line(1, "5205.  ", "00219.  "))
+    state = hass.states.get(ENTITY_ID)
+    assert state.attributes["position_ambiguity"] == 2
+    assert state.attributes["gps_accuracy"] > 1000
+
+
+@pytest.mark.parametrize(
+    ("min_movement_distance", "written"), [(None, True), (500, False)]
+)
+@pytest.mark.usefixtures("no_listener")
+async def test_writes_gated_on_movement(
+    hass: HomeAssistant,
+    min_movement_distance: float | None,
+    *,
+    written: bool,
+) -> None:
+    """Reports within the minimum movement distance write no state."""
+    entry = _entry(min_movement_distance)
+    await setup_entry(hass, entry)
+    await feed_lines(hass, entry, _position_line(0, "5205.65"))
+    first_written = _last_written(hass)
+
+    # The same position, then about 18 m north
+    await feed_lines(
+        hass,
+        entry,
+        _position_line(1, "5205.65"),
+        _position_line(2, "5205.66"),
+    )
+    assert _last_written(hass) == first_written
+
+    # About 185 m north of the written position
+    await feed_lines(hass, entry, _position_line(3, "5205.75"))
+    assert (_last_written(hass) != first_written) is written
+    # Skipped reports still extend the track
+    assert len(entry.runtime_data.tracks[STATION]) == 2
@@ -0,0 +1,183 @@
+"""Tests for the line protocol exporter, against a local HTTP server."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.aprs_weather_station import exporter as exporter_module
+from custom_components.aprs_weather_station.data import APRSWSSensorData
+from custom_components.aprs_weather_station.exporter import (
+    BATCH_SIZE,
+    SPILL_SUFFIX,
+    APRSWSExporter,
+    encode_line,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+
+class _Database:
+    """Records the lines written to it, answering with `status`."""
+
+    def __init__(self) -> None:
+        self.status = 204
+        self.requests: list[list[bytes]] = []
+        self.headers: list[dict[str, str]] = []
+
+    async def write(self, request: web.Request) -> web.Response:
+        if self.status != 204:
+            return web.Response(status=self.status, text="unavailable")
+        # aiohttp already inflated the gzip body
+        self.requests.append((await request.read()).split(b"\n"))
+        self.headers.append(dict(request.headers))
+        return web.Response(status=204)
+
+    @property
+    def lines(self) -> list[bytes]:
+        return [line for request in self.requests for line in request]
+
+
+@pytest.fixture
+async def database(socket_enabled: None) -> AsyncGenerator[tuple[_Database, str]]:  # noqa: ARG001
+    """Run a stand-in database, return it with its write URL."""
+    database = _Database()
+    app = web.Application()
+    app.router.add_post("/write", database.write)
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    yield database, str(server.make_url("/write"))
+    await server.close()
+
+
+def _packet(timestamp: int, temperature: float) -> list[APRSWSSensorData]:
+    return [
+        APRSWSSensorData(
+            timestamp=timestamp, callsign="G4ZMG", type="temperature", value=temperature
+        ),
+        APRSWSSensorData(
+            timestamp=timestamp, callsign="G4ZMG", type="humidity", value=98
+        ),
+    ]
+
+
+def test_encode_line() -> None:
+    """Numeric values become float fields of one line, tags are escaped."""
+    line = encode_line(
+        [
+            *_packet(1_700_000_000, 12.5),
+            APRSWSSensorData(
+                timestamp=1_700_000_000, callsign="G4ZMG", type="comment", value="hi"
+            ),
+            APRSWSSensorData(
+                timestamp=1_700_000_000,
+                callsign="G4ZMG",
+                type="packet_received",
+                value=1,
+            ),
+        ]
+    )
+    assert line == (
+        b"aprs_weather_station,callsign=G4ZMG temperature=12.5,humidity=98.0 "
+        b"1700000000000000000"
+    )
+    assert (
+        encode_line(
+            [APRSWSSensorData(timestamp=1, callsign="A B", type="comment", value="x")]
+        )
+        is None
+    )
+    assert b"callsign=A\\ B " in encode_line(
+        [APRSWSSensorData(timestamp=1, callsign="A B", type="humidity", value=1)]
+    )
+
+
+async def test_batches(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    database: tuple[_Database, str],
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Queued packets are posted gzipped in batches of at most BATCH_SIZE."""
+    server, url = database
+    exporter = APRSWSExporter(hass, url, "secret", str(tmp_path))
+    await exporter.async_start()
+    count = 2 * BATCH_SIZE + 10
+
+    started = time.monotonic()
+    for index in range(count):
+        exporter.append(_packet(1_700_000_000 + index, index / 10))
+    await exporter.async_stop()
+    elapsed = time.monotonic() - started
+
+    assert [len(request) for request in server.requests] == [
+        BATCH_SIZE,
+        BATCH_SIZE,
+        10,
+    ]
+    assert server.lines[-1].endswith(f" {1_700_000_000 + count - 1}000000000".encode())
+    assert server.headers[0]["Content-Encoding"] == "gzip"
+    assert server.headers[0]["Authorization"] == "Token secret"
+    assert exporter.points_sent == count
+    assert not list(tmp_path.iterdir())
+    record_property("points_per_second", round(count / elapsed))
+
+
+async def test_spill_while_down(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    database: tuple[_Database, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Batches go to disk while the database is down, and are sent in order later."""
+    server, url = database
+    server.status = 503
+    monkeypatch.setattr(exporter_module, "MAX_BUFFER_BYTES", 0)
+    exporter = APRSWSExporter(hass, url, None, str(tmp_path))
+    await exporter.async_start()
+
+    for index in range(3):
+        exporter.append(_packet(1_700_000_000 + index, index))
+        await exporter._async_flush()
+    assert exporter.as_dict()["available"] is False
+    await exporter.async_stop()
+    assert len(list(tmp_path.glob(f"*{SPILL_SUFFIX}"))) == 3
+    assert server.requests == []
+
+    # After a restart, with the database back
+    server.status = 204
+    exporter = APRSWSExporter(hass, url, None, str(tmp_path))
+    await exporter.async_start()
+    exporter.append(_packet(1_700_000_003, 3))
+    await exporter.async_stop()
+
+    assert [line.split()[-1] for line in server.lines] == [
+        f"{1_700_000_000 + index}000000000".encode() for index in range(4)
+    ]
+    assert exporter.points_sent == 4
+    assert not list(tmp_path.glob(f"*{SPILL_SUFFIX}"))
+
+
+async def test_rejected_batch_dropped(
+    hass: HomeAssistant, tmp_path: Path, database: tuple[_Database, str]
+) -> None:
+    """A batch the database refuses is not retried."""
+    server, url = database
+    server.status = 400
+    exporter = APRSWSExporter(hass, url, None, str(tmp_path))
+    await exporter.async_start()
+    exporter.append(_packet(1_700_000_000, 1))
+    await exporter._async_flush()
+
+    server.status = 204
+    await exporter.async_stop()
+    assert exporter.points_dropped == 1
+    assert server.requests == []
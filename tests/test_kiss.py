@@ -0,0 +1,175 @@
+"""Tests for the KISS TNC packet source, against a stand-in TNC."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import (
+    CONF_KISS_HOST,
+    CONF_KISS_PORT,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+    METRIC_LINES_RECEIVED,
+    METRIC_PACKETS_FILTERED,
+    METRIC_PACKETS_PARSED,
+    METRIC_RECONNECTS,
+)
+from custom_components.aprs_weather_station.kiss_listener import (
+    FEND,
+    FESC,
+    APRSWSKissListener,
+    ax25_to_tnc2,
+    kiss_unescape,
+)
+
+from .common import STATION, budlist_subentry, setup_entry
+from .kiss_server import ax25_frame, kiss_escape, kiss_frame
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.aprs_weather_station.metrics import APRSWSMetrics
+
+    from .aprs_is_server import StandInAPRSISServer
+    from .kiss_server import StandInKissTNC
+
+WAIT_TIMEOUT = 10  # seconds
+INFORMATION = b"!5205.65N/00219.62W_202/008g013t054h98b10038"
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def test_kiss_unescape() -> None:
+    """Escaped FEND and FESC bytes are restored, other bytes are untouched."""
+    assert kiss_unescape(b"a\xdb\xdcb\xdb\xddc\xdc\xdd") == b"a\xc0b\xdbc\xdc\xdd"
+    data = bytes(range(256)) + FESC + FEND + FESC + FESC
+    escaped = kiss_escape(data)
+    assert FEND not in escaped
+    assert kiss_unescape(escaped) == data
+
+
+@pytest.mark.parametrize(
+    ("digipeaters", "path"),
+    [
+        ([], b""),
+        ([("WIDE1-1", False), ("WIDE2-1", False)], b",WIDE1-1,WIDE2-1"),
+        # Only the last digipeater that repeated the frame is marked
+        (
+            [("M0ABC-10", True), ("WIDE1", True), ("WIDE2-1", False)],
+            b",M0ABC-10,WIDE1*,WIDE2-1",
+        ),
+        ([("WIDE2", True)], b",WIDE2*"),
+    ],
+)
+def test_ax25_to_tnc2(digipeaters: list[tuple[str, bool]], path: bytes) -> None:
+    """Addresses become a TNC2 header with the repeated digipeater marked."""
+    frame = ax25_frame(STATION + "-13", "APRS", INFORMATION + b"\r", digipeaters)
+    assert ax25_to_tnc2(frame) == b"G4ZMG-13>APRS" + path + b":" + INFORMATION
+
+
+def test_ax25_to_tnc2_rejects() -> None:
+    """Truncated frames, frames that are not UI and endless paths are dropped."""
+    frame = ax25_frame(STATION, "APRS", INFORMATION)
+    assert ax25_to_tnc2(frame[:10]) is None
+    # An I frame, not UI
+    assert ax25_to_tnc2(frame[:14] + b"\x00\xf0" + INFORMATION) is None
+    too_long = ax25_frame(STATION, "APRS", INFORMATION, [("WIDE1-1", False)] * 9)
+    assert ax25_to_tnc2(too_long) is None
+
+
+@pytest.fixture
+def kiss_listener(
+    kiss_tnc: StandInKissTNC,
+) -> Generator[tuple[APRSWSKissListener, list[dict[str, Any]]]]:
+    """Run a listener following STATION on the stand-in TNC."""
+    packets: list[dict[str, Any]] = []
+    listener = APRSWSKissListener(
+        "127.0.0.1", kiss_tnc.port, f"b/{STATION}", packets.append
+    )
+    listener.start()
+    yield listener, packets
+    listener.stop()
+    listener.join()
+
+
+async def test_frames_from_the_tnc(
+    kiss_tnc: StandInKissTNC,
+    kiss_listener: tuple[APRSWSKissListener, list[dict[str, Any]]],
+) -> None:
+    """Data frames of followed stations are parsed, split reads are joined."""
+    listener, packets = kiss_listener
+    await _wait_for(lambda: kiss_tnc.connections == 1)
+    wanted = kiss_frame(ax25_frame(STATION, "APRS", INFORMATION, [("WIDE2", True)]))
+    kiss_tnc.send(
+        [
+            # A command to the TNC, not a frame heard on air
+            kiss_frame(b"\x32", kiss_type=0x01),
+            kiss_frame(ax25_frame("M0XYZ", "APRS", INFORMATION)),
+            wanted[:20],
+            wanted[20:],
+        ]
+    )
+
+    await _wait_for(lambda: len(packets) == 1)
+    assert packets[0]["from"] == STATION
+    assert packets[0]["path"] == ["WIDE2*"]
+    assert packets[0]["weather"]["humidity"] == 98
+    assert listener.is_connected()
+
+
+async def test_reconnect(
+    kiss_tnc: StandInKissTNC,
+    kiss_listener: tuple[APRSWSKissListener, list[dict[str, Any]]],
+) -> None:
+    """A dropped connection is opened again and frames keep coming."""
+    listener, packets = kiss_listener
+    await _wait_for(lambda: kiss_tnc.connections == 1)
+    kiss_tnc.drop_clients()
+
+    await _wait_for(lambda: kiss_tnc.connections == 2)
+    kiss_tnc.send([kiss_frame(ax25_frame(STATION, "APRS", INFORMATION))])
+    await _wait_for(lambda: len(packets) == 1)
+    assert listener._metrics.get(METRIC_RECONNECTS) == 1
+
+
+async def test_same_packet_from_both_sources(
+    hass: HomeAssistant,
+    aprs_is_server: StandInAPRSISServer,
+    kiss_tnc: StandInKissTNC,
+) -> None:
+    """A packet heard on RF and through APRS-IS is handled once."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        options={CONF_KISS_HOST: "127.0.0.1", CONF_KISS_PORT: kiss_tnc.port},
+        subentries_data=[budlist_subentry(STATION)],
+    )
+    await setup_entry(hass, entry)
+    metrics: APRSWSMetrics = entry.runtime_data.metrics
+    await _wait_for(lambda: kiss_tnc.connections == 1)
+
+    aprs_is_server.send([f"{STATION}>APRS,TCPIP*,qAC,T2SYDNEY:".encode() + INFORMATION])
+    kiss_tnc.send(
+        [kiss_frame(ax25_frame(STATION, "APRS", INFORMATION, [("WIDE1-1", True)]))]
+    )
+    await _wait_for(lambda: metrics.get(METRIC_LINES_RECEIVED) == 2)
+    await hass.async_block_till_done()
+
+    assert metrics.get(METRIC_PACKETS_PARSED) == 1
+    assert metrics.get(METRIC_PACKETS_FILTERED) == 1
+    assert hass.states.get("sensor.g4zmg_humidity").state == "98"
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,93 @@
+"""Tests for station metadata."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.aprs_weather_station.const import DOMAIN
+from custom_components.aprs_weather_station.data import APRSWSStationMetadata
+from custom_components.aprs_weather_station.metadata import (
+    metadata_attributes,
+    update_metadata,
+)
+
+from .common import STATION, WEATHER_LINE, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def test_update_merges_fields() -> None:
+    """Fields a packet lacks keep their value, unchanged packets return None."""
+    metadata = update_metadata(
+        {"comment": "Hello", "symbol": "_", "to": "APRS", "path": ["WIDE1-1"]},
+        APRSWSStationMetadata(),
+    )
+    assert metadata == APRSWSStationMetadata(
+        comment="Hello", symbol="_", to="APRS", path=("WIDE1-1",)
+    )
+    assert update_metadata({"symbol": "_", "path": ["WIDE1-1"]}, metadata) is None
+
+    changed = update_metadata({"to": "APZ123", "weather": {}}, metadata)
+    assert changed == APRSWSStationMetadata(
+        comment="Hello", symbol="_", to="APZ123", path=("WIDE1-1",)
+    )
+
+
+def test_attributes_skip_unknown() -> None:
+    """Only known metadata becomes attributes, the path as a list."""
+    metadata = APRSWSStationMetadata(comment="Hello", path=("WIDE2*",))
+    assert metadata_attributes(metadata) == {"comment": "Hello", "path": ["WIDE2*"]}
+    assert metadata_attributes(APRSWSStationMetadata()) == {}
+
+
+def _with_destination(destination: str, comment: str = "L000.WFL") -> bytes:
+    return WEATHER_LINE.replace(b">APRS,", f">{destination},".encode()).replace(
+        b"L000.WFL", comment.encode()
+    )
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_device_updated_only_on_change(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The device's software version is written only when the station's changes."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, _with_destination("APRS"))
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, STATION)})
+    assert device is not None
+    assert device.sw_version == "APRS"
+    updates: list[dict[str, Any]] = []
+    update_device = device_registry.async_update_device
+
+    def _update_device(device_id: str, **changes: Any) -> dr.DeviceEntry | None:
+        updates.append(changes)
+        return update_device(device_id, **changes)
+
+    monkeypatch.setattr(device_registry, "async_update_device", _update_device)
+
+    # Same software, a different comment changes no device field
+    await feed_lines(
+        hass,
+        config_entry,
+        _with_destination("APRS"),
+        _with_destination("APRS", "Sunny"),
+    )
+    assert updates == []
+    metadata = config_entry.runtime_data.coordinator.station_metadata[STATION]
+    assert metadata.comment == "Sunny"
+
+    await feed_lines(
+        hass, config_entry, _with_destination("APZ123"), _with_destination("APZ123")
+    )
+    assert updates == [{"sw_version": "APZ123"}]
+    device = device_registry.async_get_device(identifiers={(DOMAIN, STATION)})
+    assert device is not None
+    assert device.sw_version == "APZ123"
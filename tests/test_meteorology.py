@@ -0,0 +1,196 @@
+"""Tests for the derived meteorology sensors."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station import coordinator
+from custom_components.aprs_weather_station.const import CONF_YOUR_CALLSIGN, DOMAIN
+from custom_components.aprs_weather_station.data import (
+    APRSWSSensorData,
+    APRSWSStationState,
+)
+from custom_components.aprs_weather_station.meteorology import (
+    absolute_humidity,
+    apparent_temperature,
+    derive,
+    dew_point,
+    heat_index,
+    wind_chill,
+)
+
+from .common import WEATHER_LINE, budlist_subentry, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+PACKETS = 600
+
+# The derived sensors as template sensors reading the station's own sensors,
+# wind speed is shown in km/h
+_TEMPLATE_INPUTS = """
+{%- set t = states('sensor.{0}_temperature') | float -%}
+{%- set rh = states('sensor.{0}_humidity') | float -%}
+{%- set v = states('sensor.{0}_wind_speed') | float / 3.6 -%}
+{%- set e_v = 6.112 * e ** (17.62 * t / (243.12 + t)) * rh / 100 -%}
+"""
+TEMPLATES = {
+    "dew_point": """
+{%- set g = log(max(rh, 1) / 100) + 17.62 * t / (243.12 + t) -%}
+{{ (243.12 * g / (17.62 - g)) | round(1) }}""",
+    "heat_index": """
+{%- set f = t * 9 / 5 + 32 -%}
+{%- if t < 26.7 -%}{{ t | round(1) }}{%- else -%}
+{{ ((-42.379 + 2.04901523 * f + 10.14333127 * rh - 0.22475541 * f * rh
+  - 6.83783e-3 * f * f - 5.481717e-2 * rh * rh + 1.22874e-3 * f * f * rh
+  + 8.5282e-4 * f * rh * rh - 1.99e-6 * f * f * rh * rh) - 32) * 5 / 9
+  | round(1) }}{%- endif -%}""",
+    "wind_chill": """
+{%- if t > 10 or v * 3.6 < 4.8 -%}{{ t | round(1) }}{%- else -%}
+{%- set k = (v * 3.6) ** 0.16 -%}
+{{ (13.12 + 0.6215 * t - 11.37 * k + 0.3965 * t * k) | round(1) }}{%- endif -%}""",
+    "apparent_temperature": """
+{{ (t + 0.33 * e_v - 0.70 * v - 4.00) | round(1) }}""",
+    "absolute_humidity": """
+{{ (e_v * 100 / (461.5 * (t + 273.15)) * 1000) | round(2) }}""",
+}
+
+
+def _packet(**values: float) -> list[APRSWSSensorData]:
+    return [
+        APRSWSSensorData(timestamp=1, callsign="G4ZMG", type=name, value=value)
+        for name, value in values.items()
+    ]
+
+
+def test_reference_values() -> None:
+    """Formulas agree with published tables."""
+    assert dew_point(20, 50) == pytest.approx(9.3, abs=0.05)
+    # NWS heat index table: 90 °F at 70 % is 106 °F
+    assert heat_index(32.22, 70) * 9 / 5 + 32 == pytest.approx(106, abs=1)
+    # Environment Canada wind chill table: -10 °C at 30 km/h is -20
+    assert wind_chill(-10, 30 / 3.6) == pytest.approx(-19.5, abs=0.1)
+    assert apparent_temperature(25, 60, 2) == pytest.approx(25.9, abs=0.1)
+    assert absolute_humidity(20, 50) == pytest.approx(8.6, abs=0.05)
+
+
+def test_indexes_fall_back_to_air_temperature() -> None:
+    """Heat index and wind chill outside their range are the air temperature."""
+    assert heat_index(20, 90) == 20
+    assert wind_chill(15, 10) == 15
+    assert wind_chill(-5, 1 / 3.6) == -5
+
+
+def test_derive_from_packet() -> None:
+    """A packet with the inputs gets every derived type it allows."""
+    state = APRSWSStationState()
+    derived = {
+        data.type: data.value
+        for data in derive(_packet(temperature=20, humidity=50), state)
+    }
+    assert derived == {
+        "dew_point": 9.3,
+        "heat_index": 20,
+        "absolute_humidity": 8.62,
+    }
+
+
+def test_derive_only_on_changed_inputs() -> None:
+    """A derived value is only sent again once one of its inputs changed."""
+    state = APRSWSStationState()
+    packet = _packet(temperature=5, humidity=80, wind_speed=5)
+    assert len(derive(packet, state)) == 5
+    assert derive(packet, state) == []
+
+    changed = derive(_packet(temperature=5, humidity=80, wind_speed=6), state)
+    assert {data.type for data in changed} == {"wind_chill", "apparent_temperature"}
+
+
+def test_derive_needs_temperature() -> None:
+    """Without temperature nothing is derived."""
+    assert derive(_packet(humidity=80, wind_speed=5), APRSWSStationState()) == []
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_derived_sensors_created(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A weather packet creates the derived sensors of its station."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, WEATHER_LINE)
+
+    assert hass.states.get("sensor.g4zmg_dew_point").state == "11.9"
+    assert hass.states.get("sensor.g4zmg_absolute_humidity").state == "10.57"
+
+
+def _packet_line(callsign: str, index: int) -> bytes:
+    """Return a report a minute after the previous one, temperature alternating."""
+    hour, minute = divmod(index, 60)
+    return (
+        f"{callsign}>APRS,TCPIP*,qAC,T2SYDNEY:@10{hour:02d}{minute:02d}z"
+        f"5205.65N/00219.62W_202/008g013t{54 + index % 2:03d}r001p021P001h98b10038"
+    ).encode()
+
+
+async def _seconds_per_packet(hass: HomeAssistant, callsign: str) -> float:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id=f"n0call_{callsign}",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        subentries_data=[budlist_subentry(callsign)],
+    )
+    await setup_entry(hass, entry)
+    await feed_lines(hass, entry, _packet_line(callsign, 0))
+
+    started = time.perf_counter()
+    await feed_lines(
+        hass, entry, *(_packet_line(callsign, index) for index in range(1, PACKETS))
+    )
+    elapsed = time.perf_counter() - started
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    return elapsed / (PACKETS - 1)
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_cost_against_template_sensors(
+    hass: HomeAssistant,
+    monkeypatch: pytest.MonkeyPatch,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Benchmark derived sensors against template sensors computing the same."""
+    derived = await _seconds_per_packet(hass, "G4ZMG")
+    assert hass.states.get("sensor.g4zmg_dew_point") is not None
+
+    monkeypatch.setattr(coordinator, "derive", lambda *_: [])
+    inputs = _TEMPLATE_INPUTS.replace("{0}", "g8pzt")
+    assert await async_setup_component(
+        hass,
+        "template",
+        {
+            "template": [
+                {
+                    "sensor": [
+                        {"name": f"g8pzt {name}", "state": inputs + template}
+                        for name, template in TEMPLATES.items()
+                    ]
+                }
+            ]
+        },
+    )
+    templated = await _seconds_per_packet(hass, "G8PZT")
+    assert (
+        hass.states.get("sensor.g8pzt_dew_point").state
+        == hass.states.get("sensor.g4zmg_dew_point").state
+    )
+
+    record_property("derived_seconds_per_packet", derived)
+    record_property("template_seconds_per_packet", templated)
+    assert derived < templated
@@ -0,0 +1,66 @@
+"""Tests for the runtime metrics."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.aprs_weather_station.const import (
+    METRIC_LINES_RECEIVED,
+    METRIC_LOOP_HANDOFFS,
+    METRIC_PACKETS_PARSED,
+    METRIC_PARSE_FAILURES,
+)
+from custom_components.aprs_weather_station.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.aprs_weather_station.metrics import APRSWSMetrics
+
+from .common import WEATHER_LINE, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def test_counters_and_parse_time() -> None:
+    """Counters add up and the parse time is averaged over parsed packets."""
+    metrics = APRSWSMetrics()
+    assert metrics.as_dict()["average_parse_time_us"] is None
+
+    metrics.increment(METRIC_LINES_RECEIVED, 3)
+    metrics.increment(METRIC_PACKETS_PARSED, 2)
+    metrics.add_parse_time(5000)
+
+    snapshot = metrics.as_dict()
+    assert snapshot["counters"][METRIC_LINES_RECEIVED] == 3
+    assert snapshot["counters"][METRIC_PACKETS_PARSED] == 2
+    assert snapshot["average_parse_time_us"] == 2.5
+    assert metrics.update_rate() > 0
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_counters_in_sensors_and_diagnostics(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Lines handed to the integration are counted where users can see them."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, WEATHER_LINE, b"garbage")
+    # Sensors skip a refresh stamped the same second as the previous one
+    freezer.tick(1)
+    await config_entry.runtime_data.coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.aprs_is_lines_received").state == "2"
+    assert hass.states.get("sensor.aprs_is_parse_failures").state == "1"
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    counters = diagnostics["metrics"]["counters"]
+    assert counters[METRIC_LINES_RECEIVED] == 2
+    assert counters[METRIC_PACKETS_PARSED] == 1
+    assert counters[METRIC_PARSE_FAILURES] == 1
+    assert counters[METRIC_LOOP_HANDOFFS] == 1
+    assert diagnostics["metrics"]["average_parse_time_us"] is not None
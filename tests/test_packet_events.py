@@ -0,0 +1,163 @@
+"""Tests for packet events of user subscriptions."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import voluptuous as vol
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.aprs_weather_station.const import (
+    CONF_PACKET_EVENTS,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+)
+from custom_components.aprs_weather_station.packet_events import (
+    EVENT_PACKET,
+    SUBSCRIPTION_SCHEMA,
+    APRSWSPacketEvents,
+    APRSWSPacketSubscription,
+)
+
+from .common import STATION, WEATHER_LINE, budlist_subentry, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+PACKET: dict[str, Any] = {
+    "from": STATION,
+    "format": "uncompressed",
+    "symbol": "_",
+    "weather": {"temperature": 12.2, "humidity": 98},
+}
+
+
+def _subscription(**config: Any) -> APRSWSPacketSubscription:
+    return APRSWSPacketSubscription(SUBSCRIPTION_SCHEMA({"name": "test", **config}))
+
+
+@pytest.mark.parametrize(
+    ("config", "matches"),
+    [
+        ({}, True),
+        ({"callsign": "g4*"}, True),
+        ({"callsign": ["M0*", "G4ZMG"]}, True),
+        ({"callsign": "G4ZMG-?"}, False),
+        ({"format": "uncompressed"}, True),
+        ({"format": ["compressed", "mic-e"]}, False),
+        ({"fields": {"symbol": "_"}}, True),
+        ({"fields": {"weather.humidity": "9?"}}, True),
+        ({"fields": {"weather.temperature": "1*", "symbol": "_"}}, True),
+        ({"fields": {"weather.temperature": "2*"}}, False),
+        # Missing fields and fields below plain values never match
+        ({"fields": {"weather.rain_1h": "*"}}, False),
+        ({"fields": {"symbol.table": "*"}}, False),
+    ],
+)
+def test_matches(config: dict[str, Any], *, matches: bool) -> None:
+    """Callsign globs, formats and dotted field globs must all match."""
+    assert _subscription(**config).matches(PACKET) is matches
+
+
+def test_take_caps_the_rate() -> None:
+    """A burst of a minute's events is allowed, then the bucket refills."""
+    subscription = _subscription(rate=2)
+    start = time.monotonic()
+
+    assert [subscription.take(start) for _ in range(3)] == [True, True, False]
+    # One token back after 30 seconds at 2 per minute
+    assert subscription.take(start + 29) is False
+    assert subscription.take(start + 30) is True
+    assert subscription.take(start + 30) is False
+    # Refills no further than the burst
+    assert [subscription.take(start + 600) for _ in range(3)] == [True, True, False]
+    assert (subscription.fired, subscription.dropped) == (5, 4)
+
+
+def test_slow_rate_allows_one() -> None:
+    """Rates under one per minute still allow a single event."""
+    subscription = _subscription(rate=0.5)
+    start = time.monotonic()
+
+    assert [subscription.take(start) for _ in range(2)] == [True, False]
+    assert subscription.take(start + 119) is False
+    assert subscription.take(start + 120) is True
+
+
+def test_invalid_subscriptions(hass: HomeAssistant) -> None:
+    """Subscriptions without a name or with a bad rate fail."""
+    with pytest.raises(vol.Invalid):
+        APRSWSPacketEvents(hass, "entry", [{"callsign": "G4*"}])
+    with pytest.raises(vol.Invalid):
+        APRSWSPacketEvents(hass, "entry", [{"name": "x", "rate": 0}])
+
+
+async def test_event_payload(hass: HomeAssistant) -> None:
+    """Each matching subscription fires with the packet, entry and name."""
+    events = async_capture_events(hass, EVENT_PACKET)
+    packet_events = APRSWSPacketEvents(
+        hass,
+        "entry",
+        [
+            {"name": "wx", "fields": {"weather.humidity": "*"}},
+            {"name": "mine", "callsign": "G4*"},
+            {"name": "other", "callsign": "M0*"},
+        ],
+    )
+
+    await hass.async_add_executor_job(packet_events.process, PACKET)
+    await hass.async_block_till_done()
+
+    assert [event.data for event in events] == [
+        {**PACKET, "entry_id": "entry", "subscription": "wx"},
+        {**PACKET, "entry_id": "entry", "subscription": "mine"},
+    ]
+    assert packet_events.as_dict() == {
+        "wx": {"fired": 1, "dropped": 0},
+        "mine": {"fired": 1, "dropped": 0},
+        "other": {"fired": 0, "dropped": 0},
+    }
+
+
+def _entry(subscriptions: list[dict[str, Any]]) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        options={CONF_PACKET_EVENTS: subscriptions},
+        subentries_data=[budlist_subentry(STATION)],
+    )
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_events_from_the_feed(hass: HomeAssistant) -> None:
+    """Packets handed to the coordinator fire the subscribed events."""
+    entry = _entry([{"name": "wx", "callsign": STATION}])
+    await setup_entry(hass, entry)
+    events = async_capture_events(hass, EVENT_PACKET)
+
+    await feed_lines(hass, entry, WEATHER_LINE)
+
+    (event,) = events
+    assert event.data["subscription"] == "wx"
+    assert event.data["entry_id"] == entry.entry_id
+    assert event.data["raw"] == WEATHER_LINE.decode()
+    assert event.data["weather"]["humidity"] == 98
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_invalid_saved_subscriptions_skip_events(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Subscriptions saved invalid do not break the setup."""
+    entry = _entry([{"callsign": "G4*"}])
+    await setup_entry(hass, entry)
+
+    assert entry.runtime_data.packet_events is None
+    assert "continuing without packet events" in caplog.text
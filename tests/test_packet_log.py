@@ -0,0 +1,134 @@
+"""Tests for the ring buffer of recent raw packets."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+
+from custom_components.aprs_weather_station.const import CONF_CALLSIGN, DOMAIN
+from custom_components.aprs_weather_station.data import (
+    APRSWSLocation,
+    APRSWSSensorData,
+)
+from custom_components.aprs_weather_station.packet_log import (
+    STATUS_DECODED,
+    STATUS_FAILED,
+    STATUS_FILTERED,
+    APRSWSPacketLog,
+)
+from custom_components.aprs_weather_station.services import SERVICE_DUMP_PACKETS
+
+from .common import STATION, WEATHER_LINE, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def _line(callsign: str, index: int = 0) -> bytes:
+    return f"{callsign}>APRS,TCPIP*:>status {index}".encode()
+
+
+def _raw(log: APRSWSPacketLog) -> dict[str, list[str]]:
+    return {
+        station: [entry["raw"] for entry in entries]
+        for station, entries in log.as_dict().items()
+    }
+
+
+def test_ring_keeps_the_newest() -> None:
+    """Each station keeps its last lines, oldest first."""
+    log = APRSWSPacketLog(packets_per_station=3)
+    for index in range(5):
+        log.record(_line(STATION, index), STATUS_FILTERED)
+
+    assert _raw(log) == {STATION: [_line(STATION, i).decode() for i in (2, 3, 4)]}
+
+
+def test_least_recently_heard_station_dropped() -> None:
+    """At the station limit the station heard longest ago goes."""
+    log = APRSWSPacketLog(max_stations=2)
+    log.record(_line("G4ZMG"), STATUS_FILTERED)
+    log.record(_line("G8PZT"), STATUS_FILTERED)
+    # Heard again, G8PZT is now the least recently heard
+    log.record(_line("G4ZMG", 1), STATUS_FILTERED)
+    log.record(_line("M0XYZ"), STATUS_FILTERED)
+
+    assert list(_raw(log)) == ["G4ZMG", "M0XYZ"]
+    assert len(_raw(log)["G4ZMG"]) == 2
+
+
+def test_lines_without_source_are_kept() -> None:
+    """Unparseable lines are filed under an unknown station."""
+    log = APRSWSPacketLog()
+    log.record(b"garbage", STATUS_FAILED)
+
+    (entry,) = log.as_dict()["?"]
+    assert entry["status"] == "failed"
+    assert entry["result"] is None
+
+
+def test_result_round_trip() -> None:
+    """Values of every kind come back formatted from the packed entry."""
+    log = APRSWSPacketLog()
+    values: list[tuple[str, object]] = [
+        ("temperature", 12.5),
+        ("humidity", 98),
+        ("comment", "Hello ☀"),
+        ("humidity_ok", True),
+        ("pressure", None),
+        ("location", APRSWSLocation(52.0, -2.5, 0, 10.0)),
+        ("timestamp", datetime(2026, 1, 2, 3, 4, tzinfo=UTC)),
+        ("counter", 1 << 70),
+    ]
+    result = [
+        APRSWSSensorData(timestamp=0, callsign=STATION, type=name, value=value)  # type: ignore[arg-type]
+        for name, value in values
+    ]
+    log.record(_line(STATION), STATUS_DECODED, result)
+    log.record(_line(STATION, 1), STATUS_DECODED, result[:1])
+
+    first, second = log.as_dict(STATION)[STATION]
+    assert first["status"] == "decoded"
+    assert first["result"] == (
+        "temperature=12.5;humidity=98;comment=Hello ☀;humidity_ok=True;"
+        "pressure=None;location=52.0,-2.5;timestamp=2026-01-02 03:04:00+00:00;"
+        f"counter={1 << 70}"
+    )
+    assert second["result"] == "temperature=12.5"
+    assert log.memory_usage() < 2 * len(_line(STATION)) + 400
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_dump_packets(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
+    """The service returns the entries of one station or of all of them."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, WEATHER_LINE, b"garbage")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DUMP_PACKETS,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, CONF_CALLSIGN: STATION.lower()},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    (entry,) = response[STATION]
+    assert list(response) == [STATION]
+    assert entry["raw"] == WEATHER_LINE.decode()
+    assert entry["status"] == "decoded"
+    assert "humidity=98" in entry["result"]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_DUMP_PACKETS,
+        {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    assert set(response) == {STATION, "?"}
+    assert response["?"][0]["status"] == "failed"
@@ -0,0 +1,110 @@
+"""Tests for the profile service."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import ATTR_CONFIG_ENTRY_ID
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.aprs_weather_station.const import DOMAIN
+from custom_components.aprs_weather_station.profiler import (
+    OTHER_STACK,
+    THREAD_EVENT_LOOP,
+    APRSWSProfiler,
+)
+from custom_components.aprs_weather_station.services import (
+    ATTR_SECONDS,
+    SERVICE_PROFILE,
+)
+
+from .common import setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+WAIT_TIMEOUT = 10  # seconds
+
+
+def _spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_samples_threads() -> None:
+    """Stacks of each thread are counted, foreign loop stacks are folded."""
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=_spin, args=(stop,), name=name)
+        for name in ("listener", THREAD_EVENT_LOOP)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        profiler = APRSWSProfiler(
+            {thread.name: thread.ident for thread in threads} | {"gone": None},
+            interval=0.001,
+        )
+        profiler.run(0.1)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    spin = f"test_profiler:_spin:{_spin.__code__.co_firstlineno}"
+    stacks = dict(line.rsplit(" ", 1) for line in profiler.collapsed().splitlines())
+    listener = [stack for stack in stacks if stack.startswith("listener;")]
+    assert listener
+    assert all(stack.endswith(spin) for stack in listener)
+    assert list(stacks).count(f"{THREAD_EVENT_LOOP};{OTHER_STACK}") == 1
+    report = profiler.report()
+    assert "Thread listener:" in report
+    assert spin in report
+    assert "gone" not in report
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_profile_service(
+    hass: HomeAssistant, config_entry: MockConfigEntry, tmp_path: Path
+) -> None:
+    """The service samples for the given time and writes both files."""
+    await setup_entry(hass, config_entry)
+    hass.config.config_dir = str(tmp_path)
+    service_data = {ATTR_CONFIG_ENTRY_ID: config_entry.entry_id, ATTR_SECONDS: 1}
+
+    started = time.monotonic()
+    running = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            service_data,
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await asyncio.sleep(0.1)
+    # One profile at a time
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            service_data,
+            blocking=True,
+            return_response=True,
+        )
+    response = await running
+    # Sampling stops once the requested time is up
+    assert 1 <= time.monotonic() - started < 1 + WAIT_TIMEOUT
+
+    assert response is not None
+    report = Path(response["report"])
+    collapsed = Path(response["collapsed"])
+    assert report.parent == collapsed.parent == tmp_path
+    assert report.read_text(encoding="utf-8").startswith(f"Thread {THREAD_EVENT_LOOP}:")
+    assert collapsed.read_text(encoding="utf-8")
@@ -0,0 +1,127 @@
+"""Tests for quality control of station readings."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.aprs_weather_station.data import (
+    APRSWSSensorData,
+    APRSWSStationState,
+)
+from custom_components.aprs_weather_station.quality import (
+    MAX_REJECTED_IN_ROW,
+    MEDIAN_WINDOW,
+    REJECT_RANGE,
+    REJECT_RATE,
+    REJECT_SPIKE,
+    APRSWSQualityControl,
+)
+
+from .common import feed_lines, setup_entry, weather_line
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def _reading(sensor_type: str, value: object, timestamp: int = 0) -> APRSWSSensorData:
+    return APRSWSSensorData(
+        timestamp=timestamp,
+        callsign="G4ZMG",
+        type=sensor_type,
+        value=value,  # type: ignore[arg-type]
+    )
+
+
+def _passes(
+    quality_control: APRSWSQualityControl,
+    state: APRSWSStationState,
+    reading: APRSWSSensorData,
+) -> bool:
+    return quality_control.filter([reading], state) == [reading]
+
+
+def test_range() -> None:
+    """Physically impossible values are dropped and counted."""
+    quality_control = APRSWSQualityControl()
+    state = APRSWSStationState()
+
+    assert not _passes(quality_control, state, _reading("temperature", -90))
+    assert not _passes(quality_control, state, _reading("atmospheric_pressure", 0))
+    assert _passes(quality_control, state, _reading("temperature", 20))
+    assert quality_control.as_dict() == {
+        "readings_checked": 3,
+        "readings_rejected": 2,
+        "rejected": {
+            REJECT_RANGE: {"atmospheric_pressure": 1, "temperature": 1},
+        },
+    }
+
+
+def test_rate_of_change() -> None:
+    """A change is judged against the time since the last accepted reading."""
+    quality_control = APRSWSQualityControl()
+    state = APRSWSStationState()
+    assert _passes(quality_control, state, _reading("temperature", 10, 0))
+
+    # 3 °C per minute at most
+    assert not _passes(quality_control, state, _reading("temperature", 20, 60))
+    assert _passes(quality_control, state, _reading("temperature", 20, 600))
+    assert quality_control.as_dict()["rejected"] == {REJECT_RATE: {"temperature": 1}}
+
+
+def test_spike() -> None:
+    """A reading far from the recent median is dropped."""
+    quality_control = APRSWSQualityControl()
+    state = APRSWSStationState()
+    for timestamp in range(MEDIAN_WINDOW):
+        assert _passes(quality_control, state, _reading("wind_gust", 5, timestamp))
+
+    assert not _passes(quality_control, state, _reading("wind_gust", 60, 10))
+    assert _passes(quality_control, state, _reading("wind_gust", 30, 20))
+    assert quality_control.as_dict()["rejected"] == {REJECT_SPIKE: {"wind_gust": 1}}
+    assert len(state.readings["wind_gust"].recent) == MEDIAN_WINDOW
+
+
+def test_lasting_change_accepted() -> None:
+    """A jump repeated in every packet is a real change, not a glitch."""
+    quality_control = APRSWSQualityControl()
+    state = APRSWSStationState()
+    assert _passes(quality_control, state, _reading("temperature", 10, 0))
+
+    results = [
+        _passes(quality_control, state, _reading("temperature", 40, 60 * index))
+        for index in range(1, MAX_REJECTED_IN_ROW + 2)
+    ]
+    assert results == [False] * (MAX_REJECTED_IN_ROW - 1) + [True, True]
+    assert state.readings["temperature"].recent == [40, 40]
+
+
+@pytest.mark.parametrize("value", [True, "n/a", None])
+def test_unchecked_values_pass(value: object) -> None:
+    """Values that are not numbers are left to their sensors."""
+    quality_control = APRSWSQualityControl()
+    assert _passes(quality_control, APRSWSStationState(), _reading("humidity", value))
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_glitch_never_reaches_the_entity(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A rejected reading does not change its sensor, the rest of the packet does."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(hass, config_entry, weather_line(0))
+    temperature = hass.states.get("sensor.g4zmg_temperature").state
+
+    # 54 °F to 120 °F within a minute
+    await feed_lines(
+        hass, config_entry, weather_line(1, temperature=120, rain_since_midnight=5)
+    )
+
+    assert hass.states.get("sensor.g4zmg_temperature").state == temperature
+    assert hass.states.get("sensor.g4zmg_rain_since_midnight").state == "1.27"
+    assert config_entry.runtime_data.coordinator.quality_control.as_dict()[
+        "rejected"
+    ] == {REJECT_RATE: {"temperature": 1}}
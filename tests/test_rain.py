@@ -0,0 +1,126 @@
+"""Tests for the rain total."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.core import State
+from pytest_homeassistant_custom_component.common import (
+    mock_restore_cache_with_extra_data,
+)
+
+from custom_components.aprs_weather_station.data import (
+    APRSWSSensorData,
+    APRSWSStationState,
+)
+from custom_components.aprs_weather_station.rain import accumulate_rain
+
+from .common import feed_lines, setup_entry, weather_line
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+RAIN_TOTAL = "sensor.g4zmg_rain_total"
+
+
+def _totals(state: APRSWSStationState, *packets: dict[str, float]) -> list[object]:
+    totals = []
+    for values in packets:
+        result = accumulate_rain(
+            [
+                APRSWSSensorData(timestamp=1, callsign="G4ZMG", type=name, value=value)
+                for name, value in values.items()
+            ],
+            state,
+        )
+        totals.append(result[0].value if result else None)
+    return totals
+
+
+def test_since_midnight_increases_and_reset() -> None:
+    """Increases are added, a drop is the midnight reset and counts in full."""
+    assert _totals(
+        APRSWSStationState(),
+        {"rain_since_midnight": 2.0},
+        {"rain_since_midnight": 3.0},
+        {"rain_since_midnight": 3.0},
+        {"rain_since_midnight": 0.5},
+    ) == [None, 1.0, None, 1.5]
+
+
+def test_rain_24h_drops_are_ignored() -> None:
+    """Rain leaving the 24 hour window is not negative rain."""
+    assert _totals(
+        APRSWSStationState(),
+        {"rain_24h": 10.0},
+        {"rain_24h": 12.0},
+        {"rain_24h": 4.0},
+        {"rain_24h": 5.0},
+    ) == [None, 2.0, None, 3.0]
+
+
+def test_source_switch_keeps_counting() -> None:
+    """A packet carrying both sources carries the count across a switch."""
+    assert _totals(
+        APRSWSStationState(),
+        {"rain_since_midnight": 1.0},
+        {"rain_since_midnight": 2.0, "rain_24h": 10.0},
+        {"rain_24h": 11.0},
+        {"rain_since_midnight": 0.5, "rain_24h": 11.5},
+        {"rain_since_midnight": 1.5},
+    ) == [None, 1.0, 2.0, 2.5, 3.5]
+
+
+def test_other_readings_leave_the_baseline() -> None:
+    """Packets without rain do not reset the baseline."""
+    assert _totals(
+        APRSWSStationState(),
+        {"rain_since_midnight": 1.0},
+        {"temperature": 20.0},
+        {"rain_since_midnight": 2.0},
+    ) == [None, None, 1.0]
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_rain_total_sensor(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """The sensor shows the rain counted since the first report."""
+    await setup_entry(hass, config_entry)
+    await feed_lines(
+        hass,
+        config_entry,
+        weather_line(0, rain_since_midnight=1),
+        weather_line(5, rain_since_midnight=3),
+    )
+
+    assert hass.states.get(RAIN_TOTAL).state == "0.51"
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_rain_total_restored(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """After a restart the total continues from its last value."""
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(RAIN_TOTAL, "100.0"),
+                {"native_value": 100.0, "native_unit_of_measurement": "mm"},
+            )
+        ],
+    )
+    await setup_entry(hass, config_entry)
+    await feed_lines(
+        hass,
+        config_entry,
+        weather_line(0, rain_since_midnight=1),
+        weather_line(5, rain_since_midnight=3),
+    )
+    assert hass.states.get(RAIN_TOTAL).state == "100.51"
+
+    await feed_lines(hass, config_entry, weather_line(10, rain_since_midnight=4))
+    assert hass.states.get(RAIN_TOTAL).state == "100.76"
@@ -0,0 +1,283 @@
+"""Tests for the local APRS-IS relay."""
+
+from __future__ import annotations
+
+import selectors
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from custom_components.aprs_weather_station import relay as relay_module
+from custom_components.aprs_weather_station.relay import (
+    SERVER_BANNER,
+    APRSWSRelayServer,
+    compile_filter,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+CLIENTS = 50
+LINES = 20_000
+# Measured at about 1.7M lines per second over all clients
+THROUGHPUT_BUDGET = 50_000  # lines per second
+WAIT_TIMEOUT = 10  # seconds
+
+
+def _line(callsign: str, index: int = 0) -> bytes:
+    return (
+        f"{callsign}>APRS,TCPIP*,qAC,T2SYDNEY:!5205.65N/00219.62W_202/008g013"
+        f"t{index % 100:03d}h98b10038"
+    ).encode()
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize(
+    ("text", "matches", "rejects"),
+    [
+        ("b/G4ZMG/G8PZT", [b"G4ZMG", b"g8pzt"], [b"G4ZMG-1", b"M0XYZ"]),
+        ("b/G4*", [b"G4ZMG", b"G4ZMG-13"], [b"M0G4"]),
+        ("p/M0/2E", [b"M0XYZ", b"2E0ABC"], [b"G4ZMG"]),
+        ("b/G4ZMG p/M0 r/52/-2/50", [b"G4ZMG", b"M0XYZ"], [b"G8PZT"]),
+    ],
+)
+def test_compile_filter(text: str, matches: list[bytes], rejects: list[bytes]) -> None:
+    """Budlist and prefix filters match whole callsigns, others are ignored."""
+    pattern = compile_filter(text)
+    assert pattern is not None
+    assert all(pattern.fullmatch(callsign) for callsign in matches)
+    assert not any(pattern.fullmatch(callsign) for callsign in rejects)
+
+
+@pytest.mark.parametrize("text", ["", "r/52/-2/50", "b/"])
+def test_compile_filter_passes_all(text: str) -> None:
+    """Without a budlist or prefix filter every line passes."""
+    assert compile_filter(text) is None
+
+
+class _Client:
+    """Blocking APRS-IS client of the relay."""
+
+    def __init__(self, port: int, login_filter: str | None = None) -> None:
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        self.buffer = b""
+        self.banner = self.read_line()
+        login = b"user N0CALL pass 12345 vers test 1.0"
+        if login_filter:
+            login += b" filter " + login_filter.encode()
+        self.sock.sendall(login + b"\r\n")
+        self.logresp = self.read_line()
+
+    def _recv(self, size: int) -> bytes:
+        chunk = self.sock.recv(size)
+        if not chunk:
+            msg = "relay closed the connection"
+            raise ConnectionError(msg)
+        return chunk
+
+    def read_line(self) -> bytes:
+        while b"\r\n" not in self.buffer:
+            self.buffer += self._recv(65536)
+        line, self.buffer = self.buffer.split(b"\r\n", 1)
+        return line
+
+    def read_bytes(self, size: int) -> None:
+        """Read and discard `size` bytes."""
+        size -= len(self.buffer)
+        self.buffer = b""
+        while size > 0:
+            size -= len(self._recv(min(size, 1 << 20)))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+@pytest.fixture
+def relay(socket_enabled: None) -> Generator[APRSWSRelayServer]:  # noqa: ARG001
+    """Run a relay on a free port of localhost."""
+    relay = APRSWSRelayServer(0, "127.0.0.1")
+    relay.start()
+    yield relay
+    assert relay.stop_and_join()
+
+
+def _port(relay: APRSWSRelayServer) -> int:
+    assert relay._server is not None
+    return relay._server.getsockname()[1]
+
+
+def _logged_in(relay: APRSWSRelayServer, count: int) -> Callable[[], bool]:
+    return lambda: relay._logged_in == count
+
+
+def _clients(relay: APRSWSRelayServer) -> list[dict[str, Any]]:
+    return relay.as_dict()["clients"]
+
+
+def test_login(relay: APRSWSRelayServer) -> None:
+    """Any passcode logs in unverified, the relay is receive-only."""
+    client = _Client(_port(relay), "b/G4ZMG")
+    assert client.banner + b"\r\n" == SERVER_BANNER
+    assert client.logresp == b"# logresp N0CALL unverified, server RELAY"
+    _wait_for(_logged_in(relay, 1))
+    (info,) = _clients(relay)
+    assert info["logged_in"]
+    assert info["filter"] is not None
+
+    # Lines from clients are not relayed
+    client.sock.sendall(_line("N0CALL") + b"\r\n")
+    relay.publish(_line("G4ZMG"))
+    assert client.read_line() == _line("G4ZMG")
+    client.close()
+    _wait_for(_logged_in(relay, 0))
+
+
+def test_nothing_queued_before_login(relay: APRSWSRelayServer) -> None:
+    """Lines published while no client is logged in are not kept."""
+    relay.publish(_line("G4ZMG", 1))
+    client = _Client(_port(relay))
+    _wait_for(_logged_in(relay, 1))
+    relay.publish(_line("G4ZMG", 2))
+
+    assert client.read_line() == _line("G4ZMG", 2)
+    client.close()
+
+
+def test_filter_per_client(relay: APRSWSRelayServer) -> None:
+    """Each client gets the lines its own filter matches."""
+    budlist = _Client(_port(relay), "b/G4ZMG")
+    prefix = _Client(_port(relay))
+    prefix.sock.sendall(b"#filter p/M0\r\n")
+    everything = _Client(_port(relay))
+    _wait_for(_logged_in(relay, 3))
+    _wait_for(lambda: sum(c["filter"] is not None for c in _clients(relay)) == 2)
+
+    lines = [_line("G4ZMG"), _line("M0XYZ"), _line("G8PZT"), _line("G4ZMG", 1)]
+    for line in lines:
+        relay.publish(line)
+
+    assert [budlist.read_line() for _ in range(2)] == [lines[0], lines[3]]
+    assert prefix.read_line() == lines[1]
+    assert [everything.read_line() for _ in lines] == lines
+    for client in (budlist, prefix, everything):
+        client.close()
+
+
+def test_slow_client_dropped(
+    relay: APRSWSRelayServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A client that stops reading is disconnected, the others keep up."""
+    monkeypatch.setattr(relay_module, "MAX_PENDING_BYTES", 64 * 1024)
+    slow = _Client(_port(relay))
+    fast = _Client(_port(relay))
+    _wait_for(_logged_in(relay, 2))
+    line = _line("G4ZMG")
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while relay.as_dict()["dropped_slow_clients"] == 0:
+        assert time.monotonic() < deadline, "slow client never dropped"
+        for _ in range(1000):
+            relay.publish(line)
+        fast.read_bytes(1000 * (len(line) + 2))
+
+    (info,) = _clients(relay)
+    assert info["logged_in"]
+    slow.sock.settimeout(WAIT_TIMEOUT)
+    with pytest.raises(ConnectionError):
+        slow.read_bytes(1 << 40)
+    slow.close()
+    fast.close()
+
+
+class _RacingWaker:
+    """Waker socket that lets a publish race with draining it."""
+
+    def __init__(self, waker: socket.socket, relay: APRSWSRelayServer) -> None:
+        self._waker = waker
+        self._relay = relay
+        self.race: bytes | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._waker, name)
+
+    def recv(self, size: int) -> bytes:
+        race, self.race = self.race, None
+        if race is not None:
+            self._relay.publish(race)
+        return self._waker.recv(size)
+
+
+def test_publish_racing_drain(socket_enabled: None) -> None:  # noqa: ARG001
+    """A line published while the relay drains its waker is not delayed."""
+    relay = APRSWSRelayServer(0, "127.0.0.1")
+    waker = relay._waker = _RacingWaker(relay._waker, relay)  # type: ignore[assignment]
+    relay.start()
+    try:
+        client = _Client(_port(relay))
+        _wait_for(_logged_in(relay, 1))
+
+        waker.race = _line("G4ZMG", 1)
+        relay.publish(_line("G4ZMG", 0))
+        assert client.read_line() == _line("G4ZMG", 0)
+        assert client.read_line() == _line("G4ZMG", 1)
+
+        # Woken by its own byte, not found by the poll timeout
+        started = time.monotonic()
+        relay.publish(_line("G4ZMG", 2))
+        assert client.read_line() == _line("G4ZMG", 2)
+        assert time.monotonic() - started < relay.POLL_INTERVAL / 2
+        client.close()
+    finally:
+        assert relay.stop_and_join()
+
+
+def test_throughput(
+    relay: APRSWSRelayServer, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark relaying to many clients."""
+    clients = [_Client(_port(relay)) for _ in range(CLIENTS)]
+    _wait_for(_logged_in(relay, CLIENTS))
+    lines = [_line("G4ZMG", index) for index in range(LINES)]
+    expected = sum(len(line) + 2 for line in lines)
+    remaining = {client.sock: expected for client in clients}
+    selector = selectors.DefaultSelector()
+    for client in clients:
+        client.sock.setblocking(False)  # noqa: FBT003
+        selector.register(client.sock, selectors.EVENT_READ)
+
+    def _publish() -> None:
+        for line in lines:
+            relay.publish(line)
+
+    publisher = threading.Thread(target=_publish, name="relay publisher")
+    started = time.perf_counter()
+    publisher.start()
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while remaining:
+        assert time.monotonic() < deadline, "timed out"
+        for key, _ in selector.select(1):
+            sock = key.fileobj
+            remaining[sock] -= len(sock.recv(1 << 20))  # type: ignore[union-attr]
+            if not remaining[sock]:
+                del remaining[sock]
+                selector.unregister(sock)
+    elapsed = time.perf_counter() - started
+    publisher.join()
+    selector.close()
+
+    lines_per_second = round(LINES * CLIENTS / elapsed)
+    record_property("clients", CLIENTS)
+    record_property("lines_per_second", lines_per_second)
+    assert relay.as_dict()["dropped_slow_clients"] == 0
+    assert lines_per_second > THROUGHPUT_BUDGET
+    for client in clients:
+        client.close()
@@ -0,0 +1,101 @@
+"""Latency of reload and unload against a stalled APRS-IS server."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.aprs_weather_station.const import LISTENER_SHUTDOWN_TIMEOUT
+from custom_components.aprs_weather_station.packet_source import (
+    APRSWSPacketSource,
+)
+
+from .common import setup_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from .aprs_is_server import StandInAPRSISServer
+
+# Allowance for the executor and the event loop on a busy machine
+MARGIN = 1.0  # seconds
+WAIT_TIMEOUT = 10  # seconds
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+async def _timed(awaitable: Awaitable[object]) -> float:
+    started = time.monotonic()
+    await awaitable
+    return time.monotonic() - started
+
+
+@pytest.mark.usefixtures("aprs_is_server")
+async def test_unload_while_receiving(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """A logged in listener waiting for a silent server stops within a poll."""
+    await setup_entry(hass, config_entry)
+    client = config_entry.runtime_data.client
+    await _wait_for(lambda: bool(client.is_connected()))
+
+    elapsed = await _timed(hass.config_entries.async_unload(config_entry.entry_id))
+
+    record_property("unload_seconds", round(elapsed, 3))
+    assert elapsed < APRSWSPacketSource.POLL_INTERVAL + MARGIN
+    assert client.listener_thread_ids == {}
+
+
+async def test_reload_while_receiving(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aprs_is_server: StandInAPRSISServer,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Reloading replaces the listener without waiting for the server."""
+    await setup_entry(hass, config_entry)
+    await _wait_for(lambda: bool(config_entry.runtime_data.client.is_connected()))
+
+    elapsed = await _timed(hass.config_entries.async_reload(config_entry.entry_id))
+
+    record_property("reload_seconds", round(elapsed, 3))
+    assert elapsed < APRSWSPacketSource.POLL_INTERVAL + MARGIN
+    await _wait_for(lambda: aprs_is_server.connections == 2)
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+async def test_unload_bounded_while_connecting(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aprs_is_server: StandInAPRSISServer,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """A listener stuck waiting for the banner is abandoned at the deadline."""
+    aprs_is_server.stall = True
+    await setup_entry(hass, config_entry)
+    client = config_entry.runtime_data.client
+    await _wait_for(lambda: aprs_is_server.connections == 1)
+    sources = list(client._sources)
+
+    elapsed = await _timed(hass.config_entries.async_unload(config_entry.entry_id))
+
+    record_property("unload_seconds", round(elapsed, 3))
+    assert elapsed < LISTENER_SHUTDOWN_TIMEOUT + MARGIN
+    # Dropping the connection ends the abandoned connect attempt
+    aprs_is_server.drop_clients()
+    for source in sources:
+        await hass.async_add_executor_job(source.join, LISTENER_SHUTDOWN_TIMEOUT)
+        assert not source.is_alive()
@@ -0,0 +1,160 @@
+"""
+Soak test against a stand-in APRS-IS server.
+
+Streams packets through the real listener thread while reconnecting and
+adding and removing stations every round, with the clock advanced an hour
+per round so timers fire as they would over days. Memory, threads and file
+descriptors must stay within a budget once warmed up. The packet count
+defaults to a quick run, set APRSWS_SOAK_PACKETS and APRSWS_SOAK_ROUNDS
+for a long one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.config_entries import ConfigSubentry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.aprs_weather_station.const import (
+    CONF_CALLSIGN,
+    METRIC_LINES_RECEIVED,
+)
+
+from .common import STATION, setup_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from .aprs_is_server import StandInAPRSISServer
+
+PACKETS = int(os.environ.get("APRSWS_SOAK_PACKETS", "3000"))
+ROUNDS = int(os.environ.get("APRSWS_SOAK_ROUNDS", "10"))
+CHURN_STATIONS = ("M0AAA", "M0BBB", "M0CCC")
+MEMORY_BUDGET = 512 * 1024  # bytes
+FD_BUDGET = 2
+WAIT_TIMEOUT = 30  # seconds
+
+
+def _line(callsign: str, index: int) -> bytes:
+    """Return a weather report without timestamp, temperature drifting a bit."""
+    return (
+        f"{callsign}>APRS,TCPIP*,qAC,T2SYDNEY:!5205.65N/00219.62W_202/008g013"
+        f"t{53 + index % 3:03d}r001p021P{index % 50:03d}h98b10038"
+    ).encode()
+
+
+async def _wait_for(hass: HomeAssistant, condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+    await hass.async_block_till_done()
+
+
+def _open_fds() -> int:
+    return len(list(Path("/proc/self/fd").iterdir()))
+
+
+def _threads() -> Counter[str]:
+    """Count threads by name, without the executor workers started on demand."""
+    return Counter(
+        thread.name
+        for thread in threading.enumerate()
+        if not thread.name.startswith(("SyncWorker", "ImportExecutor"))
+    )
+
+
+@pytest.mark.skipif(not Path("/proc/self/fd").exists(), reason="needs procfs")
+async def test_soak(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aprs_is_server: StandInAPRSISServer,
+) -> None:
+    """Packets, reconnects and station churn leave nothing behind."""
+    await setup_entry(hass, config_entry)
+    metrics = config_entry.runtime_data.metrics
+    await _wait_for(hass, lambda: config_entry.runtime_data.client.is_connected())
+
+    now = dt_util.utcnow()
+    sent = 0
+
+    async def _round(number: int) -> None:
+        nonlocal now, sent
+        churn = CHURN_STATIONS[number % len(CHURN_STATIONS)]
+        subentry = ConfigSubentry(
+            data=MappingProxyType({CONF_CALLSIGN: churn}),
+            subentry_type="budlist",
+            title=churn,
+            unique_id=churn,
+        )
+        hass.config_entries.async_add_subentry(config_entry, subentry)
+        await _wait_for(hass, lambda: churn in aprs_is_server.filter)
+
+        count = PACKETS // ROUNDS
+        aprs_is_server.send(
+            _line(churn if index % 2 else STATION, index) for index in range(count)
+        )
+        sent += count
+        await _wait_for(hass, lambda: metrics.get(METRIC_LINES_RECEIVED) == sent)
+
+        hass.config_entries.async_remove_subentry(config_entry, subentry.subentry_id)
+        now += timedelta(hours=1)
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+
+        connections = aprs_is_server.connections
+        aprs_is_server.drop_clients()
+        await _wait_for(
+            hass,
+            lambda: aprs_is_server.connections > connections
+            and config_entry.runtime_data.client.is_connected(),
+        )
+
+    # Captured records would grow, every line warns about its repeated
+    # timestamp and every recreated entity is logged
+    logging.disable(logging.WARNING)
+    tracemalloc.start()
+    try:
+        # Caches, registries and buffers fill during the first rounds, removed
+        # entities are kept by the entity registry for when they come back
+        for number in range(len(CHURN_STATIONS)):
+            await _round(number)
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fds = _open_fds()
+        threads = _threads()
+
+        for number in range(len(CHURN_STATIONS), ROUNDS):
+            await _round(number)
+
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+        logging.disable(logging.NOTSET)
+
+    assert aprs_is_server.lines_filtered == 0
+    assert growth < MEMORY_BUDGET, f"grew by {growth} bytes"
+    assert _open_fds() <= fds + FD_BUDGET
+    assert _threads() == threads
+    assert hass.states.get(f"sensor.{CHURN_STATIONS[0].lower()}_temperature") is None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,184 @@
+"""Tests for the station staleness scheduler."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.aprs_weather_station import staleness
+from custom_components.aprs_weather_station.staleness import (
+    DEFAULT_BEACON_INTERVAL,
+    HEAP_COMPACT_RATIO,
+    APRSWSStalenessScheduler,
+    station_signal,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class _Handle:
+    def __init__(self, when: float, callback: Callable[[], None]) -> None:
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class _Loop:
+    """Event loop clock advanced by the test."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.handles: list[_Handle] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> _Handle:
+        handle = _Handle(when, callback)
+        self.handles.append(handle)
+        return handle
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        while due := [
+            h for h in self.handles if not h.cancelled and h.when <= self.now
+        ]:
+            for handle in due:
+                self.handles.remove(handle)
+                handle.callback()
+
+    @property
+    def pending(self) -> list[_Handle]:
+        return [handle for handle in self.handles if not handle.cancelled]
+
+
+@pytest.fixture
+def loop() -> _Loop:
+    """Return a manually advanced loop."""
+    return _Loop()
+
+
+@pytest.fixture
+def signals(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, bool]]:
+    """Collect availability signals."""
+    sent: list[tuple[str, bool]] = []
+    monkeypatch.setattr(
+        staleness,
+        "async_dispatcher_send",
+        lambda _hass, signal, available: sent.append((signal, available)),
+    )
+    return sent
+
+
+def _scheduler(loop: _Loop, missed_beacons: int = 2) -> APRSWSStalenessScheduler:
+    return APRSWSStalenessScheduler(
+        SimpleNamespace(loop=loop),  # type: ignore[arg-type]
+        "entry",
+        missed_beacons,
+    )
+
+
+def test_silent_station_expires_and_returns(
+    loop: _Loop, signals: list[tuple[str, bool]]
+) -> None:
+    """Without its own interval a station gets the default one."""
+    scheduler = _scheduler(loop)
+    scheduler.async_beacon("G4ZMG")
+
+    loop.advance(2 * DEFAULT_BEACON_INTERVAL - 1)
+    assert scheduler.is_available("G4ZMG")
+    loop.advance(1)
+    assert not scheduler.is_available("G4ZMG")
+    assert signals == [(station_signal("entry", "G4ZMG"), False)]
+
+    scheduler.async_beacon("G4ZMG")
+    assert scheduler.is_available("G4ZMG")
+    assert signals[-1] == (station_signal("entry", "G4ZMG"), True)
+
+
+def test_learned_interval(loop: _Loop, signals: list[tuple[str, bool]]) -> None:
+    """A station beaconing every two minutes expires after two missed ones."""
+    scheduler = _scheduler(loop)
+    for _ in range(10):
+        scheduler.async_beacon("G4ZMG")
+        loop.advance(120)
+    assert scheduler.is_available("G4ZMG")
+
+    loop.advance(2 * 120)
+    assert not scheduler.is_available("G4ZMG")
+    assert len(signals) == 1
+
+
+def test_duplicates_do_not_shorten_the_interval(
+    loop: _Loop, signals: list[tuple[str, bool]]
+) -> None:
+    """Copies of a packet relayed by several gateways are not beacons."""
+    scheduler = _scheduler(loop)
+    for _ in range(5):
+        scheduler.async_beacon("G4ZMG")
+        loop.advance(2)
+        scheduler.async_beacon("G4ZMG")
+        loop.advance(598)
+
+    # Last beacon 1199 seconds ago, due after two intervals of 600
+    loop.advance(599)
+    assert scheduler.is_available("G4ZMG")
+    loop.advance(1)
+    assert not scheduler.is_available("G4ZMG")
+    assert len(signals) == 1
+
+
+def test_single_timer_and_bounded_heap(
+    loop: _Loop, signals: list[tuple[str, bool]]
+) -> None:
+    """One timer serves all stations, superseded deadlines are compacted."""
+    scheduler = _scheduler(loop)
+    stations = ["G4ZMG", "G8PZT", "M0XYZ"]
+    for _ in range(5000):
+        for callsign in stations:
+            scheduler.async_beacon(callsign)
+        loop.advance(60)
+
+    assert len(scheduler._heap) <= HEAP_COMPACT_RATIO * len(stations)
+    assert len(loop.pending) == 1
+    assert signals == []
+
+
+def test_forgotten_station_never_expires(
+    loop: _Loop, signals: list[tuple[str, bool]]
+) -> None:
+    """A removed station sends no signal."""
+    scheduler = _scheduler(loop)
+    scheduler.async_beacon("G4ZMG")
+    scheduler.async_forget("G4ZMG")
+
+    loop.advance(10 * DEFAULT_BEACON_INTERVAL)
+    assert signals == []
+
+
+def test_disabled(loop: _Loop, signals: list[tuple[str, bool]]) -> None:
+    """No missed beacons setting means no tracking at all."""
+    scheduler = _scheduler(loop, missed_beacons=0)
+    scheduler.async_beacon("G4ZMG")
+
+    assert loop.pending == []
+    loop.advance(10 * DEFAULT_BEACON_INTERVAL)
+    assert scheduler.is_available("G4ZMG")
+    assert signals == []
+
+
+def test_stop_cancels_the_timer(loop: _Loop, signals: list[tuple[str, bool]]) -> None:
+    """Stopping leaves nothing scheduled."""
+    scheduler = _scheduler(loop)
+    scheduler.async_beacon("G4ZMG")
+    scheduler.async_stop()
+
+    assert loop.pending == []
+    loop.advance(10 * DEFAULT_BEACON_INTERVAL)
+    assert signals == []
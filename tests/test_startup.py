@@ -0,0 +1,118 @@
+"""Tests and benchmarks of the integration's startup."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import CONF_YOUR_CALLSIGN, DOMAIN
+
+from .common import STATION, WEATHER_LINE, budlist_subentry, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+PACKAGE = "custom_components.aprs_weather_station"
+ROOT = Path(__file__).parent.parent
+STATIONS = 200
+# Measured at about 10 ms, the package's own modules without Home Assistant
+OWN_IMPORT_BUDGET = 0.25  # seconds
+# Measured at about 1.2 s for all stations, generous for slow CI machines
+ENTITIES_READY_BUDGET = 20  # seconds
+
+
+def _import_in_subprocess(*flags: str) -> subprocess.CompletedProcess[str]:
+    """Import the package in a fresh interpreter, nothing preloaded."""
+    return subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            *flags,
+            "-c",
+            f"import sys, {PACKAGE}; print(*sys.modules, sep='\\n')",
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_import_defers_heavy_modules() -> None:
+    """Importing the package loads neither aprslib nor the sensor component."""
+    modules = set(_import_in_subprocess().stdout.splitlines())
+    assert PACKAGE in modules
+    assert (
+        not {
+            "aprslib",
+            f"{PACKAGE}.aprs_listener",
+            f"{PACKAGE}.packet_source",
+            "homeassistant.components.sensor",
+            "homeassistant.components.recorder",
+        }
+        & modules
+    )
+
+
+def test_import_time(record_property: Callable[[str, object], None]) -> None:
+    """Benchmark importing the package, in total and for its own modules."""
+    report = _import_in_subprocess("-X", "importtime").stderr
+    own = total = 0
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue
+        name = name.strip()
+        if name == PACKAGE or name.startswith(f"{PACKAGE}."):
+            own += int(self_us)
+        if name == PACKAGE:
+            total = int(cumulative_us)
+
+    record_property("import_seconds", total / 1e6)
+    record_property("own_import_seconds", own / 1e6)
+    assert 0 < own / 1e6 < OWN_IMPORT_BUDGET
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_entities_ready(
+    hass: HomeAssistant, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark setup until every station has its entities, many stations."""
+    callsigns = [f"M{index:04d}" for index in range(STATIONS)]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        subentries_data=[budlist_subentry(callsign) for callsign in callsigns],
+    )
+    lines = [
+        WEATHER_LINE.replace(STATION.encode(), callsign.encode(), 1)
+        for callsign in callsigns
+    ]
+
+    started = time.perf_counter()
+    await setup_entry(hass, entry)
+    setup_seconds = time.perf_counter() - started
+    await feed_lines(hass, entry, *lines)
+    ready_seconds = time.perf_counter() - started
+
+    temperatures = [
+        hass.states.get(f"sensor.{callsign.lower()}_temperature")
+        for callsign in callsigns
+    ]
+    assert all(state is not None for state in temperatures)
+    record_property("stations", STATIONS)
+    record_property("entities", len(hass.states.async_entity_ids()))
+    record_property("setup_seconds", round(setup_seconds, 4))
+    record_property("entities_ready_seconds", round(ready_seconds, 4))
+    assert ready_seconds < ENTITIES_READY_BUDGET
@@ -0,0 +1,152 @@
+"""Tests for applying subentry changes without a reload."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState, ConfigSubentry
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import (
+    CONF_CALLSIGN,
+    CONF_MISSED_BEACONS,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+)
+
+from .common import STATION, WEATHER_LINE, budlist_subentry, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .aprs_is_server import StandInAPRSISServer
+
+STATIONS = 50
+WAIT_TIMEOUT = 10  # seconds
+
+
+def _subentry(callsign: str) -> ConfigSubentry:
+    return ConfigSubentry(
+        data=MappingProxyType({CONF_CALLSIGN: callsign}),
+        subentry_type="budlist",
+        title=callsign,
+        unique_id=callsign,
+    )
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def _station_line(callsign: str) -> bytes:
+    return WEATHER_LINE.replace(STATION.encode(), callsign.encode(), 1)
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_add_and_remove_without_reload(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Stations come and go while the entry stays set up."""
+    await setup_entry(hass, config_entry)
+    runtime_data = config_entry.runtime_data
+    await feed_lines(hass, config_entry, WEATHER_LINE)
+    temperature = hass.states.get("sensor.g4zmg_temperature")
+
+    subentry = _subentry("G8PZT")
+    hass.config_entries.async_add_subentry(config_entry, subentry)
+    await hass.async_block_till_done()
+    assert config_entry.runtime_data is runtime_data
+    assert runtime_data.client.budlist == [STATION, "G8PZT"]
+
+    await feed_lines(hass, config_entry, _station_line("G8PZT"))
+    assert hass.states.get("sensor.g8pzt_temperature") is not None
+
+    hass.config_entries.async_remove_subentry(config_entry, subentry.subentry_id)
+    await hass.async_block_till_done()
+    assert config_entry.runtime_data is runtime_data
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert runtime_data.client.budlist == [STATION]
+    assert hass.states.get("sensor.g8pzt_temperature") is None
+    assert "G8PZT" not in runtime_data.coordinator.station_metadata
+    # The remaining station is untouched
+    assert hass.states.get("sensor.g4zmg_temperature") == temperature
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_options_change_reloads(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """Any other change still sets the entry up again."""
+    await setup_entry(hass, config_entry)
+    runtime_data = config_entry.runtime_data
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MISSED_BEACONS: 3}
+    )
+    await hass.async_block_till_done()
+
+    assert config_entry.runtime_data is not runtime_data
+    assert config_entry.state is ConfigEntryState.LOADED
+
+
+async def test_filter_changed_in_place(
+    hass: HomeAssistant,
+    config_entry: MockConfigEntry,
+    aprs_is_server: StandInAPRSISServer,
+) -> None:
+    """The running listener sends the new filter instead of reconnecting."""
+    await setup_entry(hass, config_entry)
+    await _wait_for(lambda: aprs_is_server.filter == f"b/{STATION}")
+
+    hass.config_entries.async_add_subentry(config_entry, _subentry("G8PZT"))
+    await hass.async_block_till_done()
+    await _wait_for(lambda: aprs_is_server.filter == f"b/{STATION}/G8PZT")
+
+    assert aprs_is_server.connections == 1
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_apply_faster_than_reload(
+    hass: HomeAssistant, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark adding a station against reloading, with many stations."""
+    callsigns = [f"M{index:04d}" for index in range(STATIONS)]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        subentries_data=[budlist_subentry(callsign) for callsign in callsigns],
+    )
+    await setup_entry(hass, entry)
+    await feed_lines(hass, entry, *map(_station_line, callsigns))
+    entities = len(
+        er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    )
+    assert entities > STATIONS
+
+    started = time.monotonic()
+    hass.config_entries.async_add_subentry(entry, _subentry("G8PZT"))
+    await hass.async_block_till_done()
+    apply_seconds = time.monotonic() - started
+
+    started = time.monotonic()
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    reload_seconds = time.monotonic() - started
+
+    record_property("entities", entities)
+    record_property("apply_seconds", round(apply_seconds, 4))
+    record_property("reload_seconds", round(reload_seconds, 4))
+    assert apply_seconds < reload_seconds
@@ -0,0 +1,223 @@
+"""Tests for the memory-mapped time-series store."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.components.recorder.history import state_changes_during_period
+from homeassistant.helpers.recorder import get_instance
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.aprs_weather_station.data import APRSWSSensorData
+from custom_components.aprs_weather_station.timeseries import (
+    CORRUPT_SUFFIX,
+    SEGMENT_CAPACITY,
+    SEGMENT_SUFFIX,
+    APRSWSTimeSeriesStore,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.typing import (
+        RecorderInstanceContextManager,
+    )
+
+DAY = 86400
+BENCHMARK_SAMPLES = SEGMENT_CAPACITY
+QUERY_ROUNDS = 5
+
+
+@pytest.fixture
+def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Prepare the recorder database before hass starts."""
+
+
+def _reading(timestamp: int, sensor_type: str, value: object) -> APRSWSSensorData:
+    return APRSWSSensorData(
+        timestamp=timestamp,
+        callsign="G4ZMG",
+        type=sensor_type,
+        value=value,  # type: ignore[arg-type]
+    )
+
+
+def test_round_trip_across_segments(tmp_path: Path) -> None:
+    """Samples come back in order after a restart, spanning several segments."""
+    start = int(time.time()) - DAY
+    count = SEGMENT_CAPACITY + 10
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=30)
+    for offset in range(count):
+        store.append([_reading(start + offset, "temperature", offset / 10)])
+    store.close()
+
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=30)
+    samples = store.query("G4ZMG", "temperature", start, start + count)
+    assert samples == [(start + offset, offset / 10) for offset in range(count)]
+    assert store.query("G4ZMG", "temperature", start + 100, start + 102) == [
+        (start + 100, 10.0),
+        (start + 101, 10.1),
+        (start + 102, 10.2),
+    ]
+    stats = store.stats()
+    assert stats["segments"] == 2
+    assert stats["samples"] == count
+    store.close()
+
+
+def test_only_numeric_values_in_order_are_kept(tmp_path: Path) -> None:
+    """Non-numeric values, excluded types and late samples are skipped."""
+    now = int(time.time())
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=30)
+    store.append(
+        [
+            _reading(now, "humidity", 80),
+            _reading(now, "comment", "hello"),
+            _reading(now, "packet_received", 3),
+            _reading(now, "humidity_ok", True),  # noqa: FBT003
+        ]
+    )
+    store.append([_reading(now - 60, "humidity", 70)])
+
+    assert store.query("G4ZMG", "humidity", now - DAY, now) == [(now, 80.0)]
+    assert {path.name for path in (tmp_path / "G4ZMG").iterdir()} == {"humidity"}
+    store.close()
+
+
+def test_query_clipped_to_retention(tmp_path: Path) -> None:
+    """Samples older than the retention are never returned."""
+    now = int(time.time())
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=1)
+    store.append([_reading(now - 2 * DAY, "temperature", 1.0)])
+    store.append([_reading(now - 60, "temperature", 2.0)])
+
+    assert store.query("G4ZMG", "temperature", 0, now) == [(now - 60, 2.0)]
+    store.close()
+
+
+def test_corrupt_segment_set_aside(tmp_path: Path) -> None:
+    """A truncated segment is renamed and the series continues in a new one."""
+    now = int(time.time())
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=30)
+    store.append([_reading(now - 60, "temperature", 1.0)])
+    store.close()
+    (segment,) = (tmp_path / "G4ZMG" / "temperature").iterdir()
+    segment.write_bytes(segment.read_bytes()[:100])
+
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=30)
+    store.append([_reading(now, "temperature", 2.0)])
+
+    assert store.query("G4ZMG", "temperature", now - DAY, now) == [(now, 2.0)]
+    assert segment.with_suffix(CORRUPT_SUFFIX).exists()
+    assert not segment.exists()
+    store.close()
+
+
+def test_prune_removes_expired_series(tmp_path: Path) -> None:
+    """Expired segments go, silent series lose their directories."""
+    now = int(time.time())
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=1)
+    store.append([_reading(now - 60, "temperature", 1.0)])
+    store.append(
+        [
+            APRSWSSensorData(
+                timestamp=now - 60, callsign="SILENT", type="humidity", value=50
+            )
+        ]
+    )
+
+    assert store.prune(now + 2 * DAY) == 2
+    assert not (tmp_path / "SILENT").exists()
+    assert not list(tmp_path.glob(f"*/*/*{SEGMENT_SUFFIX}"))
+
+    # The closed writer is replaced on the next sample
+    store.append([_reading(now + 2 * DAY, "temperature", 3.0)])
+    assert store.stats()["segments"] == 1
+    store.close()
+
+
+def test_prune_keeps_recent_segments(tmp_path: Path) -> None:
+    """Segments with samples within the retention are kept."""
+    now = int(time.time())
+    store = APRSWSTimeSeriesStore(str(tmp_path), retention_days=1)
+    store.append([_reading(now - 60, "temperature", 1.0)])
+
+    assert store.prune(now) == 0
+    assert store.query("G4ZMG", "temperature", now - DAY, now) == [(now - 60, 1.0)]
+    store.close()
+
+
+def _database_bytes(hass: HomeAssistant) -> int:
+    """Return the size of the recorder database with its log written back."""
+    path = get_instance(hass).db_url.removeprefix("sqlite:///")
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return Path(path).stat().st_size
+
+
+@pytest.mark.usefixtures("recorder_mock")
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_against_the_recorder(
+    hass: HomeAssistant,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Benchmark disk bytes per sample and a range query against state history."""
+    now = int(time.time())
+    start = now - BENCHMARK_SAMPLES
+    store = APRSWSTimeSeriesStore(str(tmp_path / "timeseries"), retention_days=30)
+    for offset in range(BENCHMARK_SAMPLES):
+        store.append([_reading(start + offset, "temperature", offset / 10)])
+    store_bytes = sum(
+        path.stat().st_blocks * 512
+        for path in (tmp_path / "timeseries").glob(f"*/*/*{SEGMENT_SUFFIX}")
+    )
+
+    await async_wait_recording_done(hass)
+    database_bytes = await hass.async_add_executor_job(_database_bytes, hass)
+    history_start = dt_util.utcnow()
+    for offset in range(BENCHMARK_SAMPLES):
+        hass.states.async_set("sensor.g4zmg_temperature", str(offset / 10))
+    await async_wait_recording_done(hass)
+    database_bytes = (
+        await hass.async_add_executor_job(_database_bytes, hass) - database_bytes
+    )
+
+    started = time.perf_counter()
+    for _ in range(QUERY_ROUNDS):
+        samples = await hass.async_add_executor_job(
+            store.query, "G4ZMG", "temperature", start, now
+        )
+    store_seconds = (time.perf_counter() - started) / QUERY_ROUNDS
+    started = time.perf_counter()
+    for _ in range(QUERY_ROUNDS):
+        history = await get_instance(hass).async_add_executor_job(
+            state_changes_during_period,
+            hass,
+            history_start,
+            None,
+            "sensor.g4zmg_temperature",
+            True,  # noqa: FBT003 no attributes
+        )
+    recorder_seconds = (time.perf_counter() - started) / QUERY_ROUNDS
+    store.close()
+
+    assert len(samples) == BENCHMARK_SAMPLES
+    assert len(history["sensor.g4zmg_temperature"]) == BENCHMARK_SAMPLES
+    record_property("store_bytes_per_sample", store_bytes / BENCHMARK_SAMPLES)
+    record_property("recorder_bytes_per_sample", database_bytes / BENCHMARK_SAMPLES)
+    record_property("store_query_seconds", round(store_seconds, 5))
+    record_property("recorder_query_seconds", round(recorder_seconds, 5))
+    assert store_bytes < database_bytes
+    assert store_seconds < recorder_seconds
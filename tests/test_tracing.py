@@ -0,0 +1,96 @@
+"""Tests for the per-stage latency tracer."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from custom_components.aprs_weather_station.tracing import (
+    STAGE_DECODE,
+    STAGE_DISPATCH,
+    STAGE_HANDOFF,
+    STAGE_PARSE,
+    STAGE_TOTAL,
+    APRSWSLatencyHistogram,
+    APRSWSLatencyTracer,
+)
+
+from .common import WEATHER_LINE, feed_lines, setup_entry
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+
+def test_samples_every_nth_line() -> None:
+    """Only one in `sample_rate` lines gets a trace."""
+    tracer = APRSWSLatencyTracer(sample_rate=4)
+    sampled = []
+    for _ in range(12):
+        tracer.begin()
+        sampled.append(tracer.take() is not None)
+    assert sampled == [False, False, False, True] * 3
+
+
+def test_take_claims_the_trace_once() -> None:
+    """A trace belongs to the packet of the line that started it."""
+    tracer = APRSWSLatencyTracer(sample_rate=1)
+    tracer.begin()
+    trace = tracer.take()
+    assert trace is not None
+    assert [stage for stage, _ in trace.stages] == [STAGE_DECODE]
+    assert tracer.take() is None
+
+
+def test_record_fills_stage_histograms() -> None:
+    """Every stage of a completed trace lands in its histogram, plus the total."""
+    tracer = APRSWSLatencyTracer(sample_rate=1)
+    tracer.begin()
+    trace = tracer.take()
+    assert trace is not None
+    for stage in (STAGE_PARSE, STAGE_HANDOFF, STAGE_DISPATCH):
+        trace.mark(stage)
+    tracer.record(trace)
+
+    stages = tracer.as_dict()["stages"]
+    for stage in (STAGE_DECODE, STAGE_PARSE, STAGE_HANDOFF, STAGE_DISPATCH):
+        assert stages[stage]["count"] == 1
+    assert stages[STAGE_TOTAL]["count"] == 1
+    assert trace.total == sum(elapsed for _, elapsed in trace.stages)
+
+
+def test_histogram_percentiles() -> None:
+    """Percentiles report the upper bound of the bucket holding them."""
+    histogram = APRSWSLatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    for _ in range(90):
+        histogram.add(15_000)  # 15 us
+    for _ in range(9):
+        histogram.add(800_000)  # 800 us
+    histogram.add(10_000_000_000)  # 10 s, past the last bound
+
+    summary = histogram.as_dict()
+    assert summary["count"] == 100
+    assert summary["p50_us"] == 20
+    assert summary["p95_us"] == 1_000
+    assert summary["p99_us"] == 1_000
+    assert summary["buckets"]["<=20"] == 90
+    assert summary["buckets"]["inf"] == 1
+    assert histogram.percentile(1.0) is None
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_packet_traced_to_state_write(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> None:
+    """A sampled packet is timed from the read line to the entity update."""
+    await setup_entry(hass, config_entry)
+    config_entry.runtime_data.tracer.sample_rate = 1
+
+    await feed_lines(hass, config_entry, WEATHER_LINE)
+
+    stages = config_entry.runtime_data.tracer.as_dict()["stages"]
+    for stage in (STAGE_DECODE, STAGE_PARSE, STAGE_HANDOFF, STAGE_DISPATCH):
+        assert stages[stage]["count"] == 1
+    assert stages[STAGE_TOTAL]["p99_us"] is not None
@@ -0,0 +1,121 @@
+"""Tests for the simplified track history."""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import TYPE_CHECKING
+
+from custom_components.aprs_weather_station.track import (
+    DEFAULT_TRACK_MAX_POINTS,
+    APRSWSTrack,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# About 111 m per 0.001 degree of latitude
+STEP = 0.001
+BENCHMARK_POINTS = 100_000
+# Measured at about 5 us per point, generous for slow CI machines
+POINT_BUDGET = 200e-6  # seconds
+
+
+def test_straight_leg_keeps_its_ends() -> None:
+    """Points along a straight line collapse into its first and last point."""
+    track = APRSWSTrack(tolerance=25)
+    for index in range(20):
+        track.append(52.0 + index * STEP, -2.0, index)
+
+    assert track.points == [(52.0, -2.0, 0), (52.0 + 19 * STEP, -2.0, 19)]
+
+
+def test_turn_keeps_the_corner() -> None:
+    """The last point before a turn is kept."""
+    track = APRSWSTrack(tolerance=25)
+    for index in range(5):
+        track.append(52.0 + index * STEP, -2.0, index)
+    for index in range(1, 5):
+        track.append(52.0 + 4 * STEP, -2.0 + index * STEP, 4 + index)
+
+    assert [timestamp for _, _, timestamp in track.points] == [0, 4, 8]
+
+
+def test_stationary_reports_are_ignored() -> None:
+    """Repeated reports within the tolerance add nothing."""
+    track = APRSWSTrack(tolerance=25)
+    track.append(52.0, -2.0, 0)
+    for index in range(1, 10):
+        track.append(52.0 + 0.00001 * index, -2.0, index)
+
+    assert len(track) == 1
+
+
+def test_max_points_drops_the_oldest() -> None:
+    """The kept points are capped, oldest first out."""
+    track = APRSWSTrack(tolerance=25, max_points=3)
+    # Zigzag, every point is a corner
+    for index in range(10):
+        track.append(52.0 + index * STEP, -2.0 + (index % 2) * STEP, index)
+
+    points = track.points
+    assert len(points) == 4
+    assert [timestamp for _, _, timestamp in points] == [6, 7, 8, 9]
+
+
+def test_encoded_polyline() -> None:
+    """The track encodes like the reference example of the polyline format."""
+    track = APRSWSTrack()
+    track.append(38.5, -120.2, 0)
+    track.append(40.7, -120.95, 1)
+    track.append(43.252, -126.453, 2)
+
+    assert track.encoded_polyline() == "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def test_geojson() -> None:
+    """GeoJSON lists coordinates as longitude, latitude."""
+    track = APRSWSTrack()
+    track.append(52.0, -2.0, 10)
+    track.append(53.0, -2.0, 20)
+
+    feature = track.as_geojson("G4ZMG")
+    assert feature["geometry"]["coordinates"] == [[-2.0, 52.0], [-2.0, 53.0]]
+    assert feature["properties"] == {"callsign": "G4ZMG", "timestamps": [10, 20]}
+
+
+def _drive(count: int) -> list[tuple[float, float, int]]:
+    """Return reports of a vehicle drifting its heading, some stops."""
+    rng = random.Random(20)  # noqa: S311 a repeatable route, not a secret
+    latitude, longitude, heading = 52.0, -2.0, 0.0
+    reports = []
+    for index in range(count):
+        heading += rng.gauss(0, 0.15)
+        speed = 0 if index % 200 < 20 else STEP / 4
+        latitude += speed * math.cos(heading)
+        longitude += speed * math.sin(heading) / math.cos(math.radians(latitude))
+        reports.append((latitude, longitude, index * 10))
+    return reports
+
+
+def test_benchmark(record_property: Callable[[str, object], None]) -> None:
+    """Benchmark appending a long drive, time per point and points kept."""
+    reports = _drive(BENCHMARK_POINTS)
+    track = APRSWSTrack(max_points=BENCHMARK_POINTS)
+    bounded = APRSWSTrack()
+
+    started = time.perf_counter()
+    for report in reports:
+        track.append(*report)
+    seconds_per_point = (time.perf_counter() - started) / BENCHMARK_POINTS
+    for report in reports:
+        bounded.append(*report)
+
+    record_property("points", BENCHMARK_POINTS)
+    record_property("seconds_per_point", seconds_per_point)
+    record_property("retained_points", len(track))
+    assert len(track) < BENCHMARK_POINTS / 2
+    assert len(bounded) <= DEFAULT_TRACK_MAX_POINTS + 1
+    assert bounded.points[-1] == track.points[-1]
+    assert seconds_per_point < POINT_BUDGET
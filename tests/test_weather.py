@@ -0,0 +1,95 @@
+"""Tests for the per-station weather entity."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.aprs_weather_station.const import (
+    CONF_FIELD_SENSORS_DISABLED,
+    CONF_WEATHER_ENTITY,
+    CONF_YOUR_CALLSIGN,
+    DOMAIN,
+)
+
+from .common import STATION, budlist_subentry, feed_lines, setup_entry, weather_line
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import Event, HomeAssistant
+
+
+def _entry(*, weather_entity: bool, callsign: str = STATION) -> MockConfigEntry:
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="N0CALL",
+        unique_id="n0call",
+        data={CONF_YOUR_CALLSIGN: "N0CALL"},
+        options={
+            CONF_WEATHER_ENTITY: weather_entity,
+            CONF_FIELD_SENSORS_DISABLED: weather_entity,
+        },
+        subentries_data=[budlist_subentry(callsign)],
+    )
+
+
+async def _state_writes(
+    hass: HomeAssistant, callsign: str, *, weather_entity: bool
+) -> int:
+    """Return the state changes caused by one packet after the first."""
+    # A station of its own, as registry entries outlive the entry
+    entry = _entry(weather_entity=weather_entity, callsign=callsign)
+    await setup_entry(hass, entry)
+    lines = [weather_line(0), weather_line(10, temperature=55)]
+    first, second = (
+        line.replace(STATION.encode(), callsign.encode(), 1) for line in lines
+    )
+    await feed_lines(hass, entry, first)
+
+    events: list[Event] = []
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, events.append)
+    await feed_lines(hass, entry, second)
+    unsub()
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    return len(events)
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_weather_entity(hass: HomeAssistant) -> None:
+    """One entity carries the station's conditions, its sensors are disabled."""
+    entry = _entry(weather_entity=True)
+    await setup_entry(hass, entry)
+    await feed_lines(hass, entry, weather_line(0))
+
+    state = hass.states.get("weather.g4zmg")
+    assert state is not None
+    assert state.attributes["temperature"] == pytest.approx(12.2, abs=0.05)
+    assert state.attributes["humidity"] == 98
+    assert state.attributes["pressure"] == pytest.approx(1003.8)
+    assert state.attributes["wind_bearing"] == 202
+    assert state.attributes["precipitation"] == pytest.approx(0.25, abs=0.01)
+
+    registry = er.async_get(hass)
+    temperature = registry.async_get("sensor.g4zmg_temperature")
+    assert temperature.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get("sensor.g4zmg_temperature") is None
+    # Types the weather entity does not show stay enabled
+    assert hass.states.get("sensor.g4zmg_rain_since_midnight") is not None
+
+
+@pytest.mark.usefixtures("no_listener")
+async def test_fewer_state_writes(
+    hass: HomeAssistant, record_property: Callable[[str, object], None]
+) -> None:
+    """Benchmark state changes per packet with and without the weather entity."""
+    sensors = await _state_writes(hass, "G4ZMG", weather_entity=False)
+    weather = await _state_writes(hass, "G8PZT", weather_entity=True)
+
+    record_property("state_writes_sensors", sensors)
+    record_property("state_writes_weather", weather)
+    assert weather < sensors